@@ -1,3 +1,3 @@
 #!/usr/bin/env bash
 
-psql -a -d $DATABASE_URL -f database.sql
\ No newline at end of file
+poetry run python -m page_analyzer.cli migrate
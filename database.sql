@@ -1,10 +1,21 @@
+DROP TABLE IF EXISTS check_jobs CASCADE;
 DROP TABLE IF EXISTS urls CASCADE;
 DROP TABLE IF EXISTS url_checks CASCADE;
+DROP TABLE IF EXISTS data_versions;
+DROP TABLE IF EXISTS schema_migrations;
 
 CREATE TABLE urls (
     id bigint PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
     name varchar UNIQUE NOT NULL,
-    created_at timestamp
+    created_at timestamp,
+    -- Сводка о последней проверке, обновляется при добавлении проверки
+    last_check_id bigint,
+    last_check_status_code smallint,
+    last_check_at timestamp,
+    -- Расписание повторных проверок: интервал в секундах и время
+    -- следующей проверки
+    check_interval integer,
+    next_check_at timestamp
 );
 
 CREATE TABLE url_checks (
@@ -14,10 +25,189 @@ CREATE TABLE url_checks (
     title varchar(255),
     description varchar(255),
     status_code smallint,
-    created_at timestamp
+    created_at timestamp,
+    -- Валидаторы ответа для условных повторных проверок
+    etag text,
+    last_modified text,
+    body_hash varchar(64)
 );
 
 -- Индексы для улучшения производительности запросов
-CREATE INDEX idx_url_checks_url_id ON url_checks(url_id);
+CREATE INDEX idx_url_checks_url_id_created_at
+    ON url_checks (url_id, created_at DESC, id DESC)
+    INCLUDE (status_code);
 CREATE INDEX idx_url_checks_created_at ON url_checks(created_at DESC);
-CREATE INDEX idx_urls_created_at ON urls(created_at DESC);
\ No newline at end of file
+CREATE INDEX idx_urls_created_at ON urls(created_at DESC);
+CREATE INDEX idx_urls_next_check_at
+    ON urls (next_check_at)
+    WHERE next_check_at IS NOT NULL;
+
+-- Очередь фоновых проверок URL
+CREATE TABLE check_jobs (
+    id bigint PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
+    url_id bigint NOT NULL REFERENCES urls (id) ON DELETE CASCADE,
+    -- queued, running, done, failed
+    status varchar(16) NOT NULL DEFAULT 'queued',
+    attempts smallint NOT NULL DEFAULT 0,
+    message varchar(255),
+    created_at timestamp NOT NULL DEFAULT now(),
+    started_at timestamp,
+    finished_at timestamp
+);
+
+CREATE UNIQUE INDEX idx_check_jobs_active_url_id
+    ON check_jobs (url_id)
+    WHERE status IN ('queued', 'running');
+CREATE INDEX idx_check_jobs_pending
+    ON check_jobs (id)
+    WHERE status IN ('queued', 'running');
+
+-- Уведомления об изменении URL и проверок для инвалидации кэшей воркеров
+CREATE OR REPLACE FUNCTION notify_url_changes() RETURNS trigger AS $$
+DECLARE
+    payload text;
+BEGIN
+    IF TG_TABLE_NAME = 'url_checks' THEN
+        SELECT string_agg(DISTINCT url_id::text, ',') INTO payload
+        FROM changed_rows;
+    ELSE
+        SELECT string_agg(DISTINCT id::text, ',') INTO payload
+        FROM changed_rows;
+    END IF;
+    IF payload IS NULL THEN
+        RETURN NULL;
+    END IF;
+    IF length(payload) > 7000 THEN
+        payload := '*';
+    END IF;
+    PERFORM pg_notify('url_changes', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER urls_insert_notify
+    AFTER INSERT ON urls
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_url_changes();
+
+-- Изменение URL: уведомление только при изменении отображаемых полей,
+-- изменение расписания - с префиксом 'details:' (только страницы URL)
+CREATE OR REPLACE FUNCTION notify_url_updates() RETURNS trigger AS $$
+DECLARE
+    listed text;
+    details text;
+BEGIN
+    SELECT
+        string_agg(DISTINCT new_rows.id::text, ',') FILTER (
+            WHERE (new_rows.name, new_rows.last_check_id,
+                   new_rows.last_check_status_code, new_rows.last_check_at)
+                IS DISTINCT FROM
+                  (old_rows.name, old_rows.last_check_id,
+                   old_rows.last_check_status_code, old_rows.last_check_at)
+        ),
+        string_agg(DISTINCT new_rows.id::text, ',') FILTER (
+            WHERE (new_rows.name, new_rows.last_check_id,
+                   new_rows.last_check_status_code, new_rows.last_check_at)
+                IS NOT DISTINCT FROM
+                  (old_rows.name, old_rows.last_check_id,
+                   old_rows.last_check_status_code, old_rows.last_check_at)
+              AND (new_rows.next_check_at, new_rows.check_interval)
+                IS DISTINCT FROM
+                  (old_rows.next_check_at, old_rows.check_interval)
+        )
+    INTO listed, details
+    FROM new_rows
+    JOIN old_rows ON old_rows.id = new_rows.id;
+    IF listed IS NOT NULL THEN
+        IF length(listed) > 7000 THEN
+            listed := '*';
+        END IF;
+        PERFORM pg_notify('url_changes', listed);
+    END IF;
+    IF details IS NOT NULL THEN
+        IF length(details) > 7000 THEN
+            details := '*';
+        END IF;
+        PERFORM pg_notify('url_changes', 'details:' || details);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER urls_update_notify
+    AFTER UPDATE ON urls
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_url_updates();
+
+CREATE TRIGGER urls_delete_notify
+    AFTER DELETE ON urls
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_url_changes();
+
+CREATE TRIGGER url_checks_insert_notify
+    AFTER INSERT ON url_checks
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_url_changes();
+
+-- Версии данных для условных HTTP-ответов (ETag). Версия - сумма
+-- счётчиков шардов: транзакция увеличивает счётчик шарда txid % 64,
+-- поэтому параллельные записи не ждут одну общую строку
+CREATE TABLE data_versions (
+    name varchar(32) NOT NULL,
+    shard smallint NOT NULL DEFAULT 0,
+    version bigint NOT NULL DEFAULT 0,
+    updated_at timestamp NOT NULL DEFAULT now(),
+    PRIMARY KEY (name, shard)
+);
+
+INSERT INTO data_versions (name, shard)
+SELECT 'urls', shard FROM generate_series(0, 63) AS shard;
+
+CREATE OR REPLACE FUNCTION bump_urls_version() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM changed_rows) THEN
+        UPDATE data_versions
+        SET version = version + 1, updated_at = now()
+        WHERE name = 'urls' AND shard = txid_current() % 64;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Список URL показывает имя и сводку о последней проверке. Проверка,
+-- не ставшая последней, список не меняет, поэтому версия меняется при
+-- обновлении сводки, а не при добавлении проверок
+CREATE OR REPLACE FUNCTION bump_urls_version_on_update() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM new_rows
+        JOIN old_rows ON old_rows.id = new_rows.id
+        WHERE (new_rows.name, new_rows.last_check_id,
+               new_rows.last_check_status_code, new_rows.last_check_at)
+            IS DISTINCT FROM
+              (old_rows.name, old_rows.last_check_id,
+               old_rows.last_check_status_code, old_rows.last_check_at)
+    ) THEN
+        UPDATE data_versions
+        SET version = version + 1, updated_at = now()
+        WHERE name = 'urls' AND shard = txid_current() % 64;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER urls_insert_version
+    AFTER INSERT ON urls
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_urls_version();
+
+CREATE TRIGGER urls_update_version
+    AFTER UPDATE ON urls
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_urls_version_on_update();
+
+CREATE TRIGGER urls_delete_version
+    AFTER DELETE ON urls
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_urls_version();
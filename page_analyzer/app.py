@@ -3,14 +3,27 @@ from flask import (
     render_template,
     request,
     flash,
+    get_flashed_messages,
     redirect,
     url_for,
+    jsonify,
+    make_response,
+    session,
+    stream_template,
     Response
 )
+import hashlib
+import io
+import itertools
 import logging
-from typing import Tuple, Union
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+from markupsafe import Markup
+from .cache_listener import invalidation_listener
 from .config import config
-from .services import URLService, CheckService
+from .render_cache import URLS_TAG, render_cache, url_tag
+from .services import URLService, CheckService, ExportService
+from .services.export_service import FORMATS
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +34,73 @@ except ValueError as e:
     logger.error(f'Ошибка конфигурации: {str(e)}')
     raise
 
+# Минимальный размер куска HTML при потоковом выводе, символы
+STREAM_BUFFER_SIZE = 16 * 1024
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = config.get_secret_key()
 
 
+@app.before_request
+def start_cache_listener() -> None:
+    """Запуск инвалидации кэша страниц по уведомлениям из БД."""
+    if render_cache.enabled and config.RENDER_CACHE_LISTEN:
+        invalidation_listener.ensure_started()
+
+
+def _templates_digest() -> str:
+    """Хэш шаблонов: ETag меняется при обновлении шаблонов."""
+    digest = hashlib.sha1()
+    templates = Path(app.root_path, app.template_folder)
+    for path in sorted(templates.rglob('*.html')):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:8]
+
+
+TEMPLATES_DIGEST = _templates_digest()
+
+
+def _page_etag(get_version: Callable[[], Optional[str]]) -> Optional[str]:
+    """ETag страницы по версии её данных.
+
+    Страница с flash-сообщениями отличается от страницы с теми же
+    данными без них, поэтому ETag для неё не вычисляется.
+
+    Args:
+        get_version: Функция получения версии данных страницы.
+
+    Returns:
+        str или None: ETag или None, если условный ответ невозможен.
+    """
+    if not config.CONDITIONAL_RESPONSES or '_flashes' in session:
+        return None
+    version = get_version()
+    if version is None:
+        return None
+    return f'{TEMPLATES_DIGEST}-{version}'
+
+
+def _is_not_modified(etag: Optional[str]) -> bool:
+    return etag is not None and request.if_none_match.contains_weak(etag)
+
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _versioned(body: str, etag: Optional[str]) -> Response:
+    response = make_response(body, 200)
+    if etag is not None:
+        response.set_etag(etag)
+        # Браузер может хранить страницу, но проверяет её при каждом
+        # запросе
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 @app.get('/')
 def get_index() -> Tuple[str, int]:
     """Главная страница с формой добавления URL.
@@ -54,44 +130,202 @@ def create_url() -> Union[Response, Tuple[str, int]]:
     return redirect(url_for('get_url', id=result['url_id']))
 
 
+@app.post('/urls/import')
+def import_urls() -> Union[Response, Tuple[str, int], Tuple[Response, int]]:
+    """Массовый импорт URL из загруженного файла.
+
+    Файл (поле ``file``) в формате CSV или по одному URL в строке
+    читается потоково. Клиенту, ожидающему JSON, возвращается статистика
+    импорта, браузер перенаправляется на список сайтов.
+
+    Returns:
+        Response: Редирект на список URL, JSON со статистикой или форма
+        с ошибкой и HTTP статус код.
+    """
+    wants_json = (
+        request.accept_mimetypes.best_match(
+            ['application/json', 'text/html']
+        ) == 'application/json'
+    )
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        message = 'Выберите файл для импорта'
+        if wants_json:
+            return jsonify(error=message), 422
+        flash(message, 'alert-danger')
+        return render_template('form.html'), 422
+
+    lines = io.TextIOWrapper(
+        upload.stream, encoding='utf-8-sig', errors='replace', newline=''
+    )
+    stats = URLService.import_urls(lines)
+    if wants_json:
+        return jsonify(stats), 200
+
+    flash(
+        f'Импорт завершён: добавлено {stats["inserted"]}, '
+        f'уже были в списке {stats["duplicates"]}, '
+        f'некорректных {stats["invalid"]}',
+        'alert-success' if stats['inserted'] else 'alert-info'
+    )
+    return redirect(url_for('urls_list'))
+
+
 @app.get('/urls')
-def urls_list() -> Tuple[str, int]:
-    """Список всех URL с последними проверками.
+def urls_list() -> Union[Response, Tuple[str, int]]:
+    """Список URL с последними проверками (постранично).
+
+    Параметры запроса ``after_id`` и ``before_id`` задают курсор страницы,
+    ``limit`` - размер страницы; ``all=1`` выводит весь список потоком
+    (см. ``_stream_urls_list``). Отрисованный список кэшируется до
+    изменения URL или проверок (см. ``render_cache``). Если ETag клиента
+    совпадает с версией списка, возвращается 304 без запроса страницы.
 
     Returns:
-        Tuple[str, int]: HTML шаблон со списком URL и HTTP статус код.
+        Response: HTML шаблон со списком URL или 304 Not Modified.
+    """
+    etag = _page_etag(URLService.get_urls_version)
+    if _is_not_modified(etag):
+        return _not_modified(etag)
+    if request.args.get('all', type=int):
+        return _stream_urls_list(etag)
+    content = render_cache.get_or_render(
+        request.full_path, (URLS_TAG, ), _render_urls_list
+    )
+    return _versioned(
+        render_template('urls_list.html', content=Markup(content)), etag
+    )
+
+
+def _stream_urls_list(etag: Optional[str]) -> Response:
+    """Потоковый вывод всего списка URL.
+
+    Строки читаются курсором на стороне сервера порциями и отрисовываются
+    по мере чтения, поэтому память воркера не зависит от количества URL,
+    а начало страницы отправляется после чтения первой порции.
     """
-    urls = URLService.get_all_urls()
-    return render_template('urls_list.html', urls=urls), 200
+    # Flash-сообщения удаляются из сессии до отправки заголовков, иначе
+    # изменённая сессия не попадёт в ответ
+    get_flashed_messages(with_categories=True)
+    rows = URLService.iter_all_urls()
+    first = next(rows, None)
+    urls = itertools.chain([first], rows) if first is not None else []
+    chunks = stream_template(
+        'urls_list.html',
+        urls=urls,
+        page={'prev_before_id': None, 'next_after_id': None},
+        limit=None
+    )
+    response = Response(_buffered(chunks, STREAM_BUFFER_SIZE))
+    # Подключение к БД освобождается, даже если клиент отключился
+    response.call_on_close(rows.close)
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _buffered(chunks: Iterator[str], size: int) -> Iterator[str]:
+    """Объединение мелких фрагментов шаблона в куски не меньше size."""
+    buffer: List[str] = []
+    length = 0
+    try:
+        for chunk in chunks:
+            buffer.append(chunk)
+            length += len(chunk)
+            if length >= size:
+                yield ''.join(buffer)
+                buffer = []
+                length = 0
+        if buffer:
+            yield ''.join(buffer)
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def _render_urls_list() -> str:
+    page = URLService.get_all_urls(
+        after_id=request.args.get('after_id', type=int),
+        before_id=request.args.get('before_id', type=int),
+        limit=request.args.get('limit', type=int)
+    )
+    # Размер страницы по умолчанию не добавляется в ссылки навигации
+    limit = page['limit'] if page['limit'] != config.URLS_PAGE_SIZE else None
+    return render_template(
+        'urls_list_content.html',
+        urls=page['urls'],
+        page=page,
+        limit=limit
+    )
 
 
 @app.get('/urls/<int:id>')
-def get_url(id: int) -> Tuple[str, int]:
+def get_url(id: int) -> Union[Response, Tuple[str, int]]:
     """Страница детальной информации об URL.
 
+    Отрисованная страница кэшируется до изменения URL или его проверок.
+    Если ETag клиента совпадает с версией URL, возвращается 304 без
+    запросов проверок. Страница с состоянием фоновой проверки
+    (параметр ``job``) не кэшируется.
+
     Args:
         id: ID URL.
 
     Returns:
-        Tuple[str, int]: HTML шаблон с деталями URL и HTTP статус код.
+        Response: HTML шаблон с деталями URL, 304 Not Modified
+        или страница 404.
     """
+    job_id = request.args.get('job', type=int)
+    if job_id is not None:
+        content = _render_url_details(id, job_id)
+        etag = None
+    else:
+        etag = _page_etag(lambda: URLService.get_url_version(id))
+        if _is_not_modified(etag):
+            return _not_modified(etag)
+        content = render_cache.get_or_render(
+            request.path, (url_tag(id), ), lambda: _render_url_details(id)
+        )
+    if content is None:
+        return render_template('404_page.html'), 404
+    return _versioned(
+        render_template('url_details.html', content=Markup(content)), etag
+    )
+
+
+def _render_url_details(id: int, job_id: Optional[int] = None) -> Optional[str]:
     url = URLService.get_url(id)
     if url is None:
-        return render_template('404_page.html'), 404
+        return None
     checks = URLService.get_url_checks(id)
-    return render_template('url_details.html', url=url, checks=checks)
+    return render_template(
+        'url_details_content.html',
+        url=url,
+        checks=checks,
+        job_id=job_id
+    )
 
 
 @app.post('/urls/<int:id>/checks')
-def add_url_check(id: int) -> Response:
+def add_url_check(id: int) -> Union[Response, Tuple[Response, int]]:
     """Добавление проверки для указанного URL.
 
+    Если включены фоновые проверки (CHECKS_ASYNC), проверка ставится
+    в очередь. Клиенту, ожидающему JSON, возвращается 202 Accepted
+    с адресом состояния задачи, браузер перенаправляется на страницу URL,
+    которая опрашивает состояние задачи.
+
     Args:
         id: ID URL для проверки.
 
     Returns:
-        Response: Редирект на страницу URL.
+        Response: Редирект на страницу URL или JSON с задачей проверки.
     """
+    if config.CHECKS_ASYNC:
+        return _enqueue_url_check(id)
+
     result = CheckService.check_url(id)
 
     if not result['success'] and result['flash_message'] == 'URL не найден':
@@ -99,3 +333,86 @@ def add_url_check(id: int) -> Response:
 
     flash(result['flash_message'], result['flash_category'])
     return redirect(url_for('get_url', id=id))
+
+
+def _enqueue_url_check(id: int) -> Union[Response, Tuple[Response, int]]:
+    """Постановка проверки URL в очередь."""
+    wants_json = (
+        request.accept_mimetypes.best_match(
+            ['application/json', 'text/html']
+        ) == 'application/json'
+    )
+    result = CheckService.enqueue_check(id)
+
+    if not result['success']:
+        if wants_json:
+            return jsonify(error=result['flash_message']), 404
+        return redirect(url_for('urls_list'))
+
+    status_url = url_for('get_check_job', job_id=result['job_id'])
+    if wants_json:
+        response = jsonify(job_id=result['job_id'], status_url=status_url)
+        response.headers['Location'] = status_url
+        return response, 202
+
+    flash(result['flash_message'], result['flash_category'])
+    return redirect(url_for('get_url', id=id, job=result['job_id']))
+
+
+@app.get('/checks/jobs/<int:job_id>')
+def get_check_job(job_id: int) -> Tuple[Response, int]:
+    """Состояние задачи фоновой проверки.
+
+    Args:
+        job_id: ID задачи.
+
+    Returns:
+        Tuple[Response, int]: JSON с состоянием задачи и HTTP статус код.
+    """
+    job = CheckService.get_job_status(job_id)
+    if job is None:
+        return jsonify(error='Задача не найдена'), 404
+    return jsonify(job), 200
+
+
+@app.get('/checks/export')
+def export_checks() -> Union[Response, Tuple[Response, int]]:
+    """Выгрузка истории проверок с URL в CSV или NDJSON.
+
+    Параметры запроса: ``format`` (csv по умолчанию или ndjson),
+    ``since`` и ``until`` - период в формате ISO 8601, ``status`` -
+    коды ответа (можно указать несколько раз). Проверки читаются из БД
+    порциями и отправляются по мере чтения.
+
+    Returns:
+        Response: Поток выгрузки или JSON с ошибкой и статус 400.
+    """
+    export_format = request.args.get('format', 'csv')
+    if export_format not in FORMATS:
+        return jsonify(
+            error=f'Неподдерживаемый формат выгрузки: {export_format}'
+        ), 400
+    try:
+        filters = ExportService.parse_filters(
+            request.args.get('since'),
+            request.args.get('until'),
+            request.args.getlist('status')
+        )
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    rows = ExportService.iter_checks(**filters)
+    # Запрос выполняется до отправки заголовков: ошибка БД
+    # возвращается клиенту как ошибка, а не как оборванная выгрузка
+    first = next(rows, None)
+    checks = itertools.chain([first], rows) if first is not None else []
+    response = Response(
+        ExportService.export(checks, export_format),
+        mimetype=FORMATS[export_format]
+    )
+    response.headers['Content-Disposition'] = (
+        f'attachment; filename=checks.{export_format}'
+    )
+    # Подключение к БД освобождается, даже если клиент отключился
+    response.call_on_close(rows.close)
+    return response
@@ -0,0 +1,200 @@
+"""Инвалидация кэшей воркера по уведомлениям PostgreSQL об изменениях."""
+
+import logging
+import os
+import select
+import threading
+from typing import Any, Callable, List, Optional
+from psycopg2 import connect, Error as DBError
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from .config import config
+from .render_cache import render_cache, url_tag
+
+logger = logging.getLogger(__name__)
+
+# Канал уведомлений, см. миграцию 0007_url_changes_notify
+CHANNEL = 'url_changes'
+# Полезная нагрузка уведомления, когда изменилось слишком много URL
+ALL_URLS = '*'
+# Префикс уведомления об изменениях, которые видны только на страницах
+# URL (расписание проверок), см. миграцию 0009_url_update_notify
+DETAILS_PREFIX = 'details:'
+
+# Обработчик изменений: ID изменившихся URL или None, если неизвестно,
+# что изменилось, и нужно сбросить всё; вторым аргументом - изменился ли
+# список URL
+ChangeHandler = Callable[[Optional[List[int]], bool], None]
+
+
+def invalidate_render_cache(
+    url_ids: Optional[List[int]], list_changed: bool = True
+) -> None:
+    """Инвалидация кэша отрисованных страниц.
+
+    Args:
+        url_ids: ID изменившихся URL или None, чтобы сбросить весь кэш.
+        list_changed: Изменился ли список URL. Если нет, сбрасываются
+                      только страницы указанных URL.
+    """
+    if url_ids is None:
+        render_cache.invalidate_all()
+    elif list_changed:
+        render_cache.invalidate_urls(url_ids)
+    else:
+        render_cache.invalidate(*(url_tag(url_id) for url_id in url_ids))
+
+
+def parse_payload(payload: str) -> Optional[List[int]]:
+    """Разбор полезной нагрузки уведомления.
+
+    Args:
+        payload: ID URL через запятую или ``ALL_URLS``.
+
+    Returns:
+        list или None: ID URL или None, если изменились все URL.
+    """
+    if payload == ALL_URLS:
+        return None
+    try:
+        return [int(url_id) for url_id in payload.split(',') if url_id]
+    except ValueError:
+        logger.warning(f'Некорректное уведомление об изменениях: {payload!r}')
+        return None
+
+
+class InvalidationListener:
+    """Фоновый поток, получающий уведомления об изменениях URL и проверок.
+
+    Уведомления отправляют триггеры таблиц urls и url_checks при любой
+    записи, в том числе из других воркеров и узлов. Поток держит
+    отдельное подключение к БД (не из пула) и передаёт ID изменившихся
+    URL обработчику. Изменения, которые не видны в списке URL (например,
+    перенос следующей проверки планировщиком), передаются отдельно,
+    чтобы не сбрасывать кэш списка. Уведомления, отправленные, пока
+    подключения не было, теряются, поэтому после каждого подключения
+    обработчик вызывается с None.
+    """
+
+    def __init__(
+        self,
+        handler: ChangeHandler = invalidate_render_cache,
+        poll_timeout: float = 1.0,
+        reconnect_delay: float = 5.0
+    ) -> None:
+        """
+        Инициализация слушателя.
+
+        Args:
+            handler: Обработчик изменений.
+            poll_timeout: Как часто проверять запрос на остановку, секунды.
+            reconnect_delay: Пауза перед повторным подключением после
+                    ошибки, секунды.
+        """
+        self.handler = handler
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self.stop_event = threading.Event()
+        # Подключение установлено и подписка на канал выполнена
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        """Работает ли поток слушателя в текущем процессе."""
+        return (
+            self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def ensure_started(self) -> None:
+        """Запуск потока, если он ещё не запущен в текущем процессе.
+
+        Потоки не переживают fork, поэтому воркер, созданный из
+        процесса с работающим слушателем, запускает свой.
+        """
+        if self.running:
+            return
+        with self._lock:
+            if self.running:
+                return
+            self.stop_event.clear()
+            self.ready.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self.run, name='cache-invalidation', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Остановка потока.
+
+        Args:
+            timeout: Максимальное время ожидания остановки, секунды.
+        """
+        self.stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def run(self) -> None:
+        """Получение уведомлений до вызова ``stop``."""
+        while not self.stop_event.is_set():
+            connection = None
+            try:
+                connection = connect(config.get_database_url())
+                connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                self.handler(None, True)
+                self.ready.set()
+                logger.info('Слушатель изменений для инвалидации кэша запущен')
+                self._listen(connection)
+            except (DBError, OSError) as e:
+                logger.error(
+                    f'Ошибка слушателя изменений, повторное подключение '
+                    f'через {self.reconnect_delay:.0f} с: {str(e)}'
+                )
+                self.stop_event.wait(self.reconnect_delay)
+            finally:
+                self.ready.clear()
+                if connection is not None:
+                    connection.close()
+
+    def _listen(self, connection: Any) -> None:
+        while not self.stop_event.is_set():
+            readable, _, _ = select.select(
+                [connection], [], [], self.poll_timeout
+            )
+            if not readable:
+                continue
+            connection.poll()
+            url_ids: Optional[set] = set()
+            details: set = set()
+            while connection.notifies:
+                payload = connection.notifies.pop(0).payload
+                target = url_ids
+                if payload.startswith(DETAILS_PREFIX):
+                    payload = payload[len(DETAILS_PREFIX):]
+                    target = details
+                changed = parse_payload(payload)
+                if changed is None:
+                    url_ids = None
+                elif target is not None:
+                    target.update(changed)
+            try:
+                if url_ids is None:
+                    self.handler(None, True)
+                    continue
+                if url_ids:
+                    self.handler(sorted(url_ids), True)
+                details -= url_ids
+                if details:
+                    self.handler(sorted(details), False)
+            except Exception as e:
+                logger.error(f'Ошибка при инвалидации кэша: {str(e)}')
+
+
+invalidation_listener = InvalidationListener()
@@ -0,0 +1,201 @@
+"""Буферизованная пакетная запись результатов проверок."""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from .db import add_checks
+from .render_cache import render_cache
+
+logger = logging.getLogger(__name__)
+
+# Вызывается после записи проверки: None при успехе или исключение
+SavedCallback = Callable[[Optional[BaseException]], None]
+# Проверка, время постановки в буфер и функция обратного вызова
+_Entry = Tuple[Dict[str, Any], float, Optional[SavedCallback]]
+
+
+class WriterClosed(Exception):
+    """Запись в закрытый буфер проверок."""
+
+
+class CheckWriter:
+    """Буфер проверок с записью пакетами в фоновом потоке.
+
+    Проверки накапливаются и записываются через ``add_checks`` одной
+    транзакцией на пакет: когда в буфере набирается ``batch_size``
+    проверок или самая старая из них ждёт дольше ``max_latency`` секунд.
+    Если в буфере уже ``max_pending`` проверок, ``put`` блокируется, пока
+    буфер не освободится. ``close`` записывает все оставшиеся проверки.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        max_latency: float = 1.0,
+        max_pending: Optional[int] = None
+    ) -> None:
+        """
+        Инициализация буфера.
+
+        Args:
+            batch_size: Максимальное количество проверок в одной записи.
+            max_latency: Максимальное время ожидания проверки в буфере,
+                    секунды.
+            max_pending: Ёмкость буфера. По умолчанию четыре пакета.
+        """
+        if batch_size < 1 or max_latency < 0:
+            raise ValueError('Некорректные параметры буфера проверок')
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.max_pending = max(max_pending or batch_size * 4, batch_size)
+        self._condition = threading.Condition()
+        self._buffer: Deque[_Entry] = deque()
+        self._flushing = 0
+        self._flush_requested = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'written': 0, 'failed': 0, 'flushes': 0}
+
+    def __enter__(self) -> 'CheckWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def put(
+        self,
+        data: Dict[str, Any],
+        callback: Optional[SavedCallback] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """Добавление проверки в буфер.
+
+        Args:
+            data: Данные проверки в формате ``add_check``.
+            callback: Функция, вызываемая из потока записи после записи
+                    пакета с этой проверкой.
+            timeout: Максимальное время ожидания места в буфере, секунды.
+
+        Raises:
+            WriterClosed: Если буфер закрыт.
+            TimeoutError: Если место в буфере не освободилось за timeout.
+        """
+        with self._condition:
+            self._ensure_thread()
+            if not self._condition.wait_for(
+                lambda: self._closed or len(self._buffer) < self.max_pending,
+                timeout
+            ):
+                raise TimeoutError('Буфер проверок переполнен')
+            if self._closed:
+                raise WriterClosed('Буфер проверок закрыт')
+            self._buffer.append((data, time.monotonic(), callback))
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Ожидание записи всех проверок, добавленных до вызова."""
+        with self._condition:
+            self._ensure_thread()
+            self._flush_requested = True
+            self._condition.notify_all()
+            self._condition.wait_for(
+                lambda: not self._buffer and not self._flushing
+            )
+
+    def close(self) -> Dict[str, int]:
+        """Запись оставшихся проверок и остановка потока записи.
+
+        Returns:
+            dict: Статистика (см. ``stats``).
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        return self.stats()
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика записи.
+
+        Returns:
+            dict: written - записано проверок, failed - проверок в
+                  пакетах с ошибкой записи, flushes - количество записей.
+        """
+        with self._condition:
+            return dict(self._stats)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(
+                target=self._run, name='check-writer', daemon=True
+            )
+            self._thread.start()
+
+    def _batch_ready(self) -> bool:
+        if self._closed or self._flush_requested:
+            return bool(self._buffer)
+        if len(self._buffer) >= self.batch_size:
+            return True
+        return bool(self._buffer) and (
+            time.monotonic() - self._buffer[0][1] >= self.max_latency
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._batch_ready():
+                    if self._closed and not self._buffer:
+                        return
+                    if not self._buffer:
+                        self._flush_requested = False
+                        self._condition.notify_all()
+                        self._condition.wait()
+                        continue
+                    age = time.monotonic() - self._buffer[0][1]
+                    self._condition.wait(max(self.max_latency - age, 0))
+                batch = self._take_batch(self.batch_size)
+                self._flushing += 1
+                # Освободилось место для заблокированных put
+                self._condition.notify_all()
+            try:
+                self._write(batch)
+            finally:
+                with self._condition:
+                    self._flushing -= 1
+                    self._condition.notify_all()
+
+    def _take_batch(self, size: int) -> List[_Entry]:
+        return [
+            self._buffer.popleft()
+            for _ in range(min(size, len(self._buffer)))
+        ]
+
+    def _write(self, batch: List[_Entry]) -> None:
+        error: Optional[BaseException] = None
+        try:
+            add_checks([data for data, _, _ in batch])
+        except Exception as e:
+            error = e
+            logger.error(
+                f'Ошибка при записи пакета из {len(batch)} проверок: {str(e)}'
+            )
+        with self._condition:
+            self._stats['flushes'] += 1
+            self._stats['failed' if error else 'written'] += len(batch)
+        if error is None:
+            render_cache.invalidate_urls(
+                {data['url_id'] for data, _, _ in batch}
+            )
+        for _, _, callback in batch:
+            if callback is None:
+                continue
+            try:
+                callback(error)
+            except Exception as e:
+                logger.error(
+                    f'Ошибка в обработчике записи проверки: {str(e)}'
+                )
@@ -0,0 +1,574 @@
+"""Консольные команды обслуживания анализатора страниц."""
+
+import argparse
+import logging
+import signal
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from .config import config
+from .db import (
+    backfill_latest_checks,
+    delete_finished_check_jobs,
+    get_urls_for_check,
+    set_check_schedule,
+)
+from .dns_cache import dns_cache
+from .host_guard import host_guard
+from .migrate import apply_migrations, get_pending_migrations
+from .parse_cache import parse_cache
+from .parse_pool import parse_pool
+from .parser import BACKENDS, benchmark_backends
+from .scheduler import CheckScheduler
+from .services import (
+    AsyncCheckService,
+    BatchCheckService,
+    ExportService,
+    URLService,
+)
+from .services.export_service import FORMATS
+from .worker import CheckWorker
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_latest_checks_command(args: argparse.Namespace) -> int:
+    """Заполнение сводки о последней проверке для всех URL.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса.
+    """
+    updated = backfill_latest_checks()
+    print(f'Обновлено URL: {updated}')
+    return 0
+
+
+def migrate_command(args: argparse.Namespace) -> int:
+    """Применение миграций схемы базы данных.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса.
+    """
+    if args.list:
+        pending = get_pending_migrations()
+        for migration in pending:
+            print(migration.name)
+        if not pending:
+            print('Все миграции применены')
+        return 0
+
+    applied = apply_migrations(target=args.target)
+    for name in applied:
+        print(f'Применена миграция {name}')
+    if not applied:
+        print('Все миграции применены')
+    return 0
+
+
+def check_all_command(args: argparse.Namespace) -> int:
+    """Пакетная проверка URL.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса: 1, если ни одна проверка
+             не завершилась успешно или движок проверок недоступен.
+    """
+    parse_pool.configure(args.parse_workers)
+    urls = get_urls_for_check(
+        ids=args.ids,
+        unchecked_only=args.unchecked,
+        limit=args.limit
+    )
+    service_class = (
+        AsyncCheckService if args.engine == 'async' else BatchCheckService
+    )
+    try:
+        service = service_class(
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            batch_size=args.batch_size
+        )
+    except RuntimeError as e:
+        print(str(e))
+        return 1
+    stats = service.run(urls)
+    print(
+        f'Проверено URL: {stats["total"]} '
+        f'(успешно {stats["succeeded"]}, с ошибкой {stats["failed"]}, '
+        f'сохранено {stats["saved"]})'
+    )
+    print(
+        f'Время: {stats["elapsed"]:.2f} с, '
+        f'пропускная способность: {stats["throughput"]:.2f} URL/с'
+    )
+    print(
+        f'Время проверки: среднее {stats["latency_avg"]:.3f} с, '
+        f'p50 {stats["latency_p50"]:.3f} с, '
+        f'p95 {stats["latency_p95"]:.3f} с, '
+        f'макс. {stats["latency_max"]:.3f} с'
+    )
+    if parse_cache.enabled:
+        cache_stats = parse_cache.stats()
+        print(
+            f'Кэш разбора: попаданий {cache_stats["hits"]} '
+            f'(с диска {cache_stats["disk_hits"]}), '
+            f'промахов {cache_stats["misses"]}, '
+            f'вытеснено {cache_stats["evictions"]} '
+            f'(с диска {cache_stats["disk_evictions"]})'
+        )
+    if dns_cache.enabled:
+        dns_stats = dns_cache.stats()
+        print(
+            f'Кэш DNS: попаданий {dns_stats["hits"]} '
+            f'(NXDOMAIN {dns_stats["negative_hits"]}), '
+            f'промахов {dns_stats["misses"]}, '
+            f'доля попаданий {dns_stats["hit_rate"]:.0%}'
+        )
+    guard_stats = host_guard.stats()
+    if guard_stats['waits'] or guard_stats['rejected']:
+        print(
+            f'Ограничение запросов к хостам: ожидали {guard_stats["waits"]} '
+            f'(всего {guard_stats["wait_total"]:.2f} с, '
+            f'макс. {guard_stats["wait_max"]:.2f} с), '
+            f'отклонено {guard_stats["rejected"]}'
+        )
+    if guard_stats['breakers']:
+        print(
+            'Недоступные хосты: '
+            + ', '.join(sorted(guard_stats['breakers']))
+        )
+    return 1 if stats['total'] and not stats['succeeded'] else 0
+
+
+def worker_command(args: argparse.Namespace) -> int:
+    """Запуск воркера фоновых проверок.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса.
+    """
+    parse_pool.configure(args.parse_workers)
+    worker = CheckWorker(concurrency=args.concurrency)
+    if args.once:
+        processed = worker.run_once()
+        print(f'Выполнено задач: {processed}')
+        return 0
+
+    def handle_signal(signum, frame):
+        logger.info(f'Получен сигнал {signum}, остановка воркера')
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    worker.run_forever()
+    return 0
+
+
+def cleanup_jobs_command(args: argparse.Namespace) -> int:
+    """Удаление завершённых задач фоновых проверок.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса: 1 при некорректном возрасте задач.
+    """
+    if args.older_than < 0:
+        print('Возраст задач не может быть отрицательным')
+        return 1
+    deleted = delete_finished_check_jobs(args.older_than * 86400)
+    print(f'Удалено завершённых задач: {deleted}')
+    return 0
+
+
+def schedule_command(args: argparse.Namespace) -> int:
+    """Установка интервала повторных проверок URL.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса: 1 при некорректном интервале.
+    """
+    interval = None if args.off else args.interval
+    if interval is not None and interval <= 0:
+        print('Интервал должен быть больше нуля')
+        return 1
+    updated = set_check_schedule(interval, ids=args.ids)
+    if interval is None:
+        print(f'Снято с расписания URL: {updated}')
+    else:
+        print(f'Поставлено на расписание URL: {updated} '
+              f'(каждые {interval} с)')
+    return 0
+
+
+def scheduler_command(args: argparse.Namespace) -> int:
+    """Запуск планировщика повторных проверок.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса.
+    """
+    parse_pool.configure(args.parse_workers)
+    scheduler = CheckScheduler(concurrency=args.concurrency)
+    if args.once:
+        claimed = scheduler.run_once()
+        print(f'Проверено URL по расписанию: {claimed}')
+        return 0
+
+    def handle_signal(signum, frame):
+        logger.info(f'Получен сигнал {signum}, остановка планировщика')
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    scheduler.run_forever()
+    return 0
+
+
+def bench_parsers_command(args: argparse.Namespace) -> int:
+    """Измерение скорости реализаций разбора на корпусе страниц.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса: 1, если в каталоге нет страниц
+             или запрошена неустановленная реализация.
+    """
+    paths = sorted(Path(args.corpus).glob('*.html'))
+    if not paths:
+        print(f'В каталоге {args.corpus} нет файлов *.html')
+        return 1
+    missing = [name for name in args.backends or [] if name not in BACKENDS]
+    if missing:
+        print(f'Реализации не установлены: {", ".join(missing)}')
+        return 1
+
+    documents = [
+        path.read_text(encoding='utf-8', errors='replace') for path in paths
+    ]
+    results = benchmark_backends(
+        documents,
+        backends=args.backends,
+        repeat=args.repeat
+    )
+    print(f'Страниц в корпусе: {len(documents)}, повторов: {args.repeat}')
+    for name, rate in sorted(
+        results.items(), key=lambda item: item[1], reverse=True
+    ):
+        print(f'{name:<12} {rate:10.1f} стр/с')
+    return 0
+
+
+def import_urls_command(args: argparse.Namespace) -> int:
+    """Массовый импорт URL из файла.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса.
+    """
+    if args.path == '-':
+        stats = URLService.import_urls(sys.stdin)
+    else:
+        with open(
+            args.path, encoding='utf-8-sig', errors='replace', newline=''
+        ) as file:
+            stats = URLService.import_urls(file)
+    print(
+        f'Обработано строк: {stats["total"]} '
+        f'(добавлено {stats["inserted"]}, повторов {stats["duplicates"]}, '
+        f'некорректных {stats["invalid"]})'
+    )
+    return 0
+
+
+def export_command(args: argparse.Namespace) -> int:
+    """Выгрузка истории проверок в CSV или NDJSON.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        int: Код завершения процесса: 1 при некорректном фильтре.
+    """
+    try:
+        filters = ExportService.parse_filters(
+            args.since, args.until, args.status or ()
+        )
+    except ValueError as e:
+        # Стандартный вывод занят выгрузкой
+        print(str(e), file=sys.stderr)
+        return 1
+
+    rows = ExportService.iter_checks(**filters)
+    try:
+        if args.output == '-':
+            for chunk in ExportService.export(rows, args.format):
+                sys.stdout.write(chunk)
+            sys.stdout.flush()
+        else:
+            with open(
+                args.output, 'w', encoding='utf-8', newline=''
+            ) as file:
+                for chunk in ExportService.export(rows, args.format):
+                    file.write(chunk)
+    finally:
+        rows.close()
+    return 0
+
+
+COMMANDS: Dict[str, Callable[[argparse.Namespace], int]] = {
+    'backfill-latest-checks': backfill_latest_checks_command,
+    'migrate': migrate_command,
+    'check-all': check_all_command,
+    'worker': worker_command,
+    'cleanup-jobs': cleanup_jobs_command,
+    'schedule': schedule_command,
+    'scheduler': scheduler_command,
+    'bench-parsers': bench_parsers_command,
+    'import-urls': import_urls_command,
+    'export': export_command,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создание парсера аргументов командной строки.
+
+    Returns:
+        ArgumentParser: Парсер с подкомандами.
+    """
+    parser = argparse.ArgumentParser(
+        prog='page-analyzer',
+        description='Обслуживание анализатора страниц'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser(
+        'backfill-latest-checks',
+        help='Пересчитать сводку о последней проверке в таблице urls'
+    )
+    migrate_parser = subparsers.add_parser(
+        'migrate',
+        help='Применить миграции схемы базы данных'
+    )
+    migrate_parser.add_argument(
+        '--target',
+        help='Последняя применяемая версия миграции, например 0002'
+    )
+    migrate_parser.add_argument(
+        '--list',
+        action='store_true',
+        help='Показать неприменённые миграции, ничего не применяя'
+    )
+    check_all_parser = subparsers.add_parser(
+        'check-all',
+        help='Проверить все или выбранные URL параллельно'
+    )
+    check_all_parser.add_argument(
+        '--ids',
+        type=int,
+        nargs='+',
+        help='Проверить только URL с указанными ID'
+    )
+    check_all_parser.add_argument(
+        '--unchecked',
+        action='store_true',
+        help='Проверить только URL без проверок'
+    )
+    check_all_parser.add_argument(
+        '--limit',
+        type=int,
+        help='Максимальное количество проверяемых URL'
+    )
+    check_all_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=config.BATCH_CHECK_CONCURRENCY,
+        help='Максимальное количество одновременных проверок'
+    )
+    check_all_parser.add_argument(
+        '--per-host',
+        type=int,
+        default=config.BATCH_CHECK_PER_HOST,
+        help='Максимальное количество одновременных проверок одного хоста'
+    )
+    check_all_parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=config.BATCH_CHECK_SIZE,
+        help='Количество результатов в одной пакетной вставке'
+    )
+    check_all_parser.add_argument(
+        '--engine',
+        choices=('threads', 'async'),
+        default=config.BATCH_CHECK_ENGINE,
+        help='threads - пул потоков, async - asyncio и httpx'
+    )
+    _add_parse_workers_argument(check_all_parser)
+    worker_parser = subparsers.add_parser(
+        'worker',
+        help='Запустить воркер фоновых проверок из очереди'
+    )
+    worker_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=config.CHECK_WORKER_CONCURRENCY,
+        help='Количество одновременно выполняемых проверок'
+    )
+    worker_parser.add_argument(
+        '--once',
+        action='store_true',
+        help='Выполнить одну порцию задач и завершиться'
+    )
+    _add_parse_workers_argument(worker_parser)
+    cleanup_jobs_parser = subparsers.add_parser(
+        'cleanup-jobs',
+        help='Удалить завершённые задачи фоновых проверок'
+    )
+    cleanup_jobs_parser.add_argument(
+        '--older-than',
+        type=float,
+        default=config.CHECK_JOB_RETENTION_DAYS,
+        help='Удалить задачи, завершённые больше указанного числа дней назад'
+    )
+    schedule_parser = subparsers.add_parser(
+        'schedule',
+        help='Задать интервал повторных проверок URL'
+    )
+    schedule_group = schedule_parser.add_mutually_exclusive_group(
+        required=True
+    )
+    schedule_group.add_argument(
+        '--interval',
+        type=int,
+        help='Интервал между проверками, секунды'
+    )
+    schedule_group.add_argument(
+        '--off',
+        action='store_true',
+        help='Снять URL с расписания'
+    )
+    schedule_parser.add_argument(
+        '--ids',
+        type=int,
+        nargs='+',
+        help='Изменить расписание только URL с указанными ID'
+    )
+    scheduler_parser = subparsers.add_parser(
+        'scheduler',
+        help='Запустить планировщик повторных проверок'
+    )
+    scheduler_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=config.SCHEDULER_CONCURRENCY,
+        help='Количество одновременно выполняемых проверок'
+    )
+    scheduler_parser.add_argument(
+        '--once',
+        action='store_true',
+        help='Проверить одну порцию URL и завершиться'
+    )
+    _add_parse_workers_argument(scheduler_parser)
+    bench_parser = subparsers.add_parser(
+        'bench-parsers',
+        help='Сравнить скорость реализаций разбора HTML'
+    )
+    bench_parser.add_argument(
+        'corpus',
+        help='Каталог с HTML-страницами (*.html)'
+    )
+    bench_parser.add_argument(
+        '--backends',
+        nargs='+',
+        help='Реализации для сравнения. По умолчанию все установленные'
+    )
+    bench_parser.add_argument(
+        '--repeat',
+        type=int,
+        default=20,
+        help='Сколько раз разобрать каждую страницу'
+    )
+    import_parser = subparsers.add_parser(
+        'import-urls',
+        help='Импортировать URL из CSV-файла или списка по одному в строке'
+    )
+    import_parser.add_argument(
+        'path',
+        help='Путь к файлу или - для чтения из стандартного ввода'
+    )
+    export_parser = subparsers.add_parser(
+        'export',
+        help='Выгрузить историю проверок с URL в CSV или NDJSON'
+    )
+    export_parser.add_argument(
+        '--format',
+        choices=sorted(FORMATS),
+        default='csv',
+        help='Формат выгрузки'
+    )
+    export_parser.add_argument(
+        '--since',
+        help='Начало периода в формате ISO 8601, включительно'
+    )
+    export_parser.add_argument(
+        '--until',
+        help='Конец периода в формате ISO 8601; дата без времени '
+             'включает весь день'
+    )
+    export_parser.add_argument(
+        '--status',
+        action='append',
+        help='Код ответа (можно указать несколько раз)'
+    )
+    export_parser.add_argument(
+        '--output',
+        default='-',
+        help='Путь к файлу или - для вывода в стандартный вывод'
+    )
+    return parser
+
+
+def _add_parse_workers_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=config.PARSE_WORKERS,
+        help='Количество процессов для разбора страниц (0 - без пула)'
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа консольной команды page-analyzer.
+
+    Args:
+        argv: Аргументы командной строки. По умолчанию sys.argv.
+
+    Returns:
+        int: Код завершения процесса.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command](args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,6 +11,14 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+def _get_bool(name: str, default: bool) -> bool:
+    """Чтение логического флага из переменной окружения."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
 class Config:
     """Класс для управления конфигурацией приложения."""
 
@@ -18,6 +26,17 @@ class Config:
     DATABASE_URL: Optional[str] = os.getenv('DATABASE_URL')
     DB_RETRIES: int = int(os.getenv('DB_RETRIES', '3'))
 
+    # Настройки пула подключений к базе данных
+    DB_POOL_ENABLED: bool = _get_bool('DB_POOL_ENABLED', True)
+    DB_POOL_MIN_SIZE: int = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+    DB_POOL_MAX_SIZE: int = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+    # Время ожидания свободного подключения, секунды
+    DB_POOL_TIMEOUT: float = float(os.getenv('DB_POOL_TIMEOUT', '5'))
+    # Простой подключения, после которого оно проверяется перед выдачей
+    DB_POOL_HEALTH_CHECK_INTERVAL: float = float(
+        os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', '30')
+    )
+
     # Настройки Flask
     # SECRET_KEY используется для подписывания сессий и flash-сообщений
     SECRET_KEY: Optional[str] = os.getenv('SECRET_KEY')
@@ -34,6 +53,141 @@ class Config:
         os.getenv('MAX_RESPONSE_SIZE', '10485760')
     )
     MAX_REDIRECTS: int = int(os.getenv('MAX_REDIRECTS', '10'))
+    # Разбирать страницу по мере загрузки и прекращать чтение, как только
+    # найдены h1, title и description
+    STREAMING_PARSE: bool = _get_bool('STREAMING_PARSE', True)
+    # Реализация полного разбора страницы: auto (самая быстрая
+    # из установленных), selectolax, lxml или html.parser
+    PARSER_BACKEND: str = os.getenv('PARSER_BACKEND', 'auto')
+    # Количество процессов для разбора страниц при проверках; 0 - разбор
+    # в потоке проверки. Если задано, потоковый разбор не используется
+    PARSE_WORKERS: int = int(os.getenv('PARSE_WORKERS', '0'))
+    # Максимальное время разбора одной страницы в пуле процессов, секунды
+    PARSE_TIMEOUT: float = float(os.getenv('PARSE_TIMEOUT', '30'))
+    # Условные повторные проверки: запрос с If-None-Match/If-Modified-Since
+    # и сравнение хэша тела с предыдущей проверкой
+    CONDITIONAL_CHECKS: bool = _get_bool('CONDITIONAL_CHECKS', True)
+    # Условные ответы страниц /urls и /urls/<id>: ETag по версии данных
+    # и 304 Not Modified без запросов страницы и отрисовки
+    CONDITIONAL_RESPONSES: bool = _get_bool('CONDITIONAL_RESPONSES', True)
+    # Объём кэша результатов разбора по хэшу тела страницы, байты;
+    # 0 отключает кэш
+    PARSE_CACHE_SIZE: int = int(os.getenv('PARSE_CACHE_SIZE', '8388608'))
+    # Каталог общего для процессов дискового уровня кэша разбора
+    PARSE_CACHE_DIR: Optional[str] = os.getenv('PARSE_CACHE_DIR') or None
+    # Объём дискового уровня кэша разбора, байты; при превышении
+    # удаляются давно не использованные записи, 0 - без ограничения
+    PARSE_CACHE_DIR_SIZE: int = int(
+        os.getenv('PARSE_CACHE_DIR_SIZE', '268435456')
+    )
+    # Количество хостов, для которых хранятся открытые соединения
+    HTTP_POOL_CONNECTIONS: int = int(
+        os.getenv('HTTP_POOL_CONNECTIONS', '100')
+    )
+    # Максимум соединений с одним хостом
+    HTTP_POOL_MAXSIZE: int = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))
+    # Простой хоста, после которого его соединения закрываются, секунды
+    HTTP_POOL_IDLE_TIMEOUT: float = float(
+        os.getenv('HTTP_POOL_IDLE_TIMEOUT', '60')
+    )
+    # Кэш разрешения имён хостов: количество записей (0 - без кэша),
+    # время хранения адресов и ошибок NXDOMAIN, секунды
+    DNS_CACHE_SIZE: int = int(os.getenv('DNS_CACHE_SIZE', '1024'))
+    DNS_CACHE_TTL: float = float(os.getenv('DNS_CACHE_TTL', '60'))
+    DNS_CACHE_NEGATIVE_TTL: float = float(
+        os.getenv('DNS_CACHE_NEGATIVE_TTL', '30')
+    )
+
+    # Вежливость к хостам: не больше HOST_RATE_LIMIT запросов в секунду
+    # к одному хосту (0 - без ограничения), HOST_RATE_BURST подряд
+    HOST_RATE_LIMIT: float = float(os.getenv('HOST_RATE_LIMIT', '0'))
+    HOST_RATE_BURST: int = int(os.getenv('HOST_RATE_BURST', '5'))
+    # После HOST_FAILURE_THRESHOLD ошибок подключения или таймаутов подряд
+    # запросы к хосту отклоняются на HOST_RESET_TIMEOUT секунд
+    # (0 - без предохранителя)
+    HOST_FAILURE_THRESHOLD: int = int(
+        os.getenv('HOST_FAILURE_THRESHOLD', '5')
+    )
+    HOST_RESET_TIMEOUT: float = float(os.getenv('HOST_RESET_TIMEOUT', '60'))
+
+    # Настройки пакетной проверки URL
+    BATCH_CHECK_CONCURRENCY: int = int(
+        os.getenv('BATCH_CHECK_CONCURRENCY', '10')
+    )
+    BATCH_CHECK_PER_HOST: int = int(os.getenv('BATCH_CHECK_PER_HOST', '2'))
+    BATCH_CHECK_SIZE: int = int(os.getenv('BATCH_CHECK_SIZE', '100'))
+    # threads - пул потоков и requests, async - asyncio и httpx
+    BATCH_CHECK_ENGINE: str = os.getenv('BATCH_CHECK_ENGINE', 'threads')
+
+    # Кэш отрисованных страниц /urls и /urls/<id>: объём в памяти
+    # процесса, байты (0 - без кэша), и время хранения, секунды
+    RENDER_CACHE_SIZE: int = int(os.getenv('RENDER_CACHE_SIZE', '0'))
+    RENDER_CACHE_TTL: float = float(os.getenv('RENDER_CACHE_TTL', '30'))
+    # Каталог, общий для воркеров узла: через него согласуются кэши
+    # воркеров. Без него кэш каждого воркера независим
+    RENDER_CACHE_DIR: Optional[str] = os.getenv('RENDER_CACHE_DIR') or None
+    # Инвалидация кэша по уведомлениям PostgreSQL (LISTEN/NOTIFY) об
+    # изменениях, сделанных другими воркерами и узлами
+    RENDER_CACHE_LISTEN: bool = _get_bool('RENDER_CACHE_LISTEN', True)
+
+    # Настройки фоновых проверок
+    # Если включено, проверка из веб-интерфейса ставится в очередь
+    # и выполняется воркером (page-analyzer worker)
+    CHECKS_ASYNC: bool = _get_bool('CHECKS_ASYNC', False)
+    CHECK_WORKER_CONCURRENCY: int = int(
+        os.getenv('CHECK_WORKER_CONCURRENCY', '4')
+    )
+    # Пауза между опросами пустой очереди, секунды
+    CHECK_WORKER_POLL_INTERVAL: float = float(
+        os.getenv('CHECK_WORKER_POLL_INTERVAL', '1')
+    )
+    # Время, после которого выполняемая задача считается брошенной
+    CHECK_JOB_TIMEOUT: float = float(os.getenv('CHECK_JOB_TIMEOUT', '120'))
+    # Количество захватов брошенной задачи, после которого она
+    # завершается с ошибкой
+    CHECK_JOB_MAX_ATTEMPTS: int = int(
+        os.getenv('CHECK_JOB_MAX_ATTEMPTS', '3')
+    )
+    # Сколько дней хранить завершённые задачи (page-analyzer cleanup-jobs)
+    CHECK_JOB_RETENTION_DAYS: float = float(
+        os.getenv('CHECK_JOB_RETENTION_DAYS', '7')
+    )
+
+    # Планировщик повторных проверок (page-analyzer scheduler)
+    SCHEDULER_CONCURRENCY: int = int(os.getenv('SCHEDULER_CONCURRENCY', '4'))
+    # Количество URL, захватываемых за один опрос
+    SCHEDULER_BATCH_SIZE: int = int(os.getenv('SCHEDULER_BATCH_SIZE', '100'))
+    # Пауза между опросами, если проверять нечего, секунды
+    SCHEDULER_POLL_INTERVAL: float = float(
+        os.getenv('SCHEDULER_POLL_INTERVAL', '5')
+    )
+    # Случайное отклонение следующей проверки, доля интервала
+    SCHEDULER_JITTER: float = float(os.getenv('SCHEDULER_JITTER', '0.1'))
+
+    # Буферизованная запись результатов пакетных и фоновых проверок
+    CHECK_WRITER_BATCH_SIZE: int = int(
+        os.getenv('CHECK_WRITER_BATCH_SIZE', '100')
+    )
+    # Максимальное время ожидания проверки в буфере, секунды
+    CHECK_WRITER_MAX_LATENCY: float = float(
+        os.getenv('CHECK_WRITER_MAX_LATENCY', '1')
+    )
+    # Ёмкость буфера, при заполнении новые проверки ждут записи
+    CHECK_WRITER_MAX_PENDING: int = int(
+        os.getenv('CHECK_WRITER_MAX_PENDING', '1000')
+    )
+
+    # Настройки постраничного вывода списка URL
+    URLS_PAGE_SIZE: int = int(os.getenv('URLS_PAGE_SIZE', '50'))
+    URLS_MAX_PAGE_SIZE: int = int(os.getenv('URLS_MAX_PAGE_SIZE', '200'))
+    # Количество строк, читаемых из БД за раз при потоковом выводе
+    # всего списка URL (/urls?all=1)
+    URLS_STREAM_BATCH_SIZE: int = int(
+        os.getenv('URLS_STREAM_BATCH_SIZE', '1000')
+    )
+    # Количество проверок, читаемых из БД и отправляемых клиенту за раз
+    # при выгрузке (/checks/export, page-analyzer export)
+    EXPORT_BATCH_SIZE: int = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
 
     @classmethod
     def validate(cls) -> None:
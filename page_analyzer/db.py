@@ -1,40 +1,96 @@
 import logging
 import time
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 from psycopg2 import connect, Error as DBError
-from psycopg2.extras import NamedTupleCursor
+from psycopg2.extras import NamedTupleCursor, execute_values
 from .config import config
+from .pool import get_pool
 
 logger = logging.getLogger(__name__)
 
+# Обновление сводки о последней проверке URL. Проверка считается более
+# новой по паре (created_at, id), как и в get_last_check_by_url_id.
+UPDATE_LATEST_CHECK_QUERY = """
+    UPDATE urls
+    SET last_check_id = %(check_id)s,
+        last_check_status_code = %(status_code)s,
+        last_check_at = %(created_at)s
+    WHERE id = %(url_id)s
+      AND (
+          last_check_at IS NULL
+          OR (last_check_at, last_check_id) < (%(created_at)s, %(check_id)s)
+      )
+"""
+
 
 class DatabaseConnection:
-    """Контекстный менеджер для работы с подключением к базе данных."""
+    """Контекстный менеджер для работы с подключением к базе данных.
+
+    Если включён пул (``DB_POOL_ENABLED``), подключение берётся из пула
+    процесса и возвращается в него при выходе из контекста.
+    """
 
-    def __init__(self, retries: Optional[int] = None) -> None:
+    def __init__(
+        self,
+        retries: Optional[int] = None,
+        pooled: Optional[bool] = None,
+        cursor_name: Optional[str] = None
+    ) -> None:
         """
         Инициализация менеджера подключения.
 
         Args:
             retries: Количество попыток переподключения при ошибке.
                     Если не указано, используется значение из конфигурации.
+            pooled: Использовать пул подключений. Если не указано,
+                    используется значение из конфигурации.
+            cursor_name: Имя курсора на стороне сервера. Если указано,
+                    результат запроса читается порциями (fetchmany),
+                    а не передаётся клиенту целиком.
         """
         self.retries = retries if retries is not None else config.DB_RETRIES
+        self.pooled = pooled if pooled is not None else config.DB_POOL_ENABLED
+        self.cursor_name = cursor_name
         self.connection: Optional[Any] = None
         self.cursor: Optional[Any] = None
 
+    def _acquire(self) -> Any:
+        """Получение подключения из пула или открытие нового."""
+        if self.pooled:
+            return get_pool().getconn()
+        return connect(config.get_database_url())
+
+    def _release(self, broken: bool = False) -> None:
+        """Возврат подключения в пул или его закрытие.
+
+        Args:
+            broken: Подключение в неизвестном состоянии и не должно
+                    переиспользоваться.
+        """
+        if self.pooled:
+            get_pool().putconn(self.connection, close=broken)
+            self.connection = None
+            return
+        try:
+            self.connection.close()
+        except DBError as e:
+            logger.error(f'Ошибка при закрытии подключения: {str(e)}')
+
     def __enter__(self) -> Any:
         """Открытие подключения к базе данных с обработкой ошибок."""
         last_exception = None
         for attempt in range(self.retries):
             try:
-                self.connection = connect(config.get_database_url())
+                self.connection = self._acquire()
                 self.cursor = self.connection.cursor(
-                    cursor_factory=NamedTupleCursor
+                    self.cursor_name, cursor_factory=NamedTupleCursor
                 )
                 return self.cursor
             except DBError as e:
+                if self.connection is not None:
+                    self._release(broken=True)
+                    self.connection = None
                 last_exception = e
                 attempt_num = attempt + 1
                 logger.error(
@@ -65,10 +121,14 @@ class DatabaseConnection:
                 logger.error(f'Ошибка при закрытии курсора: {str(e)}')
 
         if self.connection:
+            broken = False
             try:
                 if exc_type is None:
                     # Коммитим только если не было исключений
                     self.connection.commit()
+                elif issubclass(exc_type, GeneratorExit):
+                    # Чтение генератором прекращено до конца результата
+                    self.connection.rollback()
                 else:
                     # Откатываем транзакцию при ошибке
                     self.connection.rollback()
@@ -77,12 +137,10 @@ class DatabaseConnection:
                         f'{exc_type.__name__}: {exc_value}'
                     )
             except DBError as e:
+                broken = True
                 logger.error(f'Ошибка при коммите/откате транзакции: {str(e)}')
             finally:
-                try:
-                    self.connection.close()
-                except DBError as e:
-                    logger.error(f'Ошибка при закрытии подключения: {str(e)}')
+                self._release(broken)
 
 
 def add_url(url: str) -> int:
@@ -109,6 +167,109 @@ def add_url(url: str) -> int:
         raise
 
 
+def upsert_url(url: str) -> Tuple[int, bool]:
+    """Добавление URL, если его ещё нет, одним запросом.
+
+    В отличие от последовательных get_url_by_name и add_url, запрос
+    атомарен: при одновременном добавлении одного URL обе транзакции
+    получают ID одной записи, и ровно одна из них - признак вставки.
+
+    Args:
+        url: URL для добавления.
+
+    Returns:
+        tuple: ID URL и признак того, что запись была создана.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            # DO UPDATE вместо DO NOTHING, чтобы RETURNING вернул и
+            # существующую строку; xmax = 0 только у вставленной строки
+            cursor.execute(
+                'INSERT INTO urls (name, created_at) VALUES (%s, %s) '
+                'ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name '
+                'RETURNING id, (xmax = 0) AS inserted',
+                (url, datetime.now())
+            )
+            row = cursor.fetchone()
+            return row.id, row.inserted
+    except DBError as e:
+        logger.error(f'Ошибка при добавлении URL {url}: {str(e)}')
+        raise
+
+
+def import_urls(names: Iterable[str]) -> int:
+    """Массовое добавление URL.
+
+    URL загружаются через COPY во временную таблицу, а затем добавляются
+    одним запросом; уже существующие URL пропускаются. Итератор читается
+    по мере загрузки, поэтому список целиком в памяти не хранится.
+
+    Args:
+        names: Нормализованные URL в порядке добавления.
+
+    Returns:
+        int: Количество добавленных URL.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute(
+                'CREATE TEMP TABLE url_import ('
+                'position bigint GENERATED ALWAYS AS IDENTITY, '
+                'name varchar NOT NULL'
+                ') ON COMMIT DROP'
+            )
+            cursor.copy_expert(
+                'COPY url_import (name) FROM STDIN',
+                _CopyReader(names)
+            )
+            cursor.execute(
+                'INSERT INTO urls (name, created_at) '
+                'SELECT name, %s FROM url_import ORDER BY position '
+                'ON CONFLICT (name) DO NOTHING',
+                (datetime.now(), )
+            )
+            inserted = cursor.rowcount
+            logger.info(f'Импортировано URL: {inserted}')
+            return inserted
+    except DBError as e:
+        logger.error(f'Ошибка при импорте URL: {str(e)}')
+        raise
+
+
+class _CopyReader:
+    """Файлоподобный источник данных COPY из итератора строк."""
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        self._lines: Iterator[str] = iter(lines)
+        self._buffer = ''
+
+    def read(self, size: int = -1) -> str:
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            # Экранирование текстового формата COPY
+            line = (
+                line.replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r')
+            ) + '\n'
+            parts.append(line)
+            length += len(line)
+        data = ''.join(parts)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+
 def get_url_by_name(url: str) -> Optional[Any]:
     """Получение URL по имени.
 
@@ -153,8 +314,23 @@ def get_url_by_id(id: int) -> Optional[Any]:
         raise
 
 
-def get_all_urls() -> List[Any]:
-    """Получение списка всех URL с последними проверками.
+def get_all_urls(
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = None
+) -> List[Any]:
+    """Получение списка URL с последними проверками.
+
+    URL отсортированы по ID по убыванию. Для постраничного вывода
+    используется пагинация по ключу: ``after_id`` возвращает URL с ID
+    меньше указанного (следующая страница), ``before_id`` - с ID больше
+    указанного (предыдущая страница).
+
+    Args:
+        after_id: ID, после которого начинается страница.
+        before_id: ID, перед которым заканчивается страница.
+        limit: Максимальное количество URL. Если не указано,
+               возвращаются все подходящие URL.
 
     Returns:
         list: Список URL с информацией о последней проверке.
@@ -162,38 +338,223 @@ def get_all_urls() -> List[Any]:
     Raises:
         DBError: При ошибке выполнения запроса к БД.
     """
+    conditions = []
+    params: List[Any] = []
+    if after_id is not None:
+        conditions.append('id < %s')
+        params.append(after_id)
+    if before_id is not None:
+        conditions.append('id > %s')
+        params.append(before_id)
+    where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+    # Предыдущая страница выбирается по возрастанию ID и разворачивается
+    backwards = before_id is not None and after_id is None
+    order = 'ASC' if backwards else 'DESC'
+    limit_clause = ''
+    if limit is not None:
+        limit_clause = 'LIMIT %s'
+        params.append(limit)
     try:
         with DatabaseConnection() as cursor:
-            # Оптимизированный запрос с подзапросом для последней проверки
-            query = ("""
+            # Последняя проверка хранится в самой таблице urls
+            # и обновляется в add_check
+            query = (f"""
                 SELECT
-                    urls.id,
-                    urls.name,
-                    latest_check.status_code,
-                    latest_check.created_at AS last_check
+                    id,
+                    name,
+                    last_check_status_code AS status_code,
+                    last_check_at AS last_check
                 FROM urls
-                LEFT JOIN LATERAL (
-                    SELECT status_code, created_at
-                    FROM url_checks
-                    WHERE url_checks.url_id = urls.id
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                ) AS latest_check ON true
-                ORDER BY urls.id DESC
+                {where}
+                ORDER BY id {order}
+                {limit_clause}
             """)
-            cursor.execute(query)
-            return cursor.fetchall()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            return rows[::-1] if backwards else rows
     except DBError as e:
         logger.error(f'Ошибка при получении списка URL: {str(e)}')
         raise
 
 
+def iter_all_urls(batch_size: int = 1000) -> Iterator[Any]:
+    """Получение всех URL с последними проверками по мере чтения.
+
+    Запрос выполняется курсором на стороне сервера, строки читаются
+    порциями по ``batch_size``, поэтому память процесса не зависит от
+    количества URL. Подключение занято, пока генератор не исчерпан
+    или не закрыт.
+
+    Args:
+        batch_size: Количество строк в одной порции.
+
+    Yields:
+        NamedTuple: URL с полями id, name, status_code и last_check
+        в порядке убывания ID.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection(cursor_name='iter_all_urls') as cursor:
+            cursor.execute("""
+                SELECT
+                    id,
+                    name,
+                    last_check_status_code AS status_code,
+                    last_check_at AS last_check
+                FROM urls
+                ORDER BY id DESC
+            """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+    except DBError as e:
+        logger.error(f'Ошибка при чтении списка URL: {str(e)}')
+        raise
+
+
+def iter_checks_export(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    status_codes: Optional[List[int]] = None,
+    batch_size: int = 1000
+) -> Iterator[Any]:
+    """Получение истории проверок с URL для выгрузки по мере чтения.
+
+    Запрос выполняется курсором на стороне сервера, строки читаются
+    порциями по ``batch_size``, поэтому память процесса не зависит от
+    количества проверок.
+
+    Args:
+        since: Начало периода (включительно) по времени проверки.
+        until: Конец периода (не включительно) по времени проверки.
+        status_codes: Коды ответа, проверки с которыми выгружаются.
+        batch_size: Количество строк в одной порции.
+
+    Yields:
+        NamedTuple: Проверка с полями url_id, url, check_id, status_code,
+        h1, title, description и created_at в порядке времени проверки.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    conditions = []
+    params: List[Any] = []
+    if since is not None:
+        conditions.append('url_checks.created_at >= %s')
+        params.append(since)
+    if until is not None:
+        conditions.append('url_checks.created_at < %s')
+        params.append(until)
+    if status_codes:
+        conditions.append('url_checks.status_code = ANY(%s)')
+        params.append(list(status_codes))
+    where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+    try:
+        with DatabaseConnection(cursor_name='iter_checks_export') as cursor:
+            cursor.execute(f"""
+                SELECT
+                    urls.id AS url_id,
+                    urls.name AS url,
+                    url_checks.id AS check_id,
+                    url_checks.status_code,
+                    url_checks.h1,
+                    url_checks.title,
+                    url_checks.description,
+                    url_checks.created_at
+                FROM url_checks
+                JOIN urls ON urls.id = url_checks.url_id
+                {where}
+                ORDER BY url_checks.created_at, url_checks.id
+            """, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+    except DBError as e:
+        logger.error(f'Ошибка при выгрузке проверок: {str(e)}')
+        raise
+
+
+def get_urls_version() -> int:
+    """Получение версии данных списка URL.
+
+    Версия увеличивается триггерами при добавлении и удалении URL
+    и изменении сводки о последней проверке в той же транзакции, что
+    и запись. Счётчик разбит на строки (шарды), версия - их сумма.
+
+    Returns:
+        int: Версия.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                SELECT coalesce(sum(version), 0) AS version
+                FROM data_versions
+                WHERE name = 'urls'
+            """)
+            return int(cursor.fetchone().version)
+    except DBError as e:
+        logger.error(f'Ошибка при получении версии списка URL: {str(e)}')
+        raise
+
+
+def get_url_version(id: int) -> Optional[Any]:
+    """Получение версии данных страницы URL.
+
+    Количество проверок и ID последней из них читаются из индекса
+    idx_url_checks_url_id_created_at без обращения к строкам проверок.
+
+    Args:
+        id: ID URL.
+
+    Returns:
+        NamedTuple или None: Поля checks_count, max_check_id,
+        check_interval и next_check_at или None, если URL не найден.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                SELECT
+                    checks.checks_count,
+                    checks.max_check_id,
+                    urls.check_interval,
+                    urls.next_check_at
+                FROM urls
+                CROSS JOIN LATERAL (
+                    SELECT count(*) AS checks_count, max(id) AS max_check_id
+                    FROM url_checks
+                    WHERE url_id = urls.id
+                ) AS checks
+                WHERE urls.id = %s
+            """, (id, ))
+            return cursor.fetchone()
+    except DBError as e:
+        logger.error(f'Ошибка при получении версии URL ID {id}: {str(e)}')
+        raise
+
+
 def add_check(data: Dict[str, Any]) -> None:
     """Добавление новой проверки URL в базу данных.
 
+    В той же транзакции обновляется сводка о последней проверке в таблице
+    urls. Сводка не перезаписывается более ранней проверкой, если
+    параллельная транзакция уже сохранила более новую.
+
     Args:
         data: Словарь с данными проверки (url_id, status_code, h1,
-              title, description).
+              title, description и необязательные etag, last_modified,
+              body_hash).
 
     Raises:
         DBError: При ошибке выполнения запроса к БД.
@@ -202,16 +563,28 @@ def add_check(data: Dict[str, Any]) -> None:
         with DatabaseConnection() as cursor:
             query = ('INSERT INTO url_checks '
                      '(url_id, status_code, h1, title, description, '
-                     'created_at) VALUES (%s, %s, %s, %s, %s, %s)')
+                     'etag, last_modified, body_hash, created_at) '
+                     'VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) '
+                     'RETURNING id, created_at')
             values = (
                 data.get('url_id'),
                 data.get('status_code'),
                 data.get('h1'),
                 data.get('title'),
                 data.get('description'),
+                data.get('etag'),
+                data.get('last_modified'),
+                data.get('body_hash'),
                 datetime.now()
             )
             cursor.execute(query, values)
+            check = cursor.fetchone()
+            cursor.execute(UPDATE_LATEST_CHECK_QUERY, {
+                'url_id': data.get('url_id'),
+                'check_id': check.id,
+                'status_code': data.get('status_code'),
+                'created_at': check.created_at,
+            })
             url_id = data.get('url_id')
             logger.info(f'Добавлена проверка для URL ID {url_id}')
     except DBError as e:
@@ -221,6 +594,168 @@ def add_check(data: Dict[str, Any]) -> None:
         raise
 
 
+def add_checks(checks: List[Dict[str, Any]]) -> int:
+    """Пакетное добавление проверок URL в одной транзакции.
+
+    Проверки вставляются одним запросом, после чего одним запросом
+    обновляется сводка о последней проверке затронутых URL.
+
+    Args:
+        checks: Список словарей с данными проверок в формате add_check.
+
+    Returns:
+        int: Количество добавленных проверок.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    if not checks:
+        return 0
+    created_at = datetime.now()
+    try:
+        with DatabaseConnection() as cursor:
+            inserted = execute_values(
+                cursor,
+                'INSERT INTO url_checks '
+                '(url_id, status_code, h1, title, description, '
+                'etag, last_modified, body_hash, created_at) '
+                'VALUES %s RETURNING id, url_id, status_code, created_at',
+                [(
+                    data.get('url_id'),
+                    data.get('status_code'),
+                    data.get('h1'),
+                    data.get('title'),
+                    data.get('description'),
+                    data.get('etag'),
+                    data.get('last_modified'),
+                    data.get('body_hash'),
+                    created_at
+                ) for data in checks],
+                fetch=True
+            )
+            # Для каждого URL в сводку попадает последняя проверка пакета
+            latest: Dict[int, Any] = {}
+            for check in inserted:
+                current = latest.get(check.url_id)
+                if current is None or (
+                    (check.created_at, check.id)
+                    > (current.created_at, current.id)
+                ):
+                    latest[check.url_id] = check
+            execute_values(
+                cursor,
+                """
+                UPDATE urls
+                SET last_check_id = v.check_id,
+                    last_check_status_code = v.status_code,
+                    last_check_at = v.created_at
+                FROM (VALUES %s) AS v(url_id, check_id, status_code,
+                                      created_at)
+                WHERE urls.id = v.url_id
+                  AND (
+                      urls.last_check_at IS NULL
+                      OR (urls.last_check_at, urls.last_check_id)
+                         < (v.created_at, v.check_id)
+                  )
+                """,
+                [(c.url_id, c.id, c.status_code, c.created_at)
+                 for c in latest.values()],
+                template='(%s::bigint, %s::bigint, %s::smallint, '
+                         '%s::timestamp)'
+            )
+            logger.info(f'Добавлено проверок: {len(inserted)}')
+            return len(inserted)
+    except DBError as e:
+        logger.error(f'Ошибка при пакетном добавлении проверок: {str(e)}')
+        raise
+
+
+def get_urls_for_check(
+    ids: Optional[List[int]] = None,
+    unchecked_only: bool = False,
+    limit: Optional[int] = None
+) -> List[Any]:
+    """Получение URL для пакетной проверки.
+
+    Args:
+        ids: Проверять только URL с указанными ID.
+        unchecked_only: Только URL, которые ещё ни разу не проверялись.
+        limit: Максимальное количество URL.
+
+    Returns:
+        list: Записи URL с полями id и name, упорядоченные по ID.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    conditions = []
+    params: List[Any] = []
+    if ids is not None:
+        conditions.append('id = ANY(%s)')
+        params.append(list(ids))
+    if unchecked_only:
+        conditions.append('last_check_id IS NULL')
+    where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+    limit_clause = ''
+    if limit is not None:
+        limit_clause = 'LIMIT %s'
+        params.append(limit)
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute(
+                f'SELECT id, name FROM urls {where} ORDER BY id {limit_clause}',
+                params
+            )
+            return cursor.fetchall()
+    except DBError as e:
+        logger.error(f'Ошибка при получении URL для проверки: {str(e)}')
+        raise
+
+
+def backfill_latest_checks() -> int:
+    """Заполнение сводки о последней проверке для всех URL.
+
+    Пересчитывает сводку в таблице urls по данным url_checks, например
+    после загрузки проверок в обход add_check. Безопасна для повторного
+    запуска.
+
+    Returns:
+        int: Количество обновлённых URL.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                UPDATE urls
+                SET last_check_id = latest.id,
+                    last_check_status_code = latest.status_code,
+                    last_check_at = latest.created_at
+                FROM (
+                    SELECT DISTINCT ON (url_id)
+                        url_id, id, status_code, created_at
+                    FROM url_checks
+                    ORDER BY url_id, created_at DESC, id DESC
+                ) AS latest
+                WHERE urls.id = latest.url_id
+                  AND urls.last_check_id IS DISTINCT FROM latest.id
+                  AND (
+                      urls.last_check_at IS NULL
+                      OR (urls.last_check_at, urls.last_check_id)
+                         < (latest.created_at, latest.id)
+                  )
+            """)
+            updated = cursor.rowcount
+            logger.info(f'Сводка последних проверок обновлена: {updated} URL')
+            return updated
+    except DBError as e:
+        logger.error(
+            f'Ошибка при заполнении сводки последних проверок: {str(e)}'
+        )
+        raise
+
+
 def get_last_check_by_url_id(id: int) -> Optional[Any]:
     """Получение последней проверки для указанного URL.
 
@@ -269,3 +804,276 @@ def get_checks_by_url_id(id: int) -> List[Any]:
         logger.error(f'Ошибка при получении проверок для URL ID {id}: '
                      f'{str(e)}')
         raise
+
+
+def enqueue_check_job(url_id: int) -> Any:
+    """Постановка проверки URL в очередь.
+
+    Если для URL уже есть незавершённая задача, новая не создаётся.
+
+    Args:
+        url_id: ID URL для проверки.
+
+    Returns:
+        NamedTuple: Задача (id, url_id, status) - новая или уже
+        стоящая в очереди.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            job = None
+            # Существующая задача может завершиться между INSERT и SELECT,
+            # тогда повторяем вставку
+            while job is None:
+                cursor.execute("""
+                    INSERT INTO check_jobs (url_id) VALUES (%s)
+                    ON CONFLICT (url_id)
+                        WHERE status IN ('queued', 'running')
+                    DO NOTHING
+                    RETURNING id, url_id, status
+                """, (url_id, ))
+                job = cursor.fetchone()
+                if job is None:
+                    cursor.execute("""
+                        SELECT id, url_id, status FROM check_jobs
+                        WHERE url_id = %s
+                          AND status IN ('queued', 'running')
+                    """, (url_id, ))
+                    job = cursor.fetchone()
+            logger.info(
+                f'Проверка URL ID {url_id} в очереди (задача {job.id})'
+            )
+            return job
+    except DBError as e:
+        logger.error(
+            f'Ошибка при постановке проверки URL ID {url_id} в очередь: '
+            f'{str(e)}'
+        )
+        raise
+
+
+def claim_check_jobs(
+    limit: int,
+    stale_after: float,
+    max_attempts: Optional[int] = None
+) -> List[Any]:
+    """Захват задач проверки воркером.
+
+    Задачи выбираются с ``FOR UPDATE SKIP LOCKED``, поэтому несколько
+    воркеров не получат одну и ту же задачу. Задачи, которые выполняются
+    дольше ``stale_after`` секунд (например, воркер упал), захватываются
+    повторно, пока не исчерпаны попытки; после этого они завершаются
+    с ошибкой.
+
+    Args:
+        limit: Максимальное количество задач.
+        stale_after: Время в секундах, после которого выполняемая задача
+                     считается брошенной.
+        max_attempts: Максимальное количество захватов одной задачи.
+                      По умолчанию CHECK_JOB_MAX_ATTEMPTS.
+
+    Returns:
+        list: Захваченные задачи с полями id и url_id.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    if max_attempts is None:
+        max_attempts = config.CHECK_JOB_MAX_ATTEMPTS
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                UPDATE check_jobs
+                SET status = 'failed', message = %s, finished_at = now()
+                WHERE id IN (
+                    SELECT id FROM check_jobs
+                    WHERE status = 'running'
+                      AND started_at < now() - %s * interval '1 second'
+                      AND attempts >= %s
+                    FOR UPDATE SKIP LOCKED
+                )
+            """, ('Превышено количество попыток', stale_after, max_attempts))
+            if cursor.rowcount:
+                logger.warning(
+                    f'Задач с исчерпанными попытками: {cursor.rowcount}'
+                )
+            cursor.execute("""
+                UPDATE check_jobs
+                SET status = 'running',
+                    started_at = now(),
+                    attempts = attempts + 1
+                WHERE id IN (
+                    SELECT id FROM check_jobs
+                    WHERE status = 'queued'
+                       OR (status = 'running'
+                           AND started_at
+                               < now() - %s * interval '1 second'
+                           AND attempts < %s)
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, url_id
+            """, (stale_after, max_attempts, limit))
+            return cursor.fetchall()
+    except DBError as e:
+        logger.error(f'Ошибка при захвате задач проверки: {str(e)}')
+        raise
+
+
+def finish_check_job(job_id: int, success: bool, message: str) -> None:
+    """Завершение задачи проверки.
+
+    Args:
+        job_id: ID задачи.
+        success: Успешность проверки.
+        message: Сообщение о результате проверки.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                UPDATE check_jobs
+                SET status = %s, message = %s, finished_at = now()
+                WHERE id = %s
+            """, ('done' if success else 'failed', message[:255], job_id))
+    except DBError as e:
+        logger.error(f'Ошибка при завершении задачи {job_id}: {str(e)}')
+        raise
+
+
+def get_check_job(job_id: int) -> Optional[Any]:
+    """Получение задачи проверки по ID.
+
+    Args:
+        job_id: ID задачи.
+
+    Returns:
+        NamedTuple или None: Задача или None.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute('SELECT * FROM check_jobs WHERE id = %s',
+                           (job_id, ))
+            return cursor.fetchone()
+    except DBError as e:
+        logger.error(f'Ошибка при получении задачи {job_id}: {str(e)}')
+        raise
+
+
+def delete_finished_check_jobs(older_than: float) -> int:
+    """Удаление завершённых задач проверки.
+
+    Args:
+        older_than: Возраст задачи после завершения в секундах, начиная
+                    с которого она удаляется.
+
+    Returns:
+        int: Количество удалённых задач.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                DELETE FROM check_jobs
+                WHERE status IN ('done', 'failed')
+                  AND finished_at < now() - %s * interval '1 second'
+            """, (older_than, ))
+            deleted = cursor.rowcount
+        logger.info(f'Удалено завершённых задач проверки: {deleted}')
+        return deleted
+    except DBError as e:
+        logger.error(f'Ошибка при удалении завершённых задач: {str(e)}')
+        raise
+
+
+def set_check_schedule(
+    interval: Optional[int],
+    ids: Optional[List[int]] = None
+) -> int:
+    """Установка интервала повторных проверок URL.
+
+    Первая проверка назначается на случайный момент внутри интервала,
+    чтобы URL, поставленные на расписание одновременно, не проверялись
+    одной волной.
+
+    Args:
+        interval: Интервал между проверками в секундах или None, чтобы
+                  снять URL с расписания.
+        ids: ID URL. Если не указаны, расписание меняется для всех URL.
+
+    Returns:
+        int: Количество обновлённых URL.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    params: List[Any] = [interval, interval]
+    where = ''
+    if ids is not None:
+        where = 'WHERE id = ANY(%s)'
+        params.append(list(ids))
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute(f"""
+                UPDATE urls
+                SET check_interval = %s,
+                    next_check_at = now()
+                        + random() * %s * interval '1 second'
+                {where}
+            """, params)
+            return cursor.rowcount
+    except DBError as e:
+        logger.error(f'Ошибка при изменении расписания проверок: {str(e)}')
+        raise
+
+
+def claim_due_urls(limit: int, jitter: float = 0.0) -> List[Any]:
+    """Захват URL, которые пора проверить, планировщиком.
+
+    URL выбираются с ``FOR UPDATE SKIP LOCKED`` и в том же запросе
+    переносятся на следующий интервал, поэтому несколько планировщиков
+    не получат один и тот же URL. Следующая проверка сдвигается на
+    случайную долю ``jitter`` интервала в любую сторону.
+
+    Args:
+        limit: Максимальное количество URL.
+        jitter: Допустимое отклонение следующей проверки, доля интервала.
+
+    Returns:
+        list: Захваченные URL с полями id и name, начиная с самых
+              просроченных.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    try:
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                WITH due AS (
+                    SELECT id, next_check_at FROM urls
+                    WHERE next_check_at <= now()
+                    ORDER BY next_check_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE urls
+                SET next_check_at = now() + urls.check_interval
+                    * (1 + %s * (2 * random() - 1)) * interval '1 second'
+                FROM due
+                WHERE urls.id = due.id
+                RETURNING urls.id, urls.name, due.next_check_at
+            """, (limit, jitter))
+            return sorted(cursor.fetchall(), key=lambda url: url.next_check_at)
+    except DBError as e:
+        logger.error(f'Ошибка при захвате URL для проверки: {str(e)}')
+        raise
@@ -0,0 +1,218 @@
+"""Кэш разрешения имён хостов для HTTP-запросов проверок."""
+
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib3.util.connection import allowed_gai_family
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Результат getaddrinfo: (family, type, proto, canonname, sockaddr)
+AddrInfo = Tuple[Any, ...]
+# Функция разрешения имени: (хост, порт, семейство адресов) ->
+# (адреса, TTL записи в секундах или None, если TTL неизвестен)
+Resolver = Callable[[str, int, int], Tuple[List[AddrInfo], Optional[float]]]
+
+# Коды ошибок getaddrinfo, означающие, что имени не существует. Временные
+# ошибки (EAI_AGAIN) не кэшируются
+NEGATIVE_ERRORS = frozenset(
+    getattr(socket, name) for name in ('EAI_NONAME', 'EAI_NODATA')
+    if hasattr(socket, name)
+)
+
+
+def system_resolver(
+    host: str, port: int, family: int
+) -> Tuple[List[AddrInfo], Optional[float]]:
+    """Разрешение имени системным резолвером.
+
+    getaddrinfo не сообщает TTL записей, поэтому для них используется
+    TTL кэша.
+
+    Args:
+        host: Имя хоста.
+        port: Порт.
+        family: Семейство адресов (socket.AF_*).
+
+    Returns:
+        tuple: Адреса и None вместо TTL.
+    """
+    return socket.getaddrinfo(host, port, family, socket.SOCK_STREAM), None
+
+
+class DNSCache:
+    """Ограниченный по количеству записей LRU-кэш разрешения имён.
+
+    Запись хранится TTL секунд: TTL, сообщённый резолвером, но не больше
+    ``ttl``. Несуществующие имена (NXDOMAIN) кэшируются на
+    ``negative_ttl`` секунд.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 0,
+        ttl: float = 60.0,
+        negative_ttl: float = 10.0,
+        resolver: Resolver = system_resolver
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            max_entries: Максимальное количество записей. 0 отключает кэш.
+            ttl: Максимальное время хранения записи, секунды.
+            negative_ttl: Время хранения ошибки NXDOMAIN, секунды.
+            resolver: Функция разрешения имени.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.resolver = resolver
+        self._lock = threading.Lock()
+        # Ключ -> (время истечения, адреса или ошибка gaierror)
+        self._entries: 'OrderedDict[Tuple[str, int, int], Tuple[float, Any]]'
+        self._entries = OrderedDict()
+        self._counters = {
+            'hits': 0, 'negative_hits': 0, 'misses': 0, 'evictions': 0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Включён ли кэш."""
+        return self.max_entries > 0
+
+    def resolve(self, host: str, port: int, family: int) -> List[AddrInfo]:
+        """Разрешение имени хоста с использованием кэша.
+
+        Args:
+            host: Имя хоста.
+            port: Порт.
+            family: Семейство адресов (socket.AF_*).
+
+        Returns:
+            list: Адреса в формате socket.getaddrinfo.
+
+        Raises:
+            socket.gaierror: Если имя не удалось разрешить.
+        """
+        if not self.enabled:
+            return self.resolver(host, port, family)[0]
+        key = (host.lower(), port, family)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                if isinstance(entry[1], socket.gaierror):
+                    self._counters['negative_hits'] += 1
+                    raise socket.gaierror(*entry[1].args)
+                self._counters['hits'] += 1
+                return list(entry[1])
+            self._counters['misses'] += 1
+
+        try:
+            addresses, record_ttl = self.resolver(host, port, family)
+        except socket.gaierror as e:
+            if e.errno in NEGATIVE_ERRORS:
+                self._store(key, now + self.negative_ttl, e)
+            raise
+        ttl = self.ttl if record_ttl is None else min(record_ttl, self.ttl)
+        if addresses and ttl > 0:
+            self._store(key, now + ttl, list(addresses))
+        return addresses
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика кэша.
+
+        Returns:
+            dict: Счётчики hits, negative_hits, misses, evictions,
+                  entries - количество записей, hit_rate - доля
+                  запросов, обслуженных из кэша.
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['negative_hits'] + stats['misses']
+        stats['hit_rate'] = (
+            (stats['hits'] + stats['negative_hits']) / lookups
+            if lookups else 0.0
+        )
+        return stats
+
+    def clear(self) -> None:
+        """Очистка кэша и сброс счётчиков."""
+        with self._lock:
+            self._entries.clear()
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def _store(
+        self, key: Tuple[str, int, int], expires_at: float, value: Any
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+
+def create_connection(
+    address: Tuple[str, int],
+    timeout: Any = socket._GLOBAL_DEFAULT_TIMEOUT,
+    source_address: Optional[Tuple[str, int]] = None,
+    socket_options: Optional[Sequence[Tuple[int, int, Any]]] = None
+) -> socket.socket:
+    """Подключение к адресу с разрешением имени через ``dns_cache``.
+
+    Аналог ``urllib3.util.connection.create_connection``: адреса
+    перебираются по порядку, пока не удастся подключиться.
+
+    Args:
+        address: Хост и порт.
+        timeout: Таймаут сокета.
+        source_address: Локальный адрес для bind.
+        socket_options: Опции сокета (level, option, value).
+
+    Returns:
+        socket: Подключённый сокет.
+
+    Raises:
+        socket.gaierror: Если имя не удалось разрешить.
+        OSError: Если не удалось подключиться ни к одному адресу.
+    """
+    host, port = address
+    host = host.strip('[]')
+    error: Optional[OSError] = None
+    for family, socktype, proto, _, sockaddr in dns_cache.resolve(
+        host, port, allowed_gai_family()
+    ):
+        sock = None
+        try:
+            sock = socket.socket(family, socktype, proto)
+            for option in socket_options or ():
+                sock.setsockopt(*option)
+            # Иначе передан маркер таймаута по умолчанию
+            if timeout is None or isinstance(timeout, (int, float)):
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sockaddr)
+            return sock
+        except OSError as e:
+            error = e
+            if sock is not None:
+                sock.close()
+    if error is not None:
+        raise error
+    raise OSError('getaddrinfo returns an empty list')
+
+
+dns_cache = DNSCache(
+    max_entries=config.DNS_CACHE_SIZE,
+    ttl=config.DNS_CACHE_TTL,
+    negative_ttl=config.DNS_CACHE_NEGATIVE_TTL
+)
@@ -0,0 +1,351 @@
+"""Ограничение частоты запросов и предохранитель для хостов проверок."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Хосты без ошибок, к которым не обращались дольше этого времени,
+# удаляются из реестра, секунды
+IDLE_HOST_TIMEOUT = 300.0
+# Как часто (по количеству запросов) искать такие хосты
+PRUNE_EVERY = 1000
+
+
+class HostUnavailable(Exception):
+    """Запрос к хосту отклонён открытым предохранителем."""
+
+
+class TokenBucket:
+    """Ограничение частоты запросов алгоритмом token bucket.
+
+    Запрос резервирует токен, даже если токенов нет: их баланс уходит
+    в минус, а вызывающий ждёт, пока он восстановится. Поэтому
+    одновременные запросы выстраиваются в очередь с интервалом
+    ``1 / rate`` и не требуют повторных попыток.
+    """
+
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        """
+        Инициализация ограничителя.
+
+        Args:
+            rate: Запросов в секунду.
+            burst: Количество запросов, которые можно выполнить подряд
+                    без ожидания.
+            now: Текущее время (time.monotonic).
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = now
+
+    @property
+    def full(self) -> bool:
+        """Восстановлены ли все токены."""
+        return self.tokens >= self.burst
+
+    def reserve(self, now: float) -> float:
+        """Резервирование токена.
+
+        Args:
+            now: Текущее время (time.monotonic).
+
+        Returns:
+            float: Сколько секунд нужно подождать перед запросом.
+        """
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+
+class CircuitBreaker:
+    """Предохранитель для хоста, который не отвечает.
+
+    После ``failure_threshold`` ошибок подряд предохранитель размыкается
+    и запросы к хосту сразу отклоняются. Через ``reset_timeout`` секунд
+    пропускается один пробный запрос: при успехе предохранитель
+    замыкается, при ошибке снова размыкается.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        Инициализация предохранителя.
+
+        Args:
+            failure_threshold: Количество ошибок подряд для размыкания.
+            reset_timeout: Время до пробного запроса, секунды.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at: Optional[float] = None
+
+    def allow(self, now: float) -> bool:
+        """Можно ли выполнить запрос.
+
+        Args:
+            now: Текущее время (time.monotonic).
+
+        Returns:
+            bool: True, если запрос разрешён.
+        """
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+        # Одновременно выполняется один пробный запрос. Если его
+        # результат так и не был записан, через reset_timeout
+        # разрешается следующий
+        if self.probe_started_at is not None and (
+            now - self.probe_started_at < self.reset_timeout
+        ):
+            return False
+        self.probe_started_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Запись успешного запроса."""
+        self.state = CLOSED
+        self.failures = 0
+        self.probe_started_at = None
+
+    def record_failure(self, now: float) -> None:
+        """Запись ошибки подключения или таймаута.
+
+        Args:
+            now: Текущее время (time.monotonic).
+        """
+        self.failures += 1
+        self.probe_started_at = None
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = now
+
+
+class HostGuard:
+    """Реестр ограничителей частоты и предохранителей по хостам.
+
+    Потокобезопасен; ожидание выполняет вызывающий (``acquire`` для
+    потоков, ``reserve`` и ``asyncio.sleep`` для asyncio).
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 1,
+        failure_threshold: int = 0,
+        reset_timeout: float = 30.0
+    ) -> None:
+        """
+        Инициализация реестра.
+
+        Args:
+            rate: Запросов в секунду к одному хосту. 0 - без ограничения.
+            burst: Количество запросов к хосту подряд без ожидания.
+            failure_threshold: Количество ошибок подряд, после которого
+                    запросы к хосту отклоняются. 0 - без предохранителя.
+            reset_timeout: Время до пробного запроса к хосту, секунды.
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._last_used: Dict[str, float] = {}
+        self._counters: Dict[str, Any] = {}
+        self._reset_counters()
+
+    def reserve(self, url: str) -> float:
+        """Разрешение на запрос к хосту URL без ожидания.
+
+        Args:
+            url: URL запроса.
+
+        Returns:
+            float: Сколько секунд нужно подождать перед запросом.
+
+        Raises:
+            HostUnavailable: Если предохранитель хоста разомкнут.
+        """
+        host = _host(url)
+        now = time.monotonic()
+        with self._lock:
+            self._last_used[host] = now
+            self._counters['requests'] += 1
+            if self._counters['requests'] % PRUNE_EVERY == 0:
+                self._prune(now)
+            breaker = self._get_breaker(host)
+            if breaker is not None and not breaker.allow(now):
+                self._counters['rejected'] += 1
+                raise HostUnavailable(host)
+            if not self.rate:
+                return 0.0
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst, now)
+                self._buckets[host] = bucket
+            delay = bucket.reserve(now)
+            if delay:
+                self._counters['waits'] += 1
+                self._counters['wait_total'] += delay
+                self._counters['wait_max'] = max(
+                    self._counters['wait_max'], delay
+                )
+            return delay
+
+    def acquire(self, url: str) -> float:
+        """Ожидание разрешения на запрос к хосту URL.
+
+        Args:
+            url: URL запроса.
+
+        Returns:
+            float: Время ожидания, секунды.
+
+        Raises:
+            HostUnavailable: Если предохранитель хоста разомкнут.
+        """
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def record_success(self, url: str) -> None:
+        """Запись ответа хоста (любого HTTP-статуса).
+
+        Args:
+            url: URL запроса.
+        """
+        if not self.failure_threshold:
+            return
+        host = _host(url)
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is not None:
+                if breaker.state != CLOSED:
+                    logger.info(f'Хост {host} снова отвечает')
+                breaker.record_success()
+
+    def record_failure(self, url: str) -> None:
+        """Запись ошибки подключения или таймаута.
+
+        Args:
+            url: URL запроса.
+        """
+        if not self.failure_threshold:
+            return
+        host = _host(url)
+        with self._lock:
+            breaker = self._get_breaker(host)
+            was_open = breaker.state == OPEN
+            breaker.record_failure(time.monotonic())
+            if breaker.state == OPEN and not was_open:
+                self._counters['opened'] += 1
+                logger.warning(
+                    f'Хост {host} не отвечает, запросы к нему отклоняются '
+                    f'{self.reset_timeout:.0f} с'
+                )
+
+    def state(self, url: str) -> str:
+        """Состояние предохранителя хоста URL.
+
+        Args:
+            url: URL.
+
+        Returns:
+            str: closed, open или half_open.
+        """
+        with self._lock:
+            breaker = self._breakers.get(_host(url))
+            return breaker.state if breaker is not None else CLOSED
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика ограничителей и предохранителей.
+
+        Returns:
+            dict: requests - разрешённых и отклонённых запросов,
+                  waits - запросов, ожидавших ограничителя,
+                  wait_total, wait_max - время ожидания, секунды,
+                  rejected - отклонено предохранителями,
+                  opened - размыканий предохранителей,
+                  breakers - хосты с незамкнутым предохранителем
+                  и его состояние.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['breakers'] = {
+                host: breaker.state
+                for host, breaker in self._breakers.items()
+                if breaker.state != CLOSED
+            }
+        return stats
+
+    def reset(self) -> None:
+        """Сброс состояния всех хостов и счётчиков."""
+        with self._lock:
+            self._buckets.clear()
+            self._breakers.clear()
+            self._last_used.clear()
+            self._reset_counters()
+
+    def _get_breaker(self, host: str) -> Optional[CircuitBreaker]:
+        if not self.failure_threshold:
+            return None
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout
+            )
+            self._breakers[host] = breaker
+        return breaker
+
+    def _prune(self, now: float) -> None:
+        for host, last_used in list(self._last_used.items()):
+            if now - last_used < IDLE_HOST_TIMEOUT:
+                continue
+            breaker = self._breakers.get(host)
+            if breaker is not None and breaker.failures:
+                continue
+            del self._last_used[host]
+            self._breakers.pop(host, None)
+            self._buckets.pop(host, None)
+
+    def _reset_counters(self) -> None:
+        self._counters = {
+            'requests': 0,
+            'waits': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0,
+            'rejected': 0,
+            'opened': 0,
+        }
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or '').lower()
+
+
+host_guard = HostGuard(
+    rate=config.HOST_RATE_LIMIT,
+    burst=config.HOST_RATE_BURST,
+    failure_threshold=config.HOST_FAILURE_THRESHOLD,
+    reset_timeout=config.HOST_RESET_TIMEOUT
+)
@@ -0,0 +1,237 @@
+"""Общая для процесса HTTP-сессия для проверки страниц."""
+
+import atexit
+import logging
+import os
+import socket
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    NameResolutionError,
+    NewConnectionError,
+)
+from urllib3.util.retry import Retry
+from .config import config
+from .dns_cache import create_connection, dns_cache
+
+logger = logging.getLogger(__name__)
+
+
+class _CachedDNSConnectionMixin:
+    """Подключение с разрешением имени через ``dns_cache``.
+
+    Повторяет ``urllib3.connection.HTTPConnection._new_conn``, но вместо
+    системного резолвера использует кэш. Для HTTPS имя хоста по-прежнему
+    используется для SNI и проверки сертификата.
+    """
+
+    def _new_conn(self) -> socket.socket:
+        try:
+            return create_connection(
+                (self._dns_host, self.port),
+                self.timeout,
+                source_address=self.source_address,
+                socket_options=self.socket_options,
+            )
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        except socket.timeout as e:
+            raise ConnectTimeoutError(
+                self,
+                f'Connection to {self.host} timed out. '
+                f'(connect timeout={self.timeout})',
+            ) from e
+        except OSError as e:
+            raise NewConnectionError(
+                self, f'Failed to establish a new connection: {e}'
+            ) from e
+
+
+class CachedDNSHTTPConnection(_CachedDNSConnectionMixin, HTTPConnection):
+    """HTTP-соединение с кэшем разрешения имён."""
+
+
+class CachedDNSHTTPSConnection(_CachedDNSConnectionMixin, HTTPSConnection):
+    """HTTPS-соединение с кэшем разрешения имён."""
+
+
+class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+
+class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """Транспортный адаптер, разрешающий имена хостов через кэш."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CachedDNSHTTPConnectionPool,
+            'https': CachedDNSHTTPSConnectionPool,
+        }
+
+
+class SessionManager:
+    """Потокобезопасный менеджер переиспользуемой HTTP-сессии.
+
+    Все проверки процесса выполняются через одну ``requests.Session``,
+    поэтому повторные запросы к одному хосту используют уже открытые
+    TCP/TLS-соединения. Пул соединений хоста закрывается, если к хосту
+    не обращались дольше ``idle_timeout`` секунд.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 100,
+        pool_maxsize: int = 10,
+        idle_timeout: float = 60.0
+    ) -> None:
+        """
+        Инициализация менеджера.
+
+        Args:
+            pool_connections: Количество хостов, для которых хранятся
+                    пулы соединений.
+            pool_maxsize: Максимальное количество соединений с одним хостом.
+            idle_timeout: Время простоя хоста в секундах, после которого
+                    его соединения закрываются.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._adapter: Optional[HTTPAdapter] = None
+        self._pid = os.getpid()
+        # Время последнего обращения к хосту: (схема, хост, порт) -> время
+        self._last_used: Dict[Tuple[str, str, int], float] = {}
+
+    def create_adapter(self) -> HTTPAdapter:
+        """Создание транспортного адаптера с пулами соединений.
+
+        Returns:
+            HTTPAdapter: Адаптер без автоматических повторов запросов.
+            Если включён кэш DNS, имена хостов разрешаются через него.
+        """
+        adapter_class = (
+            CachedDNSAdapter if dns_cache.enabled else HTTPAdapter
+        )
+        return adapter_class(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=Retry(total=0)
+        )
+
+    def get_session(self) -> requests.Session:
+        """Получение общей сессии (создаётся при первом обращении).
+
+        Returns:
+            Session: HTTP-сессия процесса. Cookie из ответов не
+            сохраняются.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # Соединения родительского процесса не переиспользуем
+                self._session = None
+                self._last_used.clear()
+                self._pid = os.getpid()
+            if self._session is None:
+                session = requests.Session()
+                # Сессия общая для всех проверяемых сайтов: cookie одного
+                # сайта не должны попадать в проверки других и копиться
+                session.cookies.set_policy(
+                    DefaultCookiePolicy(allowed_domains=[])
+                )
+                adapter = self.create_adapter()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+                self._adapter = adapter
+            return self._session
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Выполнение GET-запроса через общую сессию.
+
+        Args:
+            url: URL запроса.
+            **kwargs: Параметры ``requests.Session.get``.
+
+        Returns:
+            Response: Ответ сервера.
+        """
+        session = self.get_session()
+        self.evict_idle()
+        self._touch(url)
+        return session.get(url, **kwargs)
+
+    def evict_idle(self) -> int:
+        """Закрытие пулов соединений хостов, простаивающих слишком долго.
+
+        Returns:
+            int: Количество закрытых пулов.
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle_hosts = {
+                host for host, used_at in self._last_used.items()
+                if now - used_at > self.idle_timeout
+            }
+            for host in idle_hosts:
+                del self._last_used[host]
+            adapter = self._adapter
+        if not idle_hosts or adapter is None:
+            return 0
+
+        pools = adapter.poolmanager.pools
+        evicted = 0
+        for key in pools.keys():
+            host = (key.key_scheme, key.key_host, key.key_port)
+            if host in idle_hosts:
+                # Контейнер пулов закрывает удаляемый пул
+                pools.pop(key, None)
+                evicted += 1
+        if evicted:
+            logger.debug(f'Закрыто простаивающих пулов соединений: {evicted}')
+        return evicted
+
+    def shutdown(self) -> None:
+        """Закрытие сессии и всех её соединений."""
+        with self._lock:
+            session = self._session
+            self._session = None
+            self._adapter = None
+            self._last_used.clear()
+        if session is not None:
+            session.close()
+
+    def _touch(self, url: str) -> None:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        if port is None:
+            port = 443 if scheme == 'https' else 80
+        host = (scheme, (parts.hostname or '').lower(), port)
+        with self._lock:
+            self._last_used[host] = time.monotonic()
+
+
+session_manager = SessionManager(
+    pool_connections=config.HTTP_POOL_CONNECTIONS,
+    pool_maxsize=config.HTTP_POOL_MAXSIZE,
+    idle_timeout=config.HTTP_POOL_IDLE_TIMEOUT
+)
+atexit.register(session_manager.shutdown)
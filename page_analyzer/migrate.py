@@ -0,0 +1,149 @@
+"""Версионные миграции схемы базы данных.
+
+Миграции - это SQL-файлы ``NNNN_описание.sql`` в каталоге ``migrations``.
+Применённые версии записываются в таблицу ``schema_migrations``, каждая
+миграция выполняется в отдельной транзакции.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Set
+from psycopg2 import Error as DBError
+from .db import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / 'migrations'
+MIGRATION_FILE_RE = re.compile(r'^(\d{4})_[\w-]+\.sql$')
+
+# Ключ advisory-блокировки, чтобы миграции не запускались параллельно
+MIGRATIONS_LOCK_ID = 8301
+
+
+class Migration(NamedTuple):
+    """Файл миграции."""
+
+    version: str
+    name: str
+    path: Path
+
+
+def get_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Получение списка миграций, упорядоченного по версии.
+
+    Args:
+        directory: Каталог с SQL-файлами миграций.
+
+    Returns:
+        list: Миграции в порядке применения.
+
+    Raises:
+        ValueError: Если две миграции имеют одинаковую версию.
+    """
+    migrations = []
+    for path in sorted(directory.glob('*.sql')):
+        match = MIGRATION_FILE_RE.match(path.name)
+        if match is None:
+            logger.warning(f'Пропущен файл миграции: {path.name}')
+            continue
+        migrations.append(Migration(match.group(1), path.stem, path))
+
+    versions = [migration.version for migration in migrations]
+    duplicates = {v for v in versions if versions.count(v) > 1}
+    if duplicates:
+        raise ValueError(
+            f'Повторяющиеся версии миграций: {", ".join(sorted(duplicates))}'
+        )
+    return migrations
+
+
+def _ensure_migrations_table(cursor) -> None:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version varchar PRIMARY KEY,
+            name varchar NOT NULL,
+            applied_at timestamp NOT NULL DEFAULT now()
+        )
+    """)
+
+
+def _get_applied_versions(cursor) -> Set[str]:
+    cursor.execute('SELECT version FROM schema_migrations')
+    return {row.version for row in cursor.fetchall()}
+
+
+def get_pending_migrations(
+    directory: Path = MIGRATIONS_DIR
+) -> List[Migration]:
+    """Получение списка ещё не применённых миграций.
+
+    Args:
+        directory: Каталог с SQL-файлами миграций.
+
+    Returns:
+        list: Неприменённые миграции в порядке применения.
+
+    Raises:
+        DBError: При ошибке выполнения запроса к БД.
+    """
+    with DatabaseConnection(pooled=False) as cursor:
+        _ensure_migrations_table(cursor)
+        applied = _get_applied_versions(cursor)
+    return [m for m in get_migrations(directory) if m.version not in applied]
+
+
+def apply_migrations(
+    target: Optional[str] = None,
+    directory: Path = MIGRATIONS_DIR
+) -> List[str]:
+    """Применение неприменённых миграций.
+
+    Args:
+        target: Последняя версия, которую нужно применить.
+                Если не указана, применяются все миграции.
+        directory: Каталог с SQL-файлами миграций.
+
+    Returns:
+        list: Имена применённых миграций.
+
+    Raises:
+        DBError: При ошибке выполнения миграции. Транзакция упавшей
+                 миграции откатывается, предыдущие остаются применёнными.
+    """
+    applied_now = []
+    with DatabaseConnection(pooled=False) as cursor:
+        connection = cursor.connection
+        _ensure_migrations_table(cursor)
+        connection.commit()
+        cursor.execute('SELECT pg_advisory_lock(%s)', (MIGRATIONS_LOCK_ID, ))
+        try:
+            applied = _get_applied_versions(cursor)
+            connection.commit()
+            for migration in get_migrations(directory):
+                if target is not None and migration.version > target:
+                    break
+                if migration.version in applied:
+                    continue
+                logger.info(f'Применение миграции {migration.name}')
+                try:
+                    cursor.execute(migration.path.read_text(encoding='utf-8'))
+                    cursor.execute(
+                        'INSERT INTO schema_migrations (version, name) '
+                        'VALUES (%s, %s)',
+                        (migration.version, migration.name)
+                    )
+                    connection.commit()
+                except DBError as e:
+                    connection.rollback()
+                    logger.error(
+                        f'Ошибка при применении миграции {migration.name}: '
+                        f'{str(e)}'
+                    )
+                    raise
+                applied_now.append(migration.name)
+        finally:
+            cursor.execute(
+                'SELECT pg_advisory_unlock(%s)', (MIGRATIONS_LOCK_ID, )
+            )
+    return applied_now
@@ -0,0 +1,17 @@
+-- Сводка о последней проверке в таблице urls
+ALTER TABLE urls
+    ADD COLUMN IF NOT EXISTS last_check_id bigint,
+    ADD COLUMN IF NOT EXISTS last_check_status_code smallint,
+    ADD COLUMN IF NOT EXISTS last_check_at timestamp;
+
+UPDATE urls
+SET last_check_id = latest.id,
+    last_check_status_code = latest.status_code,
+    last_check_at = latest.created_at
+FROM (
+    SELECT DISTINCT ON (url_id) url_id, id, status_code, created_at
+    FROM url_checks
+    ORDER BY url_id, created_at DESC, id DESC
+) AS latest
+WHERE urls.id = latest.url_id
+  AND urls.last_check_id IS DISTINCT FROM latest.id;
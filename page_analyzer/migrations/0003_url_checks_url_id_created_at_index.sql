@@ -0,0 +1,9 @@
+-- Составной индекс для выборки проверок URL в порядке от новых к старым.
+-- status_code включён в индекс, чтобы последняя проверка читалась
+-- сканированием только индекса.
+CREATE INDEX IF NOT EXISTS idx_url_checks_url_id_created_at
+    ON url_checks (url_id, created_at DESC, id DESC)
+    INCLUDE (status_code);
+
+-- Индекс по url_id покрывается префиксом составного индекса
+DROP INDEX IF EXISTS idx_url_checks_url_id;
@@ -0,0 +1,22 @@
+-- Очередь фоновых проверок URL
+CREATE TABLE IF NOT EXISTS check_jobs (
+    id bigint PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
+    url_id bigint NOT NULL REFERENCES urls (id) ON DELETE CASCADE,
+    -- queued, running, done, failed
+    status varchar(16) NOT NULL DEFAULT 'queued',
+    attempts smallint NOT NULL DEFAULT 0,
+    message varchar(255),
+    created_at timestamp NOT NULL DEFAULT now(),
+    started_at timestamp,
+    finished_at timestamp
+);
+
+-- Для URL не больше одной незавершённой задачи
+CREATE UNIQUE INDEX IF NOT EXISTS idx_check_jobs_active_url_id
+    ON check_jobs (url_id)
+    WHERE status IN ('queued', 'running');
+
+-- Выборка задач воркерами идёт только по незавершённым задачам
+CREATE INDEX IF NOT EXISTS idx_check_jobs_pending
+    ON check_jobs (id)
+    WHERE status IN ('queued', 'running');
@@ -0,0 +1,6 @@
+-- Валидаторы ответа для условных повторных проверок: ETag и Last-Modified
+-- из заголовков ответа и хэш тела страницы
+ALTER TABLE url_checks
+    ADD COLUMN IF NOT EXISTS etag text,
+    ADD COLUMN IF NOT EXISTS last_modified text,
+    ADD COLUMN IF NOT EXISTS body_hash varchar(64);
@@ -0,0 +1,9 @@
+-- Расписание повторных проверок URL
+ALTER TABLE urls
+    ADD COLUMN IF NOT EXISTS check_interval integer,
+    ADD COLUMN IF NOT EXISTS next_check_at timestamp;
+
+-- Планировщик выбирает только URL с расписанием
+CREATE INDEX IF NOT EXISTS idx_urls_next_check_at
+    ON urls (next_check_at)
+    WHERE next_check_at IS NOT NULL;
@@ -0,0 +1,48 @@
+-- Уведомления об изменении URL и проверок для инвалидации кэшей воркеров.
+-- Полезная нагрузка - ID изменившихся URL через запятую или '*', если
+-- список не помещается в уведомление (тогда сбрасывается весь кэш)
+CREATE OR REPLACE FUNCTION notify_url_changes() RETURNS trigger AS $$
+DECLARE
+    payload text;
+BEGIN
+    IF TG_TABLE_NAME = 'url_checks' THEN
+        SELECT string_agg(DISTINCT url_id::text, ',') INTO payload
+        FROM changed_rows;
+    ELSE
+        SELECT string_agg(DISTINCT id::text, ',') INTO payload
+        FROM changed_rows;
+    END IF;
+    IF payload IS NULL THEN
+        RETURN NULL;
+    END IF;
+    IF length(payload) > 7000 THEN
+        payload := '*';
+    END IF;
+    PERFORM pg_notify('url_changes', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS urls_insert_notify ON urls;
+CREATE TRIGGER urls_insert_notify
+    AFTER INSERT ON urls
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_url_changes();
+
+DROP TRIGGER IF EXISTS urls_update_notify ON urls;
+CREATE TRIGGER urls_update_notify
+    AFTER UPDATE ON urls
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_url_changes();
+
+DROP TRIGGER IF EXISTS urls_delete_notify ON urls;
+CREATE TRIGGER urls_delete_notify
+    AFTER DELETE ON urls
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_url_changes();
+
+DROP TRIGGER IF EXISTS url_checks_insert_notify ON url_checks;
+CREATE TRIGGER url_checks_insert_notify
+    AFTER INSERT ON url_checks
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_url_changes();
@@ -0,0 +1,41 @@
+-- Версии данных для условных HTTP-ответов (ETag). Версия увеличивается
+-- в той же транзакции, что и запись, поэтому становится видна вместе с
+-- изменёнными данными и растёт в порядке фиксации транзакций
+CREATE TABLE IF NOT EXISTS data_versions (
+    name varchar(32) PRIMARY KEY,
+    version bigint NOT NULL DEFAULT 0,
+    updated_at timestamp NOT NULL DEFAULT now()
+);
+
+INSERT INTO data_versions (name) VALUES ('urls') ON CONFLICT DO NOTHING;
+
+-- Список URL меняется при добавлении и удалении URL и при сохранении
+-- проверок (сводка о последней проверке)
+CREATE OR REPLACE FUNCTION bump_urls_version() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM changed_rows) THEN
+        UPDATE data_versions
+        SET version = version + 1, updated_at = now()
+        WHERE name = 'urls';
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS urls_insert_version ON urls;
+CREATE TRIGGER urls_insert_version
+    AFTER INSERT ON urls
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_urls_version();
+
+DROP TRIGGER IF EXISTS urls_delete_version ON urls;
+CREATE TRIGGER urls_delete_version
+    AFTER DELETE ON urls
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_urls_version();
+
+DROP TRIGGER IF EXISTS url_checks_insert_version ON url_checks;
+CREATE TRIGGER url_checks_insert_version
+    AFTER INSERT ON url_checks
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_urls_version();
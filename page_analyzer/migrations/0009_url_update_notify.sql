@@ -0,0 +1,55 @@
+-- Уведомления об изменении URL только при изменении отображаемых полей.
+-- Повторная запись того же имени (upsert) не меняет страниц и не
+-- сбрасывает кэши. Изменение расписания меняет только страницы URL,
+-- поэтому отправляется с префиксом 'details:' и не сбрасывает кэш списка.
+-- Сводка о последней проверке, обновлённая вместе с добавлением проверок,
+-- даёт ту же полезную нагрузку, что и url_checks_insert_notify
+-- (string_agg(DISTINCT ...)), а одинаковые уведомления одной транзакции
+-- PostgreSQL доставляет один раз
+CREATE OR REPLACE FUNCTION notify_url_updates() RETURNS trigger AS $$
+DECLARE
+    listed text;
+    details text;
+BEGIN
+    SELECT
+        string_agg(DISTINCT new_rows.id::text, ',') FILTER (
+            WHERE (new_rows.name, new_rows.last_check_id,
+                   new_rows.last_check_status_code, new_rows.last_check_at)
+                IS DISTINCT FROM
+                  (old_rows.name, old_rows.last_check_id,
+                   old_rows.last_check_status_code, old_rows.last_check_at)
+        ),
+        string_agg(DISTINCT new_rows.id::text, ',') FILTER (
+            WHERE (new_rows.name, new_rows.last_check_id,
+                   new_rows.last_check_status_code, new_rows.last_check_at)
+                IS NOT DISTINCT FROM
+                  (old_rows.name, old_rows.last_check_id,
+                   old_rows.last_check_status_code, old_rows.last_check_at)
+              AND (new_rows.next_check_at, new_rows.check_interval)
+                IS DISTINCT FROM
+                  (old_rows.next_check_at, old_rows.check_interval)
+        )
+    INTO listed, details
+    FROM new_rows
+    JOIN old_rows ON old_rows.id = new_rows.id;
+    IF listed IS NOT NULL THEN
+        IF length(listed) > 7000 THEN
+            listed := '*';
+        END IF;
+        PERFORM pg_notify('url_changes', listed);
+    END IF;
+    IF details IS NOT NULL THEN
+        IF length(details) > 7000 THEN
+            details := '*';
+        END IF;
+        PERFORM pg_notify('url_changes', 'details:' || details);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS urls_update_notify ON urls;
+CREATE TRIGGER urls_update_notify
+    AFTER UPDATE ON urls
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_url_updates();
@@ -0,0 +1,54 @@
+-- Версия списка URL распределена по строкам (шардам): транзакция
+-- увеличивает счётчик шарда txid % 64, а версия - сумма счётчиков.
+-- Параллельные записи не ждут блокировки одной общей строки до фиксации,
+-- а сумма по-прежнему меняется вместе с изменёнными данными
+ALTER TABLE data_versions
+    ADD COLUMN IF NOT EXISTS shard smallint NOT NULL DEFAULT 0;
+ALTER TABLE data_versions DROP CONSTRAINT IF EXISTS data_versions_pkey;
+ALTER TABLE data_versions ADD PRIMARY KEY (name, shard);
+
+INSERT INTO data_versions (name, shard)
+SELECT 'urls', shard FROM generate_series(0, 63) AS shard
+ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_urls_version() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM changed_rows) THEN
+        UPDATE data_versions
+        SET version = version + 1, updated_at = now()
+        WHERE name = 'urls' AND shard = txid_current() % 64;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Список URL показывает имя и сводку о последней проверке. Проверка,
+-- не ставшая последней, список не меняет, поэтому версия меняется при
+-- обновлении сводки, а не при добавлении проверок
+CREATE OR REPLACE FUNCTION bump_urls_version_on_update() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM new_rows
+        JOIN old_rows ON old_rows.id = new_rows.id
+        WHERE (new_rows.name, new_rows.last_check_id,
+               new_rows.last_check_status_code, new_rows.last_check_at)
+            IS DISTINCT FROM
+              (old_rows.name, old_rows.last_check_id,
+               old_rows.last_check_status_code, old_rows.last_check_at)
+    ) THEN
+        UPDATE data_versions
+        SET version = version + 1, updated_at = now()
+        WHERE name = 'urls' AND shard = txid_current() % 64;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS url_checks_insert_version ON url_checks;
+
+DROP TRIGGER IF EXISTS urls_update_version ON urls;
+CREATE TRIGGER urls_update_version
+    AFTER UPDATE ON urls
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_urls_version_on_update();
@@ -0,0 +1,262 @@
+"""Кэш результатов разбора страниц по хэшу тела."""
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Оценка накладных расходов на одну запись в памяти, байты
+ENTRY_OVERHEAD = 200
+# Доля max_disk_bytes, до которой очищается каталог при превышении,
+# чтобы очистка не запускалась при каждой следующей записи
+DISK_LOW_WATERMARK = 0.9
+
+
+class ParseCache:
+    """Ограниченный по объёму LRU-кэш результатов разбора.
+
+    Ключ - хэш тела страницы и её кодировка, поэтому одинаковые страницы
+    (припаркованные домены, страницы ошибок, заглушки CDN) разбираются
+    один раз. Объём считается по размеру сохранённых полей; при
+    превышении ``max_bytes`` вытесняются давно не использованные записи.
+    Если задан ``directory``, записи дополнительно сохраняются на диск
+    и доступны другим процессам. Объём каталога ограничен
+    ``max_disk_bytes``: при превышении удаляются файлы с самым старым
+    временем использования. Объём оценивается по записям своего процесса
+    и уточняется сканированием каталога при каждой очистке.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 0,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 0
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            max_bytes: Максимальный объём записей в памяти, байты.
+                    0 отключает кэш.
+            directory: Каталог общего дискового уровня кэша или None.
+            max_disk_bytes: Максимальный объём каталога, байты.
+                    0 - без ограничения.
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        # Оценка объёма каталога; None - каталог ещё не сканировался
+        self._disk_bytes: Optional[int] = None
+        self._entries: 'OrderedDict[str, Dict[str, str]]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._counters = {
+            'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0,
+            'disk_evictions': 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Включён ли кэш."""
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(body_hash: str, encoding: str) -> str:
+        """Построение ключа кэша.
+
+        Args:
+            body_hash: Хэш тела страницы.
+            encoding: Кодировка, в которой разбиралась страница.
+
+        Returns:
+            str: Ключ записи.
+        """
+        return f'{body_hash}-{encoding}'
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Получение результата разбора.
+
+        Args:
+            key: Ключ записи (см. ``make_key``).
+
+        Returns:
+            dict или None: Копия сохранённого результата или None.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return dict(data)
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters['disk_hits'] += 1
+            self._store(key, data)
+        return dict(data)
+
+    def put(self, key: str, data: Dict[str, str]) -> None:
+        """Сохранение результата разбора.
+
+        Args:
+            key: Ключ записи (см. ``make_key``).
+            data: Результат разбора (h1, title, description).
+        """
+        if not self.enabled:
+            return
+        data = {field: data[field] for field in ('h1', 'title', 'description')}
+        with self._lock:
+            self._store(key, data)
+        self._write_disk(key, data)
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика кэша.
+
+        Returns:
+            dict: Счётчики hits, disk_hits, misses, evictions,
+                  disk_evictions, а также
+                  entries - количество записей и bytes - их объём в памяти.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        return stats
+
+    def clear(self) -> None:
+        """Очистка кэша в памяти и сброс счётчиков."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def _store(self, key: str, data: Dict[str, str]) -> None:
+        size = ENTRY_OVERHEAD + len(key) + sum(
+            len(value.encode('utf-8')) for value in data.values()
+        )
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._sizes[key]
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        self._sizes[key] = size
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            evicted, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(evicted)
+            self._counters['evictions'] += 1
+
+    def _disk_path(self, key: str) -> str:
+        # Подкаталоги по первым символам хэша, чтобы не держать все
+        # записи в одном каталоге
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, str]]:
+        if not self.directory:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+            # Время изменения файла - время последнего использования,
+            # по нему очистка выбирает удаляемые записи
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f'Не удалось прочитать запись кэша {key}: {e}')
+            return None
+
+    def _write_disk(self, key: str, data: Dict[str, str]) -> None:
+        if not self.directory:
+            return
+        path = self._disk_path(key)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Запись через временный файл: другие процессы не увидят
+            # частично записанную запись
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), suffix='.tmp'
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f'Не удалось сохранить запись кэша {key}: {e}')
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+            return
+        self._account_disk(size)
+
+    def _account_disk(self, size: int) -> None:
+        if self.max_disk_bytes <= 0:
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += size
+                if self._disk_bytes <= self.max_disk_bytes:
+                    return
+        # Очистку выполняет один поток; остальные продолжают работу
+        if not self._disk_lock.acquire(blocking=False):
+            return
+        try:
+            self._evict_disk()
+        finally:
+            self._disk_lock.release()
+
+    def _evict_disk(self) -> None:
+        files: List[Tuple[float, int, str]] = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        if total > self.max_disk_bytes:
+            limit = self.max_disk_bytes * DISK_LOW_WATERMARK
+            removed = 0
+            for _, size, path in sorted(files):
+                if total <= limit:
+                    break
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+                    removed += 1
+                total -= size
+            logger.info(
+                f'Из каталога кэша разбора удалено записей: {removed}'
+            )
+            with self._lock:
+                self._counters['disk_evictions'] += removed
+        with self._lock:
+            self._disk_bytes = total
+
+
+parse_cache = ParseCache(
+    max_bytes=config.PARSE_CACHE_SIZE,
+    directory=config.PARSE_CACHE_DIR,
+    max_disk_bytes=config.PARSE_CACHE_DIR_SIZE
+)
@@ -0,0 +1,151 @@
+"""Пул процессов для разбора загруженных страниц."""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+from .config import config
+from .parser import parse
+
+logger = logging.getLogger(__name__)
+
+
+def parse_document(body: bytes, encoding: str) -> Dict[str, str]:
+    """Декодирование и разбор страницы.
+
+    Выполняется в процессе пула, поэтому принимает тело в байтах:
+    их передача между процессами дешевле, чем передача строки.
+
+    Args:
+        body: Тело ответа.
+        encoding: Кодировка страницы.
+
+    Returns:
+        dict: Словарь с данными (h1, title, description).
+    """
+    return parse(body.decode(encoding, errors='replace'))
+
+
+class ParsePool:
+    """Пул процессов, в котором выполняется разбор страниц.
+
+    Разбор HTML нагружает процессор и удерживает GIL, поэтому при
+    параллельных проверках он выполняется в отдельных процессах, а потоки
+    проверок только загружают страницы. При ``workers=0`` пул отключён
+    и страницы разбираются в вызывающем потоке.
+    """
+
+    def __init__(self, workers: int = 0, timeout: float = 30.0) -> None:
+        """
+        Инициализация пула.
+
+        Args:
+            workers: Количество процессов разбора. 0 отключает пул.
+            timeout: Максимальное время разбора одной страницы, секунды.
+        """
+        self.workers = workers
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid = os.getpid()
+
+    @property
+    def enabled(self) -> bool:
+        """Включён ли разбор в отдельных процессах."""
+        return self.workers > 0
+
+    def configure(self, workers: int) -> None:
+        """Изменение количества процессов разбора.
+
+        Запущенные процессы завершаются, новые создаются при следующем
+        обращении.
+
+        Args:
+            workers: Количество процессов разбора. 0 отключает пул.
+        """
+        self.shutdown()
+        self.workers = workers
+
+    def submit(self, body: bytes, encoding: str) -> Future:
+        """Постановка страницы в очередь разбора.
+
+        Args:
+            body: Тело ответа.
+            encoding: Кодировка страницы.
+
+        Returns:
+            Future: Результат ``parse_document``.
+        """
+        return self._get_executor().submit(parse_document, body, encoding)
+
+    def parse(self, body: bytes, encoding: str) -> Dict[str, str]:
+        """Разбор страницы в пуле процессов с ожиданием результата.
+
+        Если пул отключён, страница разбирается в текущем потоке.
+
+        Args:
+            body: Тело ответа.
+            encoding: Кодировка страницы.
+
+        Returns:
+            dict: Словарь с данными (h1, title, description).
+
+        Raises:
+            concurrent.futures.TimeoutError: Если разбор не завершился
+                за ``timeout`` секунд. До Python 3.11 это не встроенный
+                TimeoutError.
+            BrokenProcessPool: Если процесс разбора аварийно завершился.
+        """
+        if not self.enabled:
+            return parse_document(body, encoding)
+        future = self.submit(body, encoding)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Страница, ещё не взятая в работу, не должна занимать процесс
+            future.cancel()
+            raise
+        except BrokenProcessPool:
+            # Пул с упавшим процессом непригоден, следующий вызов
+            # создаст новый
+            logger.error('Процесс разбора страниц аварийно завершился')
+            self.shutdown()
+            raise
+
+    def shutdown(self) -> None:
+        """Завершение процессов разбора."""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Процессы пула принадлежат родительскому процессу
+                self._executor = None
+                self._pid = os.getpid()
+            if self._executor is None:
+                # spawn, а не fork: процесс проверок многопоточный, и
+                # копирование его состояния в дочерний процесс небезопасно
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                logger.info(
+                    f'Запущен пул разбора страниц: {self.workers} процессов'
+                )
+            return self._executor
+
+
+parse_pool = ParsePool(
+    workers=config.PARSE_WORKERS,
+    timeout=config.PARSE_TIMEOUT
+)
+atexit.register(parse_pool.shutdown)
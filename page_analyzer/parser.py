@@ -1,39 +1,279 @@
+"""Извлечение SEO-данных (h1, title, description) из HTML.
+
+Разбор выполняется одной из зарегистрированных реализаций (backend),
+которая выбирается настройкой PARSER_BACKEND. Все реализации возвращают
+одинаковый результат; быстрые реализации на lxml и selectolax доступны,
+только если соответствующие библиотеки установлены.
+"""
+
+import logging
+import time
+from html.parser import HTMLParser
 from bs4 import BeautifulSoup
-from typing import Dict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .config import config
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml необязателен
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:  # pragma: no cover - selectolax необязателен
+    SelectolaxParser = None
+
+logger = logging.getLogger(__name__)
 
 # Максимальная длина полей в базе данных
 MAX_FIELD_LENGTH = 255
+# Теги, текст которых не входит в извлекаемые поля
+SKIPPED_TAGS = ('script', 'style')
+
+# Реализация без внешних зависимостей, доступная всегда
+DEFAULT_BACKEND = 'html.parser'
+# Порядок выбора реализации при PARSER_BACKEND=auto: от быстрой к медленной
+AUTO_BACKEND_ORDER = ('selectolax', 'lxml', DEFAULT_BACKEND)
+
+ParseFunction = Callable[[str], Dict[str, str]]
+
+# Установленные реализации разбора: имя -> функция
+BACKENDS: Dict[str, ParseFunction] = {}
+
+
+def register_backend(name: str) -> Callable[[ParseFunction], ParseFunction]:
+    """Регистрация реализации разбора под указанным именем.
+
+    Args:
+        name: Имя реализации для настройки PARSER_BACKEND.
+
+    Returns:
+        Callable: Декоратор, регистрирующий функцию разбора.
+    """
+    def decorator(func: ParseFunction) -> ParseFunction:
+        BACKENDS[name] = func
+        return func
+    return decorator
+
+
+def get_backend(name: Optional[str] = None) -> Tuple[str, ParseFunction]:
+    """Выбор реализации разбора.
+
+    Args:
+        name: Имя реализации или ``auto``. По умолчанию берётся
+              из настройки PARSER_BACKEND.
+
+    Returns:
+        tuple: Имя выбранной реализации и функция разбора. Если
+               запрошенная библиотека не установлена, используется
+               реализация html.parser.
+
+    Raises:
+        ValueError: Если имя реализации неизвестно.
+    """
+    name = (name or config.PARSER_BACKEND).lower()
+    if name == 'auto':
+        name = next(
+            backend for backend in AUTO_BACKEND_ORDER if backend in BACKENDS
+        )
+    elif name not in AUTO_BACKEND_ORDER:
+        raise ValueError(f'Неизвестная реализация парсера: {name}')
+    elif name not in BACKENDS:
+        logger.warning(
+            f'Реализация парсера {name} недоступна, '
+            f'используется {DEFAULT_BACKEND}'
+        )
+        name = DEFAULT_BACKEND
+    return name, BACKENDS[name]
 
 
-def parse(request: str) -> Dict[str, str]:
+def parse(request: str, backend: Optional[str] = None) -> Dict[str, str]:
     """Парсинг HTML для извлечения SEO-данных.
 
     Args:
         request: HTML-контент страницы.
+        backend: Имя реализации разбора. По умолчанию берётся
+                 из настройки PARSER_BACKEND.
 
     Returns:
         dict: Словарь с данными (h1, title, description).
               Все поля обрезаются до MAX_FIELD_LENGTH символов.
     """
-    soup = BeautifulSoup(request, 'html.parser')
-    data = {}
+    return get_backend(backend)[1](request)
 
-    h1 = soup.find('h1')
-    data['h1'] = (
-        h1.get_text().strip()[:MAX_FIELD_LENGTH] if h1 else ''
-    )
 
+def benchmark_backends(
+    documents: List[str],
+    backends: Optional[Iterable[str]] = None,
+    repeat: int = 1
+) -> Dict[str, float]:
+    """Измерение скорости реализаций разбора.
+
+    Args:
+        documents: HTML-документы для разбора.
+        backends: Имена реализаций. По умолчанию все установленные.
+        repeat: Сколько раз разобрать каждый документ.
+
+    Returns:
+        dict: Количество разобранных страниц в секунду по имени реализации.
+    """
+    results = {}
+    for name in backends or BACKENDS:
+        func = BACKENDS[name]
+        started_at = time.perf_counter()
+        for _ in range(repeat):
+            for document in documents:
+                func(document)
+        elapsed = time.perf_counter() - started_at
+        pages = len(documents) * repeat
+        results[name] = pages / elapsed if elapsed else 0.0
+    return results
+
+
+def _field(text: Optional[str]) -> str:
+    return (text or '').strip()[:MAX_FIELD_LENGTH]
+
+
+@register_backend('html.parser')
+def _parse_html_parser(request: str) -> Dict[str, str]:
+    soup = BeautifulSoup(request, 'html.parser')
+    h1 = soup.find('h1')
     title = soup.find('title')
-    data['title'] = (
-        title.get_text().strip()[:MAX_FIELD_LENGTH] if title else ''
+    description = soup.find('meta', attrs={'name': 'description'})
+    return {
+        'h1': _field(h1.get_text()) if h1 else '',
+        'title': _field(title.get_text()) if title else '',
+        'description': (
+            _field(description.get('content', '')) if description else ''
+        ),
+    }
+
+
+if etree is not None:
+    @register_backend('lxml')
+    def _parse_lxml(request: str) -> Dict[str, str]:
+        # Документ передаётся в байтах, чтобы lxml не отвергал строки
+        # с объявлением кодировки
+        root = etree.fromstring(
+            request.encode('utf-8', errors='replace'),
+            etree.HTMLParser(encoding='utf-8')
+        )
+        if root is None:
+            return {'h1': '', 'title': '', 'description': ''}
+        h1 = root.find('.//h1')
+        title = root.find('.//title')
+        description = root.find('.//meta[@name="description"]')
+        return {
+            'h1': _field(_lxml_text(h1)) if h1 is not None else '',
+            'title': _field(_lxml_text(title)) if title is not None else '',
+            'description': (
+                _field(description.get('content'))
+                if description is not None else ''
+            ),
+        }
+
+    # Как и BeautifulSoup, не учитываем комментарии и код скриптов
+    _lxml_text_nodes = etree.XPath(
+        './/text()[not(ancestor::script) and not(ancestor::style)]'
     )
 
-    description = soup.find('meta', attrs={"name": "description"})
-    if description is None:
-        data['description'] = ''
-    else:
-        data['description'] = (
-            description.get('content', '').strip()[:MAX_FIELD_LENGTH]
+    def _lxml_text(element) -> str:
+        return ''.join(_lxml_text_nodes(element))
+
+
+if SelectolaxParser is not None:
+    @register_backend('selectolax')
+    def _parse_selectolax(request: str) -> Dict[str, str]:
+        tree = SelectolaxParser(request)
+        # Как и BeautifulSoup, не учитываем код скриптов и стилей
+        tree.strip_tags(['script', 'style'])
+        h1 = tree.css_first('h1')
+        title = tree.css_first('title')
+        description = tree.css_first('meta[name="description"]')
+        return {
+            'h1': _field(h1.text(deep=True)) if h1 is not None else '',
+            'title': _field(title.text(deep=True)) if title is not None else '',
+            'description': (
+                _field(description.attributes.get('content'))
+                if description is not None else ''
+            ),
+        }
+
+
+class StreamingExtractor(HTMLParser):
+    """Потоковое извлечение SEO-данных из HTML.
+
+    Документ подаётся порциями через ``feed``. Извлекаются те же поля, что
+    и в ``parse``: первый h1, первый title и первый meta description.
+    Как и в ``parse``, код скриптов и стилей в текст не попадает.
+    Как только все три поля найдены, свойство ``done`` становится
+    истинным и оставшуюся часть документа можно не читать.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация парсера."""
+        super().__init__(convert_charrefs=True)
+        self._h1: Optional[List[str]] = None
+        self._h1_depth = 0
+        self._h1_done = False
+        self._title: Optional[List[str]] = None
+        self._title_done = False
+        self._description: Optional[str] = None
+        # Глубина вложенности script и style, их текст не учитывается
+        self._skip_depth = 0
+
+    @property
+    def done(self) -> bool:
+        """Найдены ли все извлекаемые поля."""
+        return (
+            self._h1_done
+            and self._title_done
+            and self._description is not None
         )
 
-    return data
+    def handle_starttag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == 'h1' and not self._h1_done:
+            if self._h1 is None:
+                self._h1 = []
+            self._h1_depth += 1
+        elif tag == 'title' and self._title is None:
+            self._title = []
+        elif tag == 'meta' and self._description is None:
+            attributes = dict(attrs)
+            if attributes.get('name') == 'description':
+                self._description = attributes.get('content') or ''
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIPPED_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag == 'h1' and self._h1_depth:
+            self._h1_depth -= 1
+            self._h1_done = not self._h1_depth
+        elif tag == 'title' and self._title is not None:
+            self._title_done = True
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        if self._h1_depth:
+            self._h1.append(data)
+        if self._title is not None and not self._title_done:
+            self._title.append(data)
+
+    def result(self) -> Dict[str, str]:
+        """Получение извлечённых данных.
+
+        Returns:
+            dict: Словарь с данными (h1, title, description) в том же
+                  виде, что возвращает ``parse``.
+        """
+        return {
+            'h1': _field(''.join(self._h1 or [])),
+            'title': _field(''.join(self._title or [])),
+            'description': _field(self._description),
+        }
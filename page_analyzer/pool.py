@@ -0,0 +1,256 @@
+"""Пул подключений к PostgreSQL, общий для всего процесса."""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+from psycopg2 import connect, Error as DBError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.pool import PoolError
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(PoolError):
+    """Не удалось получить подключение из пула за отведённое время."""
+
+
+class ConnectionPool:
+    """Потокобезопасный пул подключений к базе данных.
+
+    Пул держит не менее ``min_size`` и не более ``max_size`` подключений.
+    Если свободных подключений нет и лимит исчерпан, ``getconn`` ждёт
+    освобождения не дольше ``timeout`` секунд. Перед выдачей простаивавшее
+    подключение проверяется запросом ``SELECT 1``. После ``fork()`` пул
+    в дочернем процессе сбрасывается и открывает собственные подключения.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        health_check_interval: float = 30.0
+    ) -> None:
+        """
+        Инициализация пула.
+
+        Args:
+            dsn: Строка подключения к базе данных.
+            min_size: Минимальное количество открытых подключений.
+            max_size: Максимальное количество подключений.
+            timeout: Время ожидания свободного подключения в секундах.
+            health_check_interval: Время простоя в секундах, после которого
+                    подключение проверяется перед выдачей. 0 - проверять
+                    при каждой выдаче.
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(
+                f'Некорректные размеры пула: min={min_size}, max={max_size}'
+            )
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._lock = threading.Condition()
+        # Свободные подключения и время их возврата в пул
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._used: set = set()
+        self._pid = os.getpid()
+        self._closed = False
+        # Подключения родительского процесса: закрывать их в дочернем
+        # нельзя, иначе закроется общий с родителем сокет
+        self._orphaned: List[Any] = []
+
+    @property
+    def size(self) -> int:
+        """Общее количество подключений, открытых пулом."""
+        return len(self._idle) + len(self._used)
+
+    def getconn(self) -> Any:
+        """Получение подключения из пула.
+
+        Returns:
+            connection: Проверенное подключение psycopg2.
+
+        Raises:
+            PoolTimeout: Если свободное подключение не появилось вовремя.
+            PoolError: Если пул закрыт.
+            DBError: При ошибке открытия нового подключения.
+        """
+        self._check_pid()
+        deadline = time.monotonic() + self.timeout
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise PoolError('Пул подключений закрыт')
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    if self._is_healthy(conn, released_at):
+                        self._used.add(conn)
+                        return conn
+                    self._discard(conn)
+                    continue
+                if self.size < self.max_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f'Нет свободных подключений в пуле '
+                        f'(max={self.max_size}) за {self.timeout} с'
+                    )
+                self._lock.wait(remaining)
+            # Резервируем место, чтобы подключаться вне блокировки
+            placeholder = object()
+            self._used.add(placeholder)
+        try:
+            conn = connect(self.dsn)
+        except BaseException:
+            with self._lock:
+                self._used.discard(placeholder)
+                self._lock.notify()
+            raise
+        with self._lock:
+            self._used.discard(placeholder)
+            self._used.add(conn)
+        return conn
+
+    def putconn(self, conn: Any, close: bool = False) -> None:
+        """Возврат подключения в пул.
+
+        Args:
+            conn: Подключение, полученное через ``getconn``.
+            close: Закрыть подключение вместо возврата в пул.
+        """
+        with self._lock:
+            if conn not in self._used:
+                # Подключение из другого процесса или уже возвращённое
+                return
+            self._used.discard(conn)
+            reusable = (
+                not close
+                and not self._closed
+                and not conn.closed
+                and conn.get_transaction_status() == TRANSACTION_STATUS_IDLE
+            )
+            if reusable:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._discard(conn)
+            self._lock.notify()
+
+    def prefill(self) -> None:
+        """Открытие подключений до минимального размера пула."""
+        conns = []
+        try:
+            while self.size < self.min_size:
+                conns.append(self.getconn())
+        finally:
+            for conn in conns:
+                self.putconn(conn)
+
+    def closeall(self) -> None:
+        """Закрытие всех подключений пула."""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._lock.notify_all()
+
+    def reset_after_fork(self) -> None:
+        """Сброс состояния пула в дочернем процессе после ``fork()``."""
+        self._lock = threading.Condition()
+        self._orphaned.extend(conn for conn, _ in self._idle)
+        self._orphaned.extend(
+            conn for conn in self._used if hasattr(conn, 'closed')
+        )
+        self._idle.clear()
+        self._used = set()
+        self._pid = os.getpid()
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            logger.info('Пул подключений сброшен после fork()')
+            self.reset_after_fork()
+
+    def _is_healthy(self, conn: Any, released_at: float) -> bool:
+        if conn.closed:
+            return False
+        idle_time = time.monotonic() - released_at
+        if idle_time < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            conn.rollback()
+            return True
+        except DBError as e:
+            logger.warning(
+                f'Подключение из пула не прошло проверку: {str(e)}'
+            )
+            return False
+
+    def _discard(self, conn: Any) -> None:
+        try:
+            conn.close()
+        except DBError as e:
+            logger.error(f'Ошибка при закрытии подключения: {str(e)}')
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Получение пула подключений процесса (создаётся при первом вызове).
+
+    Returns:
+        ConnectionPool: Пул подключений, настроенный из конфигурации.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool(
+                    config.get_database_url(),
+                    min_size=config.DB_POOL_MIN_SIZE,
+                    max_size=config.DB_POOL_MAX_SIZE,
+                    timeout=config.DB_POOL_TIMEOUT,
+                    health_check_interval=(
+                        config.DB_POOL_HEALTH_CHECK_INTERVAL
+                    )
+                )
+                try:
+                    pool.prefill()
+                except DBError as e:
+                    logger.warning(
+                        f'Не удалось заполнить пул подключений: {str(e)}'
+                    )
+                _pool = pool
+    return _pool
+
+
+def close_pool() -> None:
+    """Закрытие пула подключений процесса."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def _reset_pool_in_child() -> None:
+    global _pool_lock
+    _pool_lock = threading.Lock()
+    if _pool is not None:
+        _pool.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pool_in_child)
@@ -0,0 +1,327 @@
+"""Кэш отрисованных фрагментов страниц с инвалидацией по записи."""
+
+import abc
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Метка фрагментов списка URL
+URLS_TAG = 'urls'
+# Оценка накладных расходов на одну запись в памяти, байты
+ENTRY_OVERHEAD = 200
+
+
+def url_tag(url_id: int) -> str:
+    """Метка фрагментов страницы URL.
+
+    Args:
+        url_id: ID URL.
+
+    Returns:
+        str: Метка.
+    """
+    return f'url:{url_id}'
+
+
+class CacheBackend(abc.ABC):
+    """Общее для процессов хранилище фрагментов и версий меток.
+
+    Реализация должна быть доступна всем воркерам, чьи кэши нужно
+    согласовать (например, Redis или общий каталог).
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Получение значения или None, если его нет или оно истекло."""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        """Сохранение значения на ttl секунд (None - без срока)."""
+
+
+class MemoryBackend(CacheBackend):
+    """Хранилище в памяти процесса.
+
+    Заменяет общее хранилище в тестах и при запуске с одним воркером.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[Optional[float], str]] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._values[key] = (expires_at, value)
+
+
+class FileBackend(CacheBackend):
+    """Хранилище в каталоге, общем для воркеров одного узла."""
+
+    def __init__(self, directory: str) -> None:
+        """
+        Инициализация хранилища.
+
+        Args:
+            directory: Каталог для файлов кэша.
+        """
+        self.directory = directory
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding='utf-8') as file:
+                item = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f'Не удалось прочитать запись кэша {key}: {e}')
+            return None
+        expires_at = item.get('expires_at')
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return item.get('value')
+
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        path = self._path(key)
+        item = {
+            'expires_at': None if ttl is None else time.time() + ttl,
+            'value': value,
+        }
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Запись через временный файл: другие процессы не увидят
+            # частично записанную запись
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), suffix='.tmp'
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(item, file, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f'Не удалось сохранить запись кэша {key}: {e}')
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], f'{digest}.json')
+
+
+class RenderCache:
+    """Кэш отрисованных фрагментов с LRU по объёму и сроком хранения.
+
+    Каждый фрагмент помечается метками данных, из которых он построен.
+    Версия метки входит в ключ фрагмента, поэтому ``invalidate`` меняет
+    версию, и старые фрагменты больше не находятся, а со временем
+    вытесняются. Если задано общее хранилище, версии меток и фрагменты
+    хранятся в нём, и инвалидация в одном воркере видна остальным.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 0,
+        ttl: float = 30.0,
+        backend: Optional[CacheBackend] = None
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            max_bytes: Максимальный объём фрагментов в памяти процесса,
+                    байты. 0 отключает кэш.
+            ttl: Время хранения фрагмента, секунды.
+            backend: Общее хранилище или None, если кэш локален для
+                    процесса.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.backend = backend
+        self._lock = threading.Lock()
+        # Ключ -> (время истечения, фрагмент)
+        self._entries: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._tokens: Dict[str, str] = {}
+        # Версия всего кэша, меняется при invalidate_all
+        self._generation = '0'
+        self._counters = {
+            'hits': 0, 'shared_hits': 0, 'misses': 0,
+            'evictions': 0, 'invalidations': 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Включён ли кэш."""
+        return self.max_bytes > 0
+
+    def get_or_render(
+        self,
+        key: str,
+        tags: Sequence[str],
+        render: Callable[[], Optional[str]]
+    ) -> Optional[str]:
+        """Получение фрагмента из кэша или его отрисовка.
+
+        Args:
+            key: Ключ фрагмента (например, путь и параметры запроса).
+            tags: Метки данных фрагмента (см. ``URLS_TAG``, ``url_tag``).
+            render: Функция отрисовки. Если она вернула None (например,
+                    данных нет), результат не кэшируется.
+
+        Returns:
+            str или None: Фрагмент.
+        """
+        if not self.enabled:
+            return render()
+        full_key = self._full_key(key, tags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(full_key)
+                self._counters['hits'] += 1
+                return entry[1]
+        if self.backend is not None:
+            value = self.backend.get(full_key)
+            if value is not None:
+                with self._lock:
+                    self._counters['shared_hits'] += 1
+                    self._store(full_key, value, now)
+                return value
+
+        value = render()
+        with self._lock:
+            self._counters['misses'] += 1
+            if value is not None:
+                self._store(full_key, value, now)
+        if value is not None and self.backend is not None:
+            self.backend.set(full_key, value, self.ttl)
+        return value
+
+    def invalidate(self, *tags: str) -> None:
+        """Инвалидация фрагментов с указанными метками.
+
+        Args:
+            *tags: Метки изменившихся данных.
+        """
+        if not self.enabled:
+            return
+        for tag in tags:
+            token = uuid.uuid4().hex[:16]
+            with self._lock:
+                self._tokens[tag] = token
+                self._counters['invalidations'] += 1
+            if self.backend is not None:
+                self.backend.set(f'tag:{tag}', token, None)
+
+    def invalidate_urls(self, url_ids: Iterable[int] = ()) -> None:
+        """Инвалидация списка URL и страниц указанных URL.
+
+        Args:
+            url_ids: ID URL, данные которых изменились.
+        """
+        self.invalidate(URLS_TAG, *(url_tag(url_id) for url_id in url_ids))
+
+    def invalidate_all(self) -> None:
+        """Инвалидация всех фрагментов процесса.
+
+        Используется, когда неизвестно, какие данные изменились
+        (например, после потери подключения к источнику уведомлений).
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._generation = uuid.uuid4().hex[:16]
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self._counters['invalidations'] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика кэша.
+
+        Returns:
+            dict: Счётчики hits, shared_hits (из общего хранилища),
+                  misses, evictions, invalidations, а также entries и
+                  bytes - количество и объём фрагментов в памяти.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        return stats
+
+    def clear(self) -> None:
+        """Очистка фрагментов в памяти, версий меток и счётчиков."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self._tokens.clear()
+            self._generation = '0'
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def _full_key(self, key: str, tags: Sequence[str]) -> str:
+        with self._lock:
+            versions = [self._generation]
+        for tag in tags:
+            token = None
+            if self.backend is not None:
+                token = self.backend.get(f'tag:{tag}')
+            if token is None:
+                with self._lock:
+                    token = self._tokens.get(tag, '0')
+            versions.append(f'{tag}={token}')
+        return f'{key}|{"|".join(versions)}'
+
+    def _store(self, key: str, value: str, now: float) -> None:
+        size = ENTRY_OVERHEAD + len(key) + len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._sizes[key]
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        self._sizes[key] = size
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            evicted, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(evicted)
+            self._counters['evictions'] += 1
+
+
+def _create_backend() -> Optional[CacheBackend]:
+    if config.RENDER_CACHE_DIR:
+        return FileBackend(config.RENDER_CACHE_DIR)
+    return None
+
+
+render_cache = RenderCache(
+    max_bytes=config.RENDER_CACHE_SIZE,
+    ttl=config.RENDER_CACHE_TTL,
+    backend=_create_backend()
+)
@@ -0,0 +1,137 @@
+"""Планировщик повторных проверок URL по расписанию."""
+
+import logging
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Optional, Set
+from .check_writer import CheckWriter
+from .config import config
+from .db import claim_due_urls
+from .services import CheckService
+
+logger = logging.getLogger(__name__)
+
+
+class CheckScheduler:
+    """Планировщик, проверяющий URL, у которых подошёл срок проверки.
+
+    Срок хранится в ``urls.next_check_at`` и сдвигается на интервал URL
+    в момент захвата. Несколько планировщиков (в том числе на разных
+    узлах) могут работать одновременно: URL захватываются через
+    ``SKIP LOCKED``. При ``CHECKS_ASYNC`` проверки ставятся в очередь
+    воркеров, иначе выполняются самим планировщиком.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        jitter: Optional[float] = None
+    ) -> None:
+        """
+        Инициализация планировщика.
+
+        Args:
+            concurrency: Количество одновременно выполняемых проверок.
+            batch_size: Количество URL, захватываемых за один опрос.
+            poll_interval: Пауза между опросами, если проверять нечего,
+                    секунды.
+            jitter: Случайное отклонение следующей проверки, доля
+                    интервала.
+        """
+        self.concurrency = concurrency or config.SCHEDULER_CONCURRENCY
+        self.batch_size = batch_size or config.SCHEDULER_BATCH_SIZE
+        self.poll_interval = (
+            poll_interval if poll_interval is not None
+            else config.SCHEDULER_POLL_INTERVAL
+        )
+        self.jitter = jitter if jitter is not None else config.SCHEDULER_JITTER
+        self.stop_event = threading.Event()
+        # Буфер записи проверок, создаётся на время run_forever
+        self.writer: Optional[CheckWriter] = None
+
+    def run_once(self) -> int:
+        """Захват и проверка одной порции URL в текущем потоке.
+
+        Returns:
+            int: Количество захваченных URL.
+        """
+        urls = claim_due_urls(self.batch_size, self.jitter)
+        for url in urls:
+            self._dispatch(url)
+        return len(urls)
+
+    def run_forever(self) -> None:
+        """Проверка URL по расписанию до вызова ``stop``.
+
+        URL захватываются по мере освобождения мест в пуле, не больше
+        ``batch_size`` за раз: срок следующей проверки сдвигается при
+        захвате, поэтому URL не захватываются впрок.
+        """
+        logger.info(
+            f'Планировщик проверок запущен (параллельно {self.concurrency})'
+        )
+        self.writer = CheckWriter(
+            batch_size=config.CHECK_WRITER_BATCH_SIZE,
+            max_latency=config.CHECK_WRITER_MAX_LATENCY,
+            max_pending=config.CHECK_WRITER_MAX_PENDING
+        )
+        in_flight: Set[Future] = set()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix='check-scheduler'
+            ) as executor:
+                while not self.stop_event.is_set():
+                    free_slots = self.concurrency - len(in_flight)
+                    if free_slots:
+                        try:
+                            urls = claim_due_urls(
+                                min(free_slots, self.batch_size),
+                                self.jitter
+                            )
+                        except Exception as e:
+                            logger.error(
+                                f'Ошибка при выборе URL для проверки: '
+                                f'{str(e)}'
+                            )
+                            urls = []
+                        in_flight.update(
+                            executor.submit(self._dispatch, url)
+                            for url in urls
+                        )
+                    if not in_flight:
+                        self.stop_event.wait(self.poll_interval)
+                        continue
+                    # Следующий захват - после завершения любой проверки
+                    # или через poll_interval, если проверять было нечего
+                    _, in_flight = wait(
+                        in_flight,
+                        timeout=self.poll_interval,
+                        return_when=FIRST_COMPLETED
+                    )
+        finally:
+            self.writer.close()
+            self.writer = None
+        logger.info('Планировщик проверок остановлен')
+
+    def stop(self) -> None:
+        """Остановка планировщика после завершения текущих проверок."""
+        self.stop_event.set()
+
+    def _dispatch(self, url: Any) -> None:
+        try:
+            if config.CHECKS_ASYNC:
+                CheckService.enqueue_check(url.id)
+            else:
+                CheckService.check_url(url.id, self.writer)
+        except Exception as e:
+            logger.error(
+                f'Ошибка при проверке URL {url.name} по расписанию: {str(e)}'
+            )
@@ -2,5 +2,14 @@
 
 from .url_service import URLService
 from .check_service import CheckService
+from .batch_check_service import BatchCheckService
+from .async_check_service import AsyncCheckService
+from .export_service import ExportService
 
-__all__ = ('URLService', 'CheckService')
+__all__ = (
+    'URLService',
+    'CheckService',
+    'BatchCheckService',
+    'AsyncCheckService',
+    'ExportService',
+)
@@ -0,0 +1,367 @@
+"""Асинхронная пакетная проверка URL на asyncio и httpx."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+from ..check_writer import CheckWriter
+from ..config import config
+from ..host_guard import HostUnavailable, host_guard
+from ..parse_pool import parse_pool
+from .batch_check_service import BatchCheckService, HostSlots
+from .check_service import (
+    READ_CHUNK_SIZE,
+    STREAM_CHUNK_SIZE,
+    BufferedBody,
+    CheckService,
+    ResponseTooLarge,
+    StreamingBody,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx не установлен
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCheckService(BatchCheckService):
+    """Пакетная проверка URL в одном потоке с циклом событий asyncio.
+
+    HTTP-запросы выполняются асинхронным клиентом httpx, поэтому тысячи
+    проверок могут ожидать ответа одновременно без отдельного потока на
+    каждую. Обращения к БД (предыдущая проверка, запись результатов)
+    выполняются в пуле потоков размером с пул подключений к БД.
+    Результаты проверок совпадают с ``CheckService.run_check``.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 500,
+        per_host: int = 2,
+        batch_size: int = 100
+    ) -> None:
+        """
+        Инициализация сервиса.
+
+        Args:
+            concurrency: Максимальное количество одновременных проверок.
+            per_host: Максимальное количество одновременных проверок
+                    одного хоста.
+            batch_size: Количество результатов в одной пакетной вставке.
+
+        Raises:
+            RuntimeError: Если не установлен httpx.
+        """
+        if httpx is None:
+            raise RuntimeError('Для асинхронных проверок установите httpx')
+        super().__init__(
+            concurrency=concurrency,
+            per_host=per_host,
+            batch_size=batch_size
+        )
+
+    def run(self, urls: Iterable[Any]) -> Dict[str, Any]:
+        """Проверка URL и сохранение результатов.
+
+        Args:
+            urls: Записи URL с полями id и name.
+
+        Returns:
+            dict: Статистика выполнения (см. ``_build_stats``).
+        """
+        return asyncio.run(self.run_async(urls))
+
+    async def run_async(self, urls: Iterable[Any]) -> Dict[str, Any]:
+        """Асинхронная проверка URL и сохранение результатов.
+
+        Args:
+            urls: Записи URL с полями id и name.
+
+        Returns:
+            dict: Статистика выполнения (см. ``_build_stats``).
+        """
+        started_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        latencies: List[float] = []
+        counters = {'total': 0, 'succeeded': 0, 'failed': 0, 'saved': 0}
+        db_executor = ThreadPoolExecutor(
+            max_workers=config.DB_POOL_MAX_SIZE,
+            thread_name_prefix='async-check-db'
+        )
+        writer = CheckWriter(
+            batch_size=self.batch_size,
+            max_latency=config.CHECK_WRITER_MAX_LATENCY,
+            max_pending=config.CHECK_WRITER_MAX_PENDING
+        )
+
+        async def collect(task: asyncio.Task) -> None:
+            result, latency = task.result()
+            latencies.append(latency)
+            counters['total'] += 1
+            if result['success']:
+                counters['succeeded'] += 1
+                # put блокируется, пока буфер записи переполнен
+                await loop.run_in_executor(
+                    db_executor, writer.put, result['data']
+                )
+            else:
+                counters['failed'] += 1
+
+        # Лимит хоста применяется до создания задачи, как в
+        # BatchCheckService, чтобы задачи не занимали места concurrency
+        # в ожидании своего хоста
+        slots = HostSlots(self.per_host)
+        # Незавершённые задачи и хосты их URL
+        in_flight: Dict[asyncio.Task, str] = {}
+
+        def start(url: Any, host: str) -> None:
+            task = asyncio.create_task(
+                self._check_async(client, url, db_executor)
+            )
+            in_flight[task] = host
+
+        async def complete() -> None:
+            done, _ = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                host = in_flight.pop(task)
+                await collect(task)
+                url = slots.release(host)
+                if url is not None:
+                    start(url, host)
+
+        try:
+            async with self.create_client(self.concurrency) as client:
+                for url in urls:
+                    while (
+                        len(in_flight) >= self.concurrency
+                        or slots.deferred_count >= self.concurrency * 2
+                    ):
+                        await complete()
+                    host = slots.host(url.name)
+                    if slots.admit(host, url):
+                        start(url, host)
+                while in_flight:
+                    await complete()
+        finally:
+            await loop.run_in_executor(db_executor, writer.close)
+            db_executor.shutdown()
+
+        counters['saved'] = writer.stats()['written']
+        stats = self._build_stats(
+            counters, latencies, time.monotonic() - started_at
+        )
+        logger.info(
+            f'Асинхронная проверка завершена: {stats["total"]} URL, '
+            f'успешно {stats["succeeded"]}, с ошибкой {stats["failed"]}, '
+            f'{stats["throughput"]:.1f} URL/с'
+        )
+        return stats
+
+    @staticmethod
+    def create_client(concurrency: int) -> 'httpx.AsyncClient':
+        """Создание HTTP-клиента с таймаутами и лимитами из конфигурации.
+
+        Args:
+            concurrency: Максимальное количество одновременных соединений.
+
+        Returns:
+            AsyncClient: Клиент httpx.
+        """
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                config.REQUEST_READ_TIMEOUT,
+                connect=config.REQUEST_CONNECT_TIMEOUT,
+                # Ожидание свободного соединения ограничено concurrency,
+                # а не таймаутом
+                pool=None
+            ),
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+                keepalive_expiry=config.HTTP_POOL_IDLE_TIMEOUT
+            ),
+            follow_redirects=True,
+            max_redirects=config.MAX_REDIRECTS
+        )
+
+    @staticmethod
+    async def run_check(
+        client: 'httpx.AsyncClient', url: Any, previous: Any = None
+    ) -> Dict[str, Any]:
+        """Асинхронная загрузка и анализ страницы без сохранения.
+
+        Args:
+            client: HTTP-клиент (см. ``create_client``).
+            url: Запись URL с полями id и name.
+            previous: Предыдущая проверка URL
+                    (см. ``CheckService.get_previous_check``).
+
+        Returns:
+            dict: Результат в формате ``CheckService.run_check``.
+        """
+        try:
+            logger.info(f'Начало проверки URL ID {url.id}: {url.name}')
+            host_wait = host_guard.reserve(url.name)
+            if host_wait:
+                await asyncio.sleep(host_wait)
+            async with _stream(client, url.name, previous) as response:
+                logger.info(
+                    f'HTTP-запрос к {url.name} выполнен: '
+                    f'статус {response.status_code}, '
+                    f'редиректов {len(response.history)}'
+                )
+                if response.is_error:
+                    response.raise_for_status()
+
+                if response.status_code == 304 and previous is not None:
+                    result = CheckService._not_modified_result(
+                        url, previous, response
+                    )
+                    result['metrics']['host_wait'] = host_wait
+                    return result
+
+                content_length = response.headers.get('Content-Length')
+                if content_length and (
+                    int(content_length) > config.MAX_RESPONSE_SIZE
+                ):
+                    return _failure('Размер ответа слишком большой')
+
+                body = await _read_and_parse(response, url.name, previous)
+                if body is None:
+                    return _failure('Размер ответа превышает допустимый лимит')
+
+                result = CheckService._success_result(url, response, body)
+                result['metrics']['host_wait'] = host_wait
+                return result
+
+        except HostUnavailable:
+            logger.warning(
+                f'Проверка {url.name} отклонена: хост не отвечает'
+            )
+            return _failure(
+                'Сервер временно недоступен, повторите проверку позже'
+            )
+        except httpx.TimeoutException:
+            logger.error(f'Таймаут при проверке URL {url.name}')
+            return _failure('Превышено время ожидания ответа от сервера')
+        except (httpx.NetworkError, httpx.RemoteProtocolError) as e:
+            logger.error(f'Ошибка подключения к {url.name}: {str(e)}')
+            return _failure('Не удалось подключиться к серверу')
+        except httpx.TooManyRedirects:
+            logger.error(f'Слишком много редиректов для {url.name}')
+            return _failure('Превышено максимальное количество редиректов')
+        except httpx.HTTPStatusError as e:
+            logger.error(f'HTTP ошибка при проверке {url.name}: {str(e)}')
+            return _failure(f'Ошибка HTTP: {e.response.status_code}')
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            logger.error(f'Ошибка запроса к {url.name}: {str(e)}')
+            return _failure('Произошла ошибка при проверке')
+        except (FutureTimeoutError, BrokenProcessPool) as e:
+            logger.error(f'Ошибка при разборе страницы {url.name}: {e!r}')
+            return _failure('Не удалось разобрать страницу')
+
+    async def _check_async(
+        self,
+        client: 'httpx.AsyncClient',
+        url: Any,
+        db_executor: ThreadPoolExecutor
+    ) -> tuple:
+        started_at = time.monotonic()
+        try:
+            previous = await asyncio.get_running_loop().run_in_executor(
+                db_executor, CheckService.get_previous_check, url.id
+            )
+            result = await self.run_check(client, url, previous)
+        except Exception as e:
+            logger.error(
+                f'Ошибка при асинхронной проверке {url.name}: {str(e)}'
+            )
+            result = _failure('Произошла ошибка при проверке')
+        return result, time.monotonic() - started_at
+
+
+@contextlib.asynccontextmanager
+async def _stream(
+    client: 'httpx.AsyncClient', url: str, previous: Any
+) -> AsyncIterator['httpx.Response']:
+    """Запрос с записью результата подключения в ``host_guard``."""
+    connected = False
+    try:
+        async with client.stream(
+            'GET', url, headers=CheckService._conditional_headers(previous)
+        ) as response:
+            connected = True
+            host_guard.record_success(url)
+            yield response
+    except (
+        httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError
+    ):
+        if not connected:
+            host_guard.record_failure(url)
+        raise
+
+
+async def _read_and_parse(
+    response: 'httpx.Response', url: str, previous: Any = None
+) -> Optional[Dict[str, Any]]:
+    """Асинхронный аналог ``CheckService._read_and_parse``."""
+    content_type = response.headers.get('Content-Type', '')
+    streaming = config.STREAMING_PARSE and not parse_pool.enabled
+    if streaming:
+        reader: Any = StreamingBody(content_type)
+        chunk_size = STREAM_CHUNK_SIZE
+    else:
+        reader = BufferedBody(content_type)
+        chunk_size = READ_CHUNK_SIZE
+    # Потоковый разбор и вычисление результата выполняются в потоке,
+    # чтобы разбор HTML не блокировал цикл событий и другие проверки
+    try:
+        async for chunk in response.aiter_bytes(chunk_size):
+            if streaming:
+                fed = await asyncio.to_thread(reader.feed, chunk)
+            else:
+                fed = reader.feed(chunk)
+            if not fed:
+                break
+        body = await asyncio.to_thread(reader.result)
+    except ResponseTooLarge:
+        logger.warning(
+            f'Превышен размер ответа для {url}: '
+            f'более {config.MAX_RESPONSE_SIZE} байт'
+        )
+        return None
+    except Exception as e:
+        logger.error(f'Ошибка при чтении ответа от {url}: {str(e)}')
+        return None
+
+    if streaming:
+        body['unchanged'] = False
+        return body
+    # Разбор, хеширование и обращение к parse_cache (или ожидание пула
+    # процессов) не блокируют цикл событий
+    return await asyncio.to_thread(
+        CheckService._complete_body, body, previous
+    )
+
+
+def _failure(message: str) -> Dict[str, Any]:
+    return {
+        'success': False,
+        'flash_message': message,
+        'flash_category': 'alert-danger'
+    }
@@ -0,0 +1,251 @@
+"""Сервис пакетной проверки URL."""
+
+import logging
+import statistics
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Deque, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from ..check_writer import CheckWriter
+from ..config import config
+from .check_service import CheckService
+
+logger = logging.getLogger(__name__)
+
+
+class HostSlots:
+    """Места для одновременных проверок каждого хоста.
+
+    URL хоста, у которого заняты все ``per_host`` мест, откладываются
+    и выдаются по одному при освобождении места этого хоста. Проверка
+    запускается, только когда место уже занято, поэтому потоки и задачи
+    не простаивают в ожидании своего хоста.
+    """
+
+    def __init__(self, per_host: int) -> None:
+        """
+        Инициализация мест.
+
+        Args:
+            per_host: Максимальное количество одновременных проверок
+                    одного хоста.
+        """
+        self.per_host = per_host
+        # Количество отложенных URL всех хостов
+        self.deferred_count = 0
+        self._active: Dict[str, int] = {}
+        self._deferred: Dict[str, Deque[Any]] = {}
+
+    @staticmethod
+    def host(url: str) -> str:
+        """Хост URL, по которому считаются места.
+
+        Args:
+            url: URL.
+
+        Returns:
+            str: Имя хоста в нижнем регистре.
+        """
+        return (urlsplit(url).hostname or '').lower()
+
+    def admit(self, host: str, url: Any) -> bool:
+        """Занятие места хоста или откладывание URL.
+
+        Args:
+            host: Хост URL (см. ``host``).
+            url: Запись URL.
+
+        Returns:
+            bool: True, если место занято и проверку можно запускать,
+            False, если URL отложен.
+        """
+        if self._active.get(host, 0) < self.per_host:
+            self._active[host] = self._active.get(host, 0) + 1
+            return True
+        self._deferred.setdefault(host, deque()).append(url)
+        self.deferred_count += 1
+        return False
+
+    def release(self, host: str) -> Optional[Any]:
+        """Освобождение места после завершения проверки.
+
+        Args:
+            host: Хост завершённой проверки.
+
+        Returns:
+            Any или None: Отложенный URL хоста, которому передано
+            освободившееся место, или None.
+        """
+        queue = self._deferred.get(host)
+        if queue:
+            self.deferred_count -= 1
+            if len(queue) == 1:
+                del self._deferred[host]
+            return queue.popleft()
+        self._active[host] -= 1
+        if not self._active[host]:
+            del self._active[host]
+        return None
+
+
+class BatchCheckService:
+    """Параллельная проверка набора URL.
+
+    Количество одновременных проверок ограничено глобально
+    (``concurrency``) и для каждого хоста (``per_host``, см.
+    ``HostSlots``). Успешные
+    результаты сохраняются через ``CheckWriter`` пакетами до
+    ``batch_size`` проверок.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 10,
+        per_host: int = 2,
+        batch_size: int = 100
+    ) -> None:
+        """
+        Инициализация сервиса.
+
+        Args:
+            concurrency: Максимальное количество одновременных проверок.
+            per_host: Максимальное количество одновременных проверок
+                    одного хоста.
+            batch_size: Количество результатов в одной пакетной вставке.
+        """
+        if concurrency < 1 or per_host < 1 or batch_size < 1:
+            raise ValueError(
+                'Параметры пакетной проверки должны быть положительными'
+            )
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.batch_size = batch_size
+
+    def run(self, urls: Iterable[Any]) -> Dict[str, Any]:
+        """Проверка URL и сохранение результатов.
+
+        Args:
+            urls: Записи URL с полями id и name.
+
+        Returns:
+            dict: Статистика выполнения (см. ``_build_stats``).
+        """
+        started_at = time.monotonic()
+        latencies: List[float] = []
+        counters = {'total': 0, 'succeeded': 0, 'failed': 0, 'saved': 0}
+        writer = CheckWriter(
+            batch_size=self.batch_size,
+            max_latency=config.CHECK_WRITER_MAX_LATENCY,
+            max_pending=config.CHECK_WRITER_MAX_PENDING
+        )
+
+        def collect(future: Future) -> None:
+            result, latency = future.result()
+            latencies.append(latency)
+            counters['total'] += 1
+            if result['success']:
+                counters['succeeded'] += 1
+                writer.put(result['data'])
+            else:
+                counters['failed'] += 1
+
+        slots = HostSlots(self.per_host)
+        # Незавершённые задачи и хосты их URL
+        in_flight: Dict[Future, str] = {}
+
+        def submit(url: Any, host: str) -> None:
+            in_flight[executor.submit(self._check, url)] = host
+
+        def complete() -> None:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                host = in_flight.pop(future)
+                collect(future)
+                url = slots.release(host)
+                if url is not None:
+                    submit(url, host)
+
+        with writer, ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix='batch-check'
+        ) as executor:
+            for url in urls:
+                # Отложенных URL не больше двух на поток, чтобы не держать
+                # в памяти задачи для всех URL сразу. Отложенный URL есть
+                # только у хоста с активной проверкой, поэтому ожидание
+                # завершится
+                while (
+                    len(in_flight) >= self.concurrency
+                    or slots.deferred_count >= self.concurrency * 2
+                ):
+                    complete()
+                host = slots.host(url.name)
+                if slots.admit(host, url):
+                    submit(url, host)
+            while in_flight:
+                complete()
+
+        counters['saved'] = writer.stats()['written']
+
+        stats = self._build_stats(
+            counters, latencies, time.monotonic() - started_at
+        )
+        logger.info(
+            f'Пакетная проверка завершена: {stats["total"]} URL, '
+            f'успешно {stats["succeeded"]}, с ошибкой {stats["failed"]}, '
+            f'{stats["throughput"]:.1f} URL/с'
+        )
+        return stats
+
+    def _check(self, url: Any) -> tuple:
+        started_at = time.monotonic()
+        try:
+            previous = CheckService.get_previous_check(url.id)
+            result = CheckService.run_check(url, previous)
+        except Exception as e:
+            logger.error(f'Ошибка при пакетной проверке {url.name}: {str(e)}')
+            result = {
+                'success': False,
+                'flash_message': 'Произошла ошибка при проверке',
+                'flash_category': 'alert-danger'
+            }
+        return result, time.monotonic() - started_at
+
+    @staticmethod
+    def _build_stats(
+        counters: Dict[str, int],
+        latencies: List[float],
+        elapsed: float
+    ) -> Dict[str, Any]:
+        """Расчёт статистики пакетной проверки.
+
+        Returns:
+            dict: Словарь со статистикой:
+                - total, succeeded, failed, saved: int - количество URL
+                - elapsed: float - общее время, секунды
+                - throughput: float - проверок в секунду
+                - latency_avg, latency_p50, latency_p95,
+                  latency_max: float - время одной проверки, секунды
+        """
+        stats: Dict[str, Any] = dict(counters)
+        stats['elapsed'] = elapsed
+        stats['throughput'] = counters['total'] / elapsed if elapsed else 0.0
+        if latencies:
+            ordered = sorted(latencies)
+            p95_index = max(0, int(round(len(ordered) * 0.95)) - 1)
+            stats['latency_avg'] = statistics.fmean(ordered)
+            stats['latency_p50'] = statistics.median(ordered)
+            stats['latency_p95'] = ordered[p95_index]
+            stats['latency_max'] = ordered[-1]
+        else:
+            stats.update(
+                latency_avg=0.0, latency_p50=0.0,
+                latency_p95=0.0, latency_max=0.0
+            )
+        return stats
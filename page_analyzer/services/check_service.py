@@ -1,9 +1,13 @@
 """Сервис для проверки страниц."""
 
+import codecs
+import hashlib
 import logging
+import re
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional
 from requests.exceptions import (
     RequestException,
@@ -12,22 +16,58 @@ from requests.exceptions import (
     HTTPError,
     TooManyRedirects
 )
+from ..check_writer import CheckWriter, SavedCallback
 from ..config import config
-from ..parser import parse
-from ..db import add_check, get_url_by_id
+from ..host_guard import HostUnavailable, host_guard
+from ..http_client import session_manager
+from ..parse_cache import ParseCache, parse_cache
+from ..parse_pool import parse_pool
+from ..parser import StreamingExtractor, parse
+from ..render_cache import render_cache
+from ..db import (
+    add_check,
+    enqueue_check_job,
+    get_check_job,
+    get_last_check_by_url_id,
+    get_url_by_id,
+)
 
 logger = logging.getLogger(__name__)
 
+# Размер порции при чтении тела ответа, байты
+READ_CHUNK_SIZE = 65536
+# Размер порции при потоковом разборе: чем меньше порция, тем меньше
+# лишних байт читается после того, как все поля найдены
+STREAM_CHUNK_SIZE = 16384
+# Сколько байт в начале документа просматривается в поисках meta charset
+META_SNIFF_SIZE = 2048
+CHARSET_HEADER_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+CHARSET_META_RE = re.compile(
+    rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.I
+)
+# Размер хэша тела страницы (blake2b), байты
+BODY_HASH_SIZE = 16
+# Сообщение об успешной проверке
+SUCCESS_MESSAGE = 'Страница успешно проверена'
+
 
 class CheckService:
     """Сервис для проверки страниц на SEO-пригодность."""
 
     @staticmethod
-    def check_url(url_id: int) -> Dict[str, Any]:
+    def check_url(
+        url_id: int,
+        writer: Optional[CheckWriter] = None,
+        on_saved: Optional[SavedCallback] = None
+    ) -> Dict[str, Any]:
         """Выполнение проверки URL.
 
         Args:
             url_id: ID URL для проверки.
+            writer: Буфер записи проверок. Если не указан, проверка
+                    сохраняется сразу.
+            on_saved: Функция, вызываемая после записи проверки из
+                    буфера ``writer``.
 
         Returns:
             dict: Словарь с результатами:
@@ -43,28 +83,138 @@ class CheckService:
                 'flash_category': 'alert-danger'
             }
 
+        previous = CheckService.get_previous_check(url_id)
+        result = CheckService.run_check(url, previous)
+        if result['success']:
+            if writer is None:
+                add_check(result['data'])
+                render_cache.invalidate_urls([url_id])
+            else:
+                writer.put(result['data'], on_saved)
+        return result
+
+    @staticmethod
+    def get_previous_check(url_id: int) -> Optional[Any]:
+        """Получение предыдущей проверки для условного запроса.
+
+        Args:
+            url_id: ID URL.
+
+        Returns:
+            NamedTuple или None: Последняя проверка URL или None, если
+            проверок не было или условные проверки отключены.
+        """
+        if not config.CONDITIONAL_CHECKS:
+            return None
+        return get_last_check_by_url_id(url_id)
+
+    @staticmethod
+    def enqueue_check(url_id: int) -> Dict[str, Any]:
+        """Постановка проверки URL в очередь фоновых проверок.
+
+        Args:
+            url_id: ID URL для проверки.
+
+        Returns:
+            dict: Словарь с результатами:
+                - success: bool - успешность операции
+                - job_id: int или None - ID задачи проверки
+                - flash_message: str - сообщение для flash
+                - flash_category: str - категория flash сообщения
+        """
+        if get_url_by_id(url_id) is None:
+            return {
+                'success': False,
+                'job_id': None,
+                'flash_message': 'URL не найден',
+                'flash_category': 'alert-danger'
+            }
+        job = enqueue_check_job(url_id)
+        return {
+            'success': True,
+            'job_id': job.id,
+            'flash_message': 'Проверка поставлена в очередь',
+            'flash_category': 'alert-info'
+        }
+
+    @staticmethod
+    def get_job_status(job_id: int) -> Optional[Dict[str, Any]]:
+        """Получение состояния задачи проверки.
+
+        Args:
+            job_id: ID задачи.
+
+        Returns:
+            dict или None: Состояние задачи (id, url_id, status, message,
+            created_at, finished_at) или None, если задача не найдена.
+        """
+        job = get_check_job(job_id)
+        if job is None:
+            return None
+        return {
+            'id': job.id,
+            'url_id': job.url_id,
+            'status': job.status,
+            'finished': job.status in ('done', 'failed'),
+            'message': job.message,
+            'created_at': job.created_at.isoformat(),
+            'finished_at': (
+                job.finished_at.isoformat() if job.finished_at else None
+            ),
+        }
+
+    @staticmethod
+    def run_check(url: Any, previous: Any = None) -> Dict[str, Any]:
+        """Загрузка и анализ страницы без сохранения результата.
+
+        Если передана предыдущая проверка, запрос отправляется с
+        If-None-Match/If-Modified-Since. При ответе 304 или совпадении
+        хэша тела данные страницы копируются из предыдущей проверки
+        без разбора.
+
+        Args:
+            url: Запись URL с полями id и name.
+            previous: Предыдущая проверка URL (см. ``get_previous_check``).
+
+        Returns:
+            dict: Словарь с результатами:
+                - success: bool - успешность операции
+                - flash_message: str - сообщение для flash
+                - flash_category: str - категория flash сообщения
+                - data: dict - данные проверки для add_check
+                  (только при успехе)
+                - metrics: dict - bytes_read и elapsed чтения тела ответа,
+                  stopped_early - прочитано ли тело не полностью,
+                  unchanged - не изменилась ли страница с предыдущей
+                  проверки, host_wait - ожидание ограничителя частоты
+                  запросов к хосту, секунды (только при успехе)
+        """
+        url_id = url.id
+        response = None
         try:
             # Логируем начало проверки
             logger.info(f'Начало проверки URL ID {url_id}: {url.name}')
 
-            # Создаём сессию для контроля редиректов
-            session = requests.Session()
-            # Настраиваем адаптер
-            adapter = HTTPAdapter(max_retries=Retry(total=0))
-            session.mount('http://', adapter)
-            session.mount('https://', adapter)
+            host_wait = host_guard.acquire(url.name)
 
-            # Выполнение HTTP-запроса
+            # Выполнение HTTP-запроса через общую сессию процесса,
+            # чтобы переиспользовать открытые соединения с хостом
             logger.debug(f'Выполнение HTTP-запроса к {url.name}')
-            response = session.get(
-                url.name,
-                timeout=(
-                    config.REQUEST_CONNECT_TIMEOUT,
-                    config.REQUEST_READ_TIMEOUT
-                ),
-                allow_redirects=True,
-                stream=True
-            )
+            try:
+                response = session_manager.get(
+                    url.name,
+                    timeout=(
+                        config.REQUEST_CONNECT_TIMEOUT,
+                        config.REQUEST_READ_TIMEOUT
+                    ),
+                    allow_redirects=True,
+                    stream=True,
+                    headers=CheckService._conditional_headers(previous)
+                )
+            except (Timeout, RequestsConnectionError):
+                host_guard.record_failure(url.name)
+                raise
+            host_guard.record_success(url.name)
             logger.info(
                 f'HTTP-запрос к {url.name} выполнен: '
                 f'статус {response.status_code}, '
@@ -81,6 +231,13 @@ class CheckService:
 
             response.raise_for_status()
 
+            if response.status_code == 304 and previous is not None:
+                result = CheckService._not_modified_result(
+                    url, previous, response
+                )
+                result['metrics']['host_wait'] = host_wait
+                return result
+
             # Проверка размера ответа
             content_length = response.headers.get('Content-Length')
             max_size = config.MAX_RESPONSE_SIZE
@@ -91,13 +248,11 @@ class CheckService:
                     'flash_category': 'alert-danger'
                 }
 
-            # Чтение содержимого с ограничением размера
-            content = CheckService._read_response_content(
-                response,
-                url.name
+            # Чтение и разбор содержимого с ограничением размера
+            body = CheckService._read_and_parse(
+                response, url.name, previous
             )
-
-            if content is None:
+            if body is None:
                 return {
                     'success': False,
                     'flash_message': (
@@ -106,33 +261,21 @@ class CheckService:
                     'flash_category': 'alert-danger'
                 }
 
-            # Проверка Content-Type
-            content_type = response.headers.get('Content-Type', '').lower()
-            if 'text/html' not in content_type:
-                logger.warning(
-                    f'Неожиданный Content-Type для {url.name}: '
-                    f'{content_type}'
-                )
-
-            # Парсинг и сохранение данных
-            data = parse(content)
-            data['url_id'] = url_id
-            data['status_code'] = response.status_code
-            add_check(data)
+            result = CheckService._success_result(url, response, body)
+            result['metrics']['host_wait'] = host_wait
+            return result
 
-            logger.info(
-                f'Успешно выполнена проверка для URL ID {url_id} ({url.name}): '
-                f'статус {response.status_code}, '
-                f'h1={bool(data.get("h1"))}, '
-                f'title={bool(data.get("title"))}, '
-                f'description={bool(data.get("description"))}'
+        except HostUnavailable:
+            logger.warning(
+                f'Проверка {url.name} отклонена: хост не отвечает'
             )
             return {
-                'success': True,
-                'flash_message': 'Страница успешно проверена',
-                'flash_category': 'alert-success'
+                'success': False,
+                'flash_message': (
+                    'Сервер временно недоступен, повторите проверку позже'
+                ),
+                'flash_category': 'alert-danger'
             }
-
         except Timeout:
             logger.error(f'Таймаут при проверке URL {url.name}')
             return {
@@ -172,42 +315,469 @@ class CheckService:
                 'flash_message': 'Произошла ошибка при проверке',
                 'flash_category': 'alert-danger'
             }
+        except (FutureTimeoutError, BrokenProcessPool) as e:
+            logger.error(f'Ошибка при разборе страницы {url.name}: {e!r}')
+            return {
+                'success': False,
+                'flash_message': 'Не удалось разобрать страницу',
+                'flash_category': 'alert-danger'
+            }
+        finally:
+            # Возвращаем соединение в пул сессии. Если тело прочитано
+            # не полностью, соединение закрывается, а не переиспользуется
+            if response is not None:
+                response.close()
+
+    @staticmethod
+    def _success_result(
+        url: Any, response: Any, body: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Формирование результата успешной проверки.
+
+        Args:
+            url: Запись URL с полями id и name.
+            response: Ответ сервера (requests или httpx).
+            body: Результат ``_read_and_parse``.
+
+        Returns:
+            dict: Результат в формате ``run_check``.
+        """
+        # Проверка Content-Type
+        content_type = response.headers.get('Content-Type', '').lower()
+        if 'text/html' not in content_type:
+            logger.warning(
+                f'Неожиданный Content-Type для {url.name}: '
+                f'{content_type}'
+            )
+
+        data = body['data']
+        data['url_id'] = url.id
+        data['status_code'] = response.status_code
+        data['etag'] = response.headers.get('ETag')
+        data['last_modified'] = response.headers.get('Last-Modified')
+        data['body_hash'] = body['body_hash']
+
+        logger.info(
+            f'Успешно выполнена проверка для URL ID {url.id} ({url.name}): '
+            f'статус {response.status_code}, '
+            f'прочитано {body["bytes_read"]} байт '
+            f'за {body["elapsed"]:.3f} с'
+            f'{" (досрочно)" if body["stopped_early"] else ""}'
+            f'{" (без изменений)" if body["unchanged"] else ""}, '
+            f'h1={bool(data.get("h1"))}, '
+            f'title={bool(data.get("title"))}, '
+            f'description={bool(data.get("description"))}'
+        )
+        return {
+            'success': True,
+            'flash_message': SUCCESS_MESSAGE,
+            'flash_category': 'alert-success',
+            'data': data,
+            'metrics': {
+                'bytes_read': body['bytes_read'],
+                'elapsed': body['elapsed'],
+                'stopped_early': body['stopped_early'],
+                'unchanged': body['unchanged'],
+            }
+        }
+
+    @staticmethod
+    def _conditional_headers(previous: Any) -> Dict[str, str]:
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers['If-None-Match'] = previous.etag
+            if previous.last_modified:
+                headers['If-Modified-Since'] = previous.last_modified
+        return headers
+
+    @staticmethod
+    def _not_modified_result(
+        url: Any, previous: Any, response: requests.Response
+    ) -> Dict[str, Any]:
+        logger.info(
+            f'Страница URL ID {url.id} ({url.name}) не изменилась '
+            f'(304), данные взяты из проверки {previous.id}'
+        )
+        data = _previous_page_data(previous)
+        data.update(
+            url_id=url.id,
+            # Код ответа страницы не изменился, 304 - ответ на условный
+            # запрос, а не состояние страницы
+            status_code=previous.status_code,
+            etag=response.headers.get('ETag') or previous.etag,
+            last_modified=(
+                response.headers.get('Last-Modified')
+                or previous.last_modified
+            ),
+            body_hash=previous.body_hash,
+        )
+        return {
+            'success': True,
+            'flash_message': SUCCESS_MESSAGE,
+            'flash_category': 'alert-success',
+            'data': data,
+            'metrics': {
+                'bytes_read': 0,
+                'elapsed': 0.0,
+                'stopped_early': False,
+                'unchanged': True,
+            }
+        }
+
+    @staticmethod
+    def _read_and_parse(
+        response: requests.Response, url: str, previous: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        """Чтение тела ответа и извлечение данных страницы.
+
+        Если включён пул процессов разбора, тело читается целиком и
+        разбирается в пуле. Иначе страница разбирается в текущем потоке:
+        потоково (STREAMING_PARSE) или после полного чтения. Если тело
+        прочитано целиком и его хэш совпадает с хэшем предыдущей
+        проверки, разбор не выполняется.
+
+        Args:
+            response: Объект ответа requests.
+            url: URL для логирования.
+            previous: Предыдущая проверка URL или None.
+
+        Returns:
+            dict или None: Результат в формате ``_stream_response_data``
+            с дополнительным полем unchanged: bool или None, если превышен
+            лимит или произошла ошибка чтения.
+
+        Raises:
+            concurrent.futures.TimeoutError: Если разбор в пуле процессов
+                занял слишком много времени.
+            BrokenProcessPool: Если процесс разбора аварийно завершился.
+        """
+        if config.STREAMING_PARSE and not parse_pool.enabled:
+            body = CheckService._stream_response_data(response, url)
+            if body is not None:
+                body['unchanged'] = False
+            return body
+
+        body = CheckService._read_response_bytes(response, url)
+        if body is None:
+            return None
+        return CheckService._complete_body(body, previous)
+
+    @staticmethod
+    def _complete_body(
+        body: Dict[str, Any], previous: Any = None
+    ) -> Dict[str, Any]:
+        """Извлечение данных страницы из тела, прочитанного целиком.
+
+        Args:
+            body: Результат ``_read_response_bytes``.
+            previous: Предыдущая проверка URL или None.
+
+        Returns:
+            dict: Результат в формате ``_read_and_parse``.
+        """
+        content = body.pop('body')
+        body['stopped_early'] = False
+        body['unchanged'] = (
+            previous is not None
+            and previous.body_hash == body['body_hash']
+        )
+        if body['unchanged']:
+            body['data'] = _previous_page_data(previous)
+        else:
+            body['data'] = CheckService._parse_body(
+                content, body['body_hash'], body['encoding']
+            )
+        return body
+
+    @staticmethod
+    def _parse_body(
+        content: bytes, body_hash: str, encoding: str
+    ) -> Dict[str, str]:
+        """Разбор тела страницы с использованием кэша разбора.
+
+        Args:
+            content: Тело ответа.
+            body_hash: Хэш тела.
+            encoding: Кодировка страницы.
+
+        Returns:
+            dict: Словарь с данными (h1, title, description).
+        """
+        key = ParseCache.make_key(body_hash, encoding)
+        data = parse_cache.get(key)
+        if data is not None:
+            return data
+        if parse_pool.enabled:
+            data = parse_pool.parse(content, encoding)
+        else:
+            data = parse(content.decode(encoding, errors='replace'))
+        parse_cache.put(key, data)
+        return data
 
     @staticmethod
     def _read_response_content(
         response: requests.Response, url: str
-    ) -> Optional[str]:
-        """Чтение содержимого ответа с ограничением размера.
+    ) -> Optional[Dict[str, Any]]:
+        """Чтение и декодирование содержимого ответа.
+
+        Args:
+            response: Объект ответа requests.
+            url: URL для логирования.
+
+        Returns:
+            dict или None: Словарь с содержимым или None, если превышен
+            лимит или произошла ошибка чтения:
+                - content: str - декодированное содержимое
+                - encoding: str - использованная кодировка
+                - bytes_read: int - количество прочитанных байт
+                - elapsed: float - время чтения тела, секунды
+        """
+        body = CheckService._read_response_bytes(response, url)
+        if body is not None:
+            body['content'] = body.pop('body').decode(
+                body['encoding'], errors='replace'
+            )
+        return body
+
+    @staticmethod
+    def _read_response_bytes(
+        response: requests.Response, url: str
+    ) -> Optional[Dict[str, Any]]:
+        """Чтение тела ответа в байтах с ограничением размера.
+
+        Тело ответа читается в один буфер, размер ограничивается точно
+        по количеству байт. Кодировка определяется, но тело
+        не декодируется.
 
         Args:
             response: Объект ответа requests.
             url: URL для логирования.
 
         Returns:
-            str или None: Содержимое ответа или None, если превышен лимит.
+            dict или None: Словарь с телом или None, если превышен
+            лимит или произошла ошибка чтения:
+                - body: bytearray - тело ответа
+                - body_hash: str - хэш тела
+                - encoding: str - кодировка страницы
+                - bytes_read: int - количество прочитанных байт
+                - elapsed: float - время чтения тела, секунды
+        """
+        reader = BufferedBody(response.headers.get('Content-Type', ''))
+        return CheckService._consume(reader, response, READ_CHUNK_SIZE, url)
+
+    @staticmethod
+    def _stream_response_data(
+        response: requests.Response, url: str
+    ) -> Optional[Dict[str, Any]]:
+        """Потоковый разбор тела ответа с ранней остановкой.
+
+        Тело читается порциями, декодируется инкрементально и сразу
+        передаётся в ``StreamingExtractor``. Чтение прекращается, как только
+        найдены все поля, поэтому для большинства страниц загружается
+        только начало документа. Ограничение размера применяется так же,
+        как в ``_read_response_content``.
+
+        Args:
+            response: Объект ответа requests.
+            url: URL для логирования.
+
+        Returns:
+            dict или None: Словарь с результатом или None, если превышен
+            лимит или произошла ошибка чтения:
+                - data: dict - извлечённые данные (h1, title, description)
+                - encoding: str - использованная кодировка
+                - bytes_read: int - количество прочитанных байт
+                - elapsed: float - время чтения и разбора, секунды
+                - stopped_early: bool - прочитано ли тело не полностью
+                - body_hash: str или None - хэш тела (только если тело
+                  прочитано полностью)
+        """
+        reader = StreamingBody(response.headers.get('Content-Type', ''))
+        return CheckService._consume(reader, response, STREAM_CHUNK_SIZE, url)
+
+    @staticmethod
+    def _consume(
+        reader: Any,
+        response: requests.Response,
+        chunk_size: int,
+        url: str
+    ) -> Optional[Dict[str, Any]]:
+        """Передача тела ответа порциями в обработчик тела.
+
+        Args:
+            reader: ``BufferedBody`` или ``StreamingBody``.
+            response: Объект ответа requests.
+            chunk_size: Размер порции, байты.
+            url: URL для логирования.
+
+        Returns:
+            dict или None: Результат ``reader.result()`` или None, если
+            превышен лимит или произошла ошибка чтения.
         """
-        content = ''
-        total_size = 0
         try:
-            for chunk in response.iter_content(
-                chunk_size=8192,
-                decode_unicode=True
-            ):
-                total_size += len(chunk.encode('utf-8'))
-                if total_size > config.MAX_RESPONSE_SIZE:
-                    logger.warning(
-                        f'Превышен размер ответа для {url}: '
-                        f'{total_size} байт'
-                    )
-                    return None
-                content += chunk
-                if len(content) > config.MAX_RESPONSE_SIZE:
-                    logger.warning(
-                        f'Превышен размер контента для {url}: '
-                        f'{len(content)} символов'
-                    )
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not reader.feed(chunk):
                     break
-            return content
+            return reader.result()
+        except ResponseTooLarge:
+            logger.warning(
+                f'Превышен размер ответа для {url}: '
+                f'более {config.MAX_RESPONSE_SIZE} байт'
+            )
         except Exception as e:
             logger.error(f'Ошибка при чтении ответа от {url}: {str(e)}')
-            return None
+        return None
+
+    @staticmethod
+    def _detect_encoding(content_type: str, body: bytes) -> str:
+        """Определение кодировки HTML-страницы.
+
+        Кодировка берётся из заголовка Content-Type, затем из meta-тега
+        в начале документа. По умолчанию используется UTF-8.
+
+        Args:
+            content_type: Значение заголовка Content-Type.
+            body: Начало тела ответа.
+
+        Returns:
+            str: Название кодировки, поддерживаемой Python.
+        """
+        match = CHARSET_HEADER_RE.search(content_type)
+        if match is None:
+            match = CHARSET_META_RE.search(body[:META_SNIFF_SIZE])
+        if match is not None:
+            charset = match.group(1)
+            if isinstance(charset, bytes):
+                charset = charset.decode('ascii', errors='ignore')
+            try:
+                return codecs.lookup(charset).name
+            except LookupError:
+                logger.debug(f'Неизвестная кодировка страницы: {charset}')
+        return 'utf-8'
+
+
+class ResponseTooLarge(Exception):
+    """Тело ответа больше MAX_RESPONSE_SIZE."""
+
+
+class BufferedBody:
+    """Чтение тела ответа целиком в один буфер."""
+
+    def __init__(self, content_type: str) -> None:
+        self.content_type = content_type
+        self.started_at = time.monotonic()
+        self.buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> bool:
+        """Добавление порции тела.
+
+        Returns:
+            bool: True - тело нужно читать дальше.
+
+        Raises:
+            ResponseTooLarge: Если превышен MAX_RESPONSE_SIZE.
+        """
+        if len(self.buffer) + len(chunk) > config.MAX_RESPONSE_SIZE:
+            raise ResponseTooLarge()
+        self.buffer += chunk
+        return True
+
+    def result(self) -> Dict[str, Any]:
+        """Результат в формате ``_read_response_bytes``."""
+        return {
+            'body': self.buffer,
+            'body_hash': _body_hash(self.buffer),
+            'encoding': CheckService._detect_encoding(
+                self.content_type, self.buffer
+            ),
+            'bytes_read': len(self.buffer),
+            'elapsed': time.monotonic() - self.started_at,
+        }
+
+
+class StreamingBody:
+    """Потоковый разбор тела ответа по мере чтения."""
+
+    def __init__(self, content_type: str) -> None:
+        self.content_type = content_type
+        self.started_at = time.monotonic()
+        self.extractor = StreamingExtractor()
+        # Пока кодировка не определена, начало документа накапливается,
+        # чтобы найти в нём meta charset
+        self.head = bytearray()
+        self.header_has_charset = bool(CHARSET_HEADER_RE.search(content_type))
+        self.encoding: Optional[str] = None
+        self.decoder: Optional[codecs.IncrementalDecoder] = None
+        self.bytes_read = 0
+        self.stopped_early = False
+        self.hasher = hashlib.blake2b(digest_size=BODY_HASH_SIZE)
+
+    def feed(self, chunk: bytes) -> bool:
+        """Разбор очередной порции тела.
+
+        Returns:
+            bool: True - тело нужно читать дальше, False - все поля
+            найдены.
+
+        Raises:
+            ResponseTooLarge: Если превышен MAX_RESPONSE_SIZE.
+        """
+        if self.bytes_read + len(chunk) > config.MAX_RESPONSE_SIZE:
+            raise ResponseTooLarge()
+        self.bytes_read += len(chunk)
+        self.hasher.update(chunk)
+        if self.decoder is None:
+            self.head += chunk
+            if not self.header_has_charset and (
+                len(self.head) < META_SNIFF_SIZE
+            ):
+                return True
+            self._start_decoding()
+            chunk = bytes(self.head)
+        self.extractor.feed(self.decoder.decode(chunk))
+        if self.extractor.done:
+            self.stopped_early = True
+            return False
+        return True
+
+    def result(self) -> Dict[str, Any]:
+        """Результат в формате ``_stream_response_data``."""
+        if not self.stopped_early:
+            if self.decoder is None:
+                self._start_decoding()
+                self.extractor.feed(self.decoder.decode(bytes(self.head)))
+            self.extractor.feed(self.decoder.decode(b'', final=True))
+            self.extractor.close()
+        return {
+            'data': self.extractor.result(),
+            'encoding': self.encoding,
+            'bytes_read': self.bytes_read,
+            'elapsed': time.monotonic() - self.started_at,
+            'stopped_early': self.stopped_early,
+            'body_hash': (
+                None if self.stopped_early else self.hasher.hexdigest()
+            ),
+        }
+
+    def _start_decoding(self) -> None:
+        self.encoding = CheckService._detect_encoding(
+            self.content_type, self.head
+        )
+        self.decoder = _incremental_decoder(self.encoding)
+
+
+def _incremental_decoder(encoding: str) -> codecs.IncrementalDecoder:
+    return codecs.getincrementaldecoder(encoding)(errors='replace')
+
+
+def _body_hash(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=BODY_HASH_SIZE).hexdigest()
+
+
+def _previous_page_data(previous: Any) -> Dict[str, str]:
+    return {
+        'h1': previous.h1 or '',
+        'title': previous.title or '',
+        'description': previous.description or '',
+    }
@@ -0,0 +1,166 @@
+"""Выгрузка истории проверок в CSV и NDJSON."""
+
+import csv
+import io
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from ..config import config
+from ..db import iter_checks_export
+
+logger = logging.getLogger(__name__)
+
+# Поля выгрузки в порядке столбцов CSV
+FIELDS = (
+    'url_id',
+    'url',
+    'check_id',
+    'status_code',
+    'h1',
+    'title',
+    'description',
+    'created_at',
+)
+# Поля с текстом страницы, который может начинаться с формулы
+TEXT_FIELDS = ('h1', 'title', 'description')
+# Формат выгрузки -> MIME-тип ответа
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+# Первые символы, с которых табличные редакторы начинают формулу
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class ExportService:
+    """Сервис выгрузки проверок для отчётов."""
+
+    @staticmethod
+    def parse_filters(
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        statuses: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """Разбор фильтров выгрузки из строк запроса или командной строки.
+
+        Args:
+            since: Начало периода в формате ISO 8601 (дата или дата и
+                   время), включительно.
+            until: Конец периода в формате ISO 8601. Дата без времени
+                   включает весь день.
+            statuses: Коды ответа.
+
+        Returns:
+            dict: Аргументы ``iter_checks``: since, until и status_codes.
+
+        Raises:
+            ValueError: Если значение фильтра некорректно.
+        """
+        filters: Dict[str, Any] = {
+            'since': _parse_date(since, 'начала'),
+            'until': _parse_date(until, 'конца'),
+            'status_codes': [],
+        }
+        # Дата без времени (YYYY-MM-DD) включает весь день
+        if until and len(until) == 10:
+            filters['until'] += timedelta(days=1)
+        for status in statuses:
+            if not status.isdigit() or not 100 <= int(status) <= 599:
+                raise ValueError(f'Некорректный код ответа: {status}')
+            filters['status_codes'].append(int(status))
+        return filters
+
+    @staticmethod
+    def iter_checks(
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        status_codes: Optional[List[int]] = None
+    ) -> Iterator[Any]:
+        """Получение проверок с URL по мере чтения из БД.
+
+        Строки читаются порциями по EXPORT_BATCH_SIZE.
+
+        Args:
+            since: Начало периода, включительно.
+            until: Конец периода, не включительно.
+            status_codes: Коды ответа.
+
+        Returns:
+            Iterator: Проверки в порядке времени проверки.
+        """
+        return iter_checks_export(
+            since, until, status_codes, config.EXPORT_BATCH_SIZE
+        )
+
+    @staticmethod
+    def export(rows: Iterable[Any], export_format: str) -> Iterator[str]:
+        """Преобразование проверок в текст выгрузки.
+
+        Текст отдаётся кусками по EXPORT_BATCH_SIZE строк, поэтому
+        в памяти одновременно находится не больше одной порции.
+
+        Args:
+            rows: Проверки (см. ``iter_checks``).
+            export_format: Формат выгрузки: csv или ndjson.
+
+        Returns:
+            Iterator: Куски текста выгрузки.
+
+        Raises:
+            ValueError: Если формат не поддерживается.
+        """
+        if export_format == 'csv':
+            return _export_csv(rows)
+        if export_format == 'ndjson':
+            return _export_ndjson(rows)
+        raise ValueError(
+            f'Неподдерживаемый формат выгрузки: {export_format}'
+        )
+
+
+def _parse_date(value: Optional[str], name: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'Некорректная дата {name} периода: {value}') from None
+
+
+def _export_csv(rows: Iterable[Any]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for count, row in enumerate(rows, 1):
+        values = row._asdict()
+        for field in TEXT_FIELDS:
+            text = values[field]
+            # Защита от выполнения формул при открытии в Excel
+            if text and text.startswith(FORMULA_PREFIXES):
+                values[field] = f"'{text}"
+        values['created_at'] = _format_date(values['created_at'])
+        writer.writerow(values[field] for field in FIELDS)
+        if count % config.EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _export_ndjson(rows: Iterable[Any]) -> Iterator[str]:
+    lines: List[str] = []
+    for row in rows:
+        values = row._asdict()
+        values['created_at'] = _format_date(values['created_at'])
+        lines.append(json.dumps(values, ensure_ascii=False) + '\n')
+        if len(lines) >= config.EXPORT_BATCH_SIZE:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def _format_date(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
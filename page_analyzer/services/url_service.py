@@ -1,15 +1,21 @@
 """Сервис для работы с URL."""
 
+import csv
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, Set
+from ..config import config
 from ..validator import validate
 from ..normalizer import normalize
+from ..render_cache import render_cache
 from ..db import (
-    add_url,
-    get_url_by_name,
+    import_urls,
+    upsert_url,
     get_url_by_id,
     get_all_urls,
-    get_checks_by_url_id
+    iter_all_urls,
+    get_checks_by_url_id,
+    get_url_version,
+    get_urls_version
 )
 
 logger = logging.getLogger(__name__)
@@ -45,30 +51,9 @@ class URLService:
 
         normalized_url = normalize(url_input)
         logger.debug(f'Нормализованный URL: {normalized_url}')
-        url_in_db = get_url_by_name(normalized_url)
-
-        if url_in_db:
-            logger.info(
-                f'URL уже существует: {normalized_url} (ID: {url_in_db.id})'
-            )
-            return {
-                'success': True,
-                'url_id': url_in_db.id,
-                'error': None,
-                'flash_message': 'Страница уже существует',
-                'flash_category': 'alert-info'
-            }
 
         try:
-            url_id = add_url(normalized_url)
-            logger.info(f'Добавлен новый URL: {normalized_url} (ID: {url_id})')
-            return {
-                'success': True,
-                'url_id': url_id,
-                'error': None,
-                'flash_message': 'Страница успешно добавлена',
-                'flash_category': 'alert-success'
-            }
+            url_id, inserted = upsert_url(normalized_url)
         except Exception as e:
             error_msg = f'Ошибка при добавлении URL {normalized_url}: {str(e)}'
             logger.error(error_msg)
@@ -80,6 +65,79 @@ class URLService:
                 'flash_category': 'alert-danger'
             }
 
+        if not inserted:
+            logger.info(
+                f'URL уже существует: {normalized_url} (ID: {url_id})'
+            )
+            return {
+                'success': True,
+                'url_id': url_id,
+                'error': None,
+                'flash_message': 'Страница уже существует',
+                'flash_category': 'alert-info'
+            }
+
+        logger.info(f'Добавлен новый URL: {normalized_url} (ID: {url_id})')
+        render_cache.invalidate_urls()
+        return {
+            'success': True,
+            'url_id': url_id,
+            'error': None,
+            'flash_message': 'Страница успешно добавлена',
+            'flash_category': 'alert-success'
+        }
+
+    @staticmethod
+    def import_urls(lines: Iterable[str]) -> Dict[str, int]:
+        """Массовый импорт URL из CSV или списка строк.
+
+        Из каждой строки берётся первое поле CSV; пустые строки и строки,
+        начинающиеся с ``#``, пропускаются. Каждый URL проверяется и
+        нормализуется так же, как при добавлении через форму. Строки
+        читаются по мере загрузки в БД, в памяти хранятся только
+        уникальные нормализованные URL для устранения повторов.
+
+        Args:
+            lines: Строки файла импорта.
+
+        Returns:
+            dict: Статистика импорта:
+                - total: int - количество обработанных строк
+                - inserted: int - добавлено новых URL
+                - duplicates: int - повторы в файле и уже существующие URL
+                - invalid: int - некорректные URL
+        """
+        stats = {'total': 0, 'inserted': 0, 'duplicates': 0, 'invalid': 0}
+        seen: Set[str] = set()
+
+        def valid_urls() -> Iterator[str]:
+            for row in csv.reader(lines):
+                url_input = row[0].strip() if row else ''
+                if not url_input or url_input.startswith('#'):
+                    continue
+                stats['total'] += 1
+                if validate(url_input):
+                    stats['invalid'] += 1
+                    continue
+                normalized_url = normalize(url_input)
+                if normalized_url in seen:
+                    stats['duplicates'] += 1
+                    continue
+                seen.add(normalized_url)
+                yield normalized_url
+
+        stats['inserted'] = import_urls(valid_urls())
+        stats['duplicates'] += len(seen) - stats['inserted']
+        if stats['inserted']:
+            render_cache.invalidate_urls()
+        logger.info(
+            f'Импорт URL завершён: строк {stats["total"]}, '
+            f'добавлено {stats["inserted"]}, '
+            f'повторов {stats["duplicates"]}, '
+            f'некорректных {stats["invalid"]}'
+        )
+        return stats
+
     @staticmethod
     def get_url(id: int) -> Optional[Any]:
         """Получение URL по ID.
@@ -93,13 +151,63 @@ class URLService:
         return get_url_by_id(id)
 
     @staticmethod
-    def get_all_urls() -> list:
-        """Получение списка всех URL с последними проверками.
+    def get_all_urls(
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Получение страницы списка URL с последними проверками.
+
+        Args:
+            after_id: ID, после которого начинается страница.
+            before_id: ID, перед которым заканчивается страница.
+            limit: Размер страницы. Ограничивается значением
+                   URLS_MAX_PAGE_SIZE из конфигурации.
+
+        Returns:
+            dict: Словарь со страницей:
+                - urls: list - URL с информацией о последней проверке
+                - limit: int - размер страницы
+                - next_after_id: int или None - курсор следующей страницы
+                - prev_before_id: int или None - курсор предыдущей страницы
+        """
+        if limit is None:
+            limit = config.URLS_PAGE_SIZE
+        limit = max(1, min(limit, config.URLS_MAX_PAGE_SIZE))
+
+        # Запрашиваем на одну запись больше, чтобы узнать о наличии
+        # следующей страницы без подсчёта всех строк
+        urls = get_all_urls(after_id, before_id, limit + 1)
+        has_more = len(urls) > limit
+        backwards = before_id is not None and after_id is None
+        if backwards:
+            urls = urls[-limit:]
+            has_next = bool(urls)
+            has_prev = has_more
+        else:
+            urls = urls[:limit]
+            has_next = has_more
+            has_prev = after_id is not None and bool(urls)
+
+        return {
+            'urls': urls,
+            'limit': limit,
+            'next_after_id': urls[-1].id if has_next else None,
+            'prev_before_id': urls[0].id if has_prev else None,
+        }
+
+    @staticmethod
+    def iter_all_urls() -> Iterator[Any]:
+        """Получение всех URL с последними проверками по мере чтения.
+
+        Используется для вывода списка без разбиения на страницы. Строки
+        читаются из БД порциями по URLS_STREAM_BATCH_SIZE по мере
+        перебора.
 
         Returns:
-            list: Список URL с информацией о последней проверке.
+            Iterator: URL с информацией о последней проверке.
         """
-        return get_all_urls()
+        return iter_all_urls(config.URLS_STREAM_BATCH_SIZE)
 
     @staticmethod
     def get_url_checks(id: int) -> list:
@@ -112,3 +220,35 @@ class URLService:
             list: Список проверок для URL.
         """
         return get_checks_by_url_id(id)
+
+    @staticmethod
+    def get_urls_version() -> str:
+        """Версия списка URL для ETag.
+
+        Returns:
+            str: Версия, меняющаяся при добавлении URL и проверок.
+        """
+        return str(get_urls_version())
+
+    @staticmethod
+    def get_url_version(id: int) -> Optional[str]:
+        """Версия страницы URL для ETag.
+
+        Args:
+            id: ID URL.
+
+        Returns:
+            str или None: Версия, меняющаяся при добавлении проверок URL
+            и изменении его расписания, или None, если URL не найден.
+        """
+        version = get_url_version(id)
+        if version is None:
+            return None
+        next_check_at = (
+            version.next_check_at.timestamp()
+            if version.next_check_at else None
+        )
+        return (
+            f'{version.checks_count}.{version.max_check_id}.'
+            f'{version.check_interval}.{next_check_at}'
+        )
@@ -0,0 +1,156 @@
+"""Воркер фоновых проверок URL из очереди check_jobs."""
+
+import logging
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Iterable, Optional, Set
+from .check_writer import CheckWriter
+from .config import config
+from .db import claim_check_jobs, finish_check_job
+from .services import CheckService
+from .services.check_service import SUCCESS_MESSAGE
+
+logger = logging.getLogger(__name__)
+
+
+class CheckWorker:
+    """Воркер, выполняющий проверки из очереди.
+
+    Несколько воркеров (в том числе на разных узлах) могут работать
+    с одной очередью: задачи захватываются через ``SKIP LOCKED``.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        job_timeout: Optional[float] = None
+    ) -> None:
+        """
+        Инициализация воркера.
+
+        Args:
+            concurrency: Количество одновременно выполняемых проверок.
+            poll_interval: Пауза между опросами пустой очереди, секунды.
+            job_timeout: Время, после которого выполняемая задача
+                    считается брошенной и захватывается повторно.
+        """
+        self.concurrency = concurrency or config.CHECK_WORKER_CONCURRENCY
+        self.poll_interval = (
+            poll_interval if poll_interval is not None
+            else config.CHECK_WORKER_POLL_INTERVAL
+        )
+        self.job_timeout = job_timeout or config.CHECK_JOB_TIMEOUT
+        self.stop_event = threading.Event()
+        # Буфер записи проверок, создаётся на время run_forever
+        self.writer: Optional[CheckWriter] = None
+
+    def run_once(self) -> int:
+        """Захват и выполнение одной порции задач в текущем потоке.
+
+        Returns:
+            int: Количество выполненных задач.
+        """
+        jobs = claim_check_jobs(self.concurrency, self.job_timeout)
+        for job in jobs:
+            self._process(job)
+        return len(jobs)
+
+    def run_forever(self) -> None:
+        """Обработка очереди до вызова ``stop``.
+
+        Новые задачи захватываются, как только освобождается место
+        в пуле, а не после завершения всей порции, поэтому одна медленная
+        проверка не простаивает остальные потоки.
+        """
+        logger.info(
+            f'Воркер проверок запущен (параллельно {self.concurrency})'
+        )
+        self.writer = CheckWriter(
+            batch_size=config.CHECK_WRITER_BATCH_SIZE,
+            max_latency=config.CHECK_WRITER_MAX_LATENCY,
+            max_pending=config.CHECK_WRITER_MAX_PENDING
+        )
+        in_flight: Set[Future] = set()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix='check-worker'
+            ) as executor:
+                while not self.stop_event.is_set():
+                    free_slots = self.concurrency - len(in_flight)
+                    if free_slots:
+                        try:
+                            jobs = claim_check_jobs(
+                                free_slots, self.job_timeout
+                            )
+                        except Exception as e:
+                            logger.error(
+                                f'Ошибка при обработке очереди: {str(e)}'
+                            )
+                            jobs = []
+                        in_flight.update(
+                            executor.submit(self._process, job)
+                            for job in jobs
+                        )
+                    if not in_flight:
+                        self.stop_event.wait(self.poll_interval)
+                        continue
+                    # Следующий захват - после завершения любой задачи
+                    # или через poll_interval, если очередь была пуста
+                    done, in_flight = wait(
+                        in_flight,
+                        timeout=self.poll_interval,
+                        return_when=FIRST_COMPLETED
+                    )
+                    self._collect(done)
+            self._collect(in_flight)
+        finally:
+            # Задачи завершаются после записи их проверок
+            self.writer.close()
+            self.writer = None
+        logger.info('Воркер проверок остановлен')
+
+    def stop(self) -> None:
+        """Остановка воркера после завершения текущих задач."""
+        self.stop_event.set()
+
+    @staticmethod
+    def _collect(futures: Iterable[Future]) -> None:
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f'Ошибка при обработке очереди: {str(e)}')
+
+    def _process(self, job: Any) -> None:
+        logger.info(f'Выполнение задачи {job.id} для URL ID {job.url_id}')
+        writer = self.writer
+
+        # Вызывается из потока записи, возможно, ещё до возврата из
+        # check_url: в буфер попадают только успешные проверки
+        def on_saved(error: Optional[BaseException]) -> None:
+            if error is None:
+                finish_check_job(job.id, True, SUCCESS_MESSAGE)
+            else:
+                finish_check_job(
+                    job.id, False, 'Не удалось сохранить проверку'
+                )
+
+        try:
+            result = CheckService.check_url(job.url_id, writer, on_saved)
+        except Exception as e:
+            logger.error(f'Ошибка при выполнении задачи {job.id}: {str(e)}')
+            result = {
+                'success': False,
+                'flash_message': 'Произошла ошибка при проверке'
+            }
+        if writer is None or not result['success']:
+            finish_check_job(
+                job.id, result['success'], result['flash_message']
+            )
@@ -31,6 +31,10 @@ def test_db(monkeypatch):
     reload(config_module)
     config_module.config.DATABASE_URL = db_url
 
+    # Приводим схему тестовой БД к актуальной версии
+    from page_analyzer.migrate import apply_migrations
+    apply_migrations()
+
     # Подключаемся для очистки таблиц
     conn = connect(db_url)
     conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
@@ -56,3 +60,21 @@ def test_db(monkeypatch):
     finally:
         cursor.close()
         conn.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_host_guard():
+    """Сброс ограничителей и предохранителей хостов между тестами."""
+    from page_analyzer.host_guard import host_guard
+    host_guard.reset()
+    yield
+    host_guard.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_render_cache():
+    """Очистка кэша отрисованных страниц между тестами."""
+    from page_analyzer.render_cache import render_cache
+    render_cache.clear()
+    yield
+    render_cache.clear()
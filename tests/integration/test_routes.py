@@ -1,5 +1,7 @@
 """Интеграционные тесты для Flask-роутов."""
 
+import importlib
+import io
 import pytest
 from unittest.mock import patch, Mock
 import requests
@@ -92,6 +94,54 @@ class TestCreateUrlRoute:
         assert response.status_code == 422
 
 
+class TestImportUrlsRoute:
+    """Тесты для роута POST /urls/import (массовый импорт)."""
+
+    def _upload(self, client, content, **kwargs):
+        return client.post(
+            '/urls/import',
+            data={'file': (io.BytesIO(content), 'urls.csv')},
+            content_type='multipart/form-data',
+            **kwargs
+        )
+
+    def test_import_csv(self, client):
+        """Тест импорта CSV-файла со статистикой для JSON-клиента."""
+        content = (
+            '\ufeffhttps://example.com/page,comment\n'
+            'https://example.com\n'
+            'not a url\n'
+            '\n'
+            '# комментарий\n'
+            'https://example.org\n'
+        ).encode()
+        response = self._upload(
+            client, content, headers={'Accept': 'application/json'}
+        )
+        assert response.status_code == 200
+        assert response.get_json() == {
+            'total': 4, 'inserted': 2, 'duplicates': 1, 'invalid': 1
+        }
+
+    def test_import_redirects_browser(self, client):
+        """Тест редиректа на список сайтов после импорта."""
+        client.post('/urls', data={'url': 'https://example.com'})
+        response = self._upload(
+            client, b'https://example.com\nhttps://example.org\n',
+            follow_redirects=True
+        )
+        assert response.status_code == 200
+        page = response.data.decode()
+        assert 'добавлено 1, уже были в списке 1' in page
+        assert 'https://example.org' in page
+
+    def test_import_without_file(self, client):
+        """Тест импорта без файла."""
+        response = client.post('/urls/import', data={})
+        assert response.status_code == 422
+        assert 'Выберите файл для импорта' in response.data.decode()
+
+
 class TestUrlsListRoute:
     """Тесты для роута GET /urls (список URL)."""
 
@@ -126,11 +176,11 @@ class TestUrlsListRoute:
         mock_response.history = []
         mock_response.content = b'<html><head><title>Test</title></head></html>'
         mock_response.iter_content.return_value = [
-            '<html><head><title>Test</title></head></html>'
+            b'<html><head><title>Test</title></head></html>'
         ]
 
-        with patch('page_analyzer.services.check_service.requests.Session') as mock_session:
-            mock_session.return_value.get.return_value = mock_response
+        with patch('page_analyzer.services.check_service.session_manager.get') as mock_get:
+            mock_get.return_value = mock_response
             # Выполняем проверку
             client.post(f'/urls/{url_id}/checks')
 
@@ -141,6 +191,44 @@ class TestUrlsListRoute:
         assert b'200' in response.data or b'example.com' in response.data
 
 
+    def test_urls_list_paginated(self, client):
+        """Тест постраничного вывода списка URL."""
+        for i in range(3):
+            client.post('/urls', data={'url': f'https://example{i}.com'})
+
+        response = client.get('/urls?limit=2')
+        assert response.status_code == 200
+        assert b'example2.com' in response.data
+        assert b'example1.com' in response.data
+        assert b'example0.com' not in response.data
+        assert b'after_id=' in response.data
+
+    def test_urls_list_next_and_prev_pages(self, client):
+        """Тест переходов вперёд и назад по страницам."""
+        ids = []
+        for i in range(3):
+            response = client.post(
+                '/urls', data={'url': f'https://example{i}.com'}
+            )
+            ids.append(int(response.location.split('/')[-1]))
+
+        response = client.get(f'/urls?after_id={ids[1]}&limit=2')
+        assert response.status_code == 200
+        assert b'example0.com' in response.data
+        assert b'example2.com' not in response.data
+        assert f'before_id={ids[0]}'.encode() in response.data
+
+        response = client.get(f'/urls?before_id={ids[0]}&limit=2')
+        assert b'example2.com' in response.data
+        assert b'example1.com' in response.data
+        assert b'example0.com' not in response.data
+
+    def test_urls_list_limit_is_bounded(self, client):
+        """Тест ограничения размера страницы сверху."""
+        response = client.get('/urls?limit=100000')
+        assert response.status_code == 200
+
+
 class TestGetUrlRoute:
     """Тесты для роута GET /urls/<id> (детали URL)."""
 
@@ -173,11 +261,11 @@ class TestGetUrlRoute:
         mock_response.history = []
         mock_response.content = b'<html><head><title>Test</title></head></html>'
         mock_response.iter_content.return_value = [
-            '<html><head><title>Test</title></head></html>'
+            b'<html><head><title>Test</title></head></html>'
         ]
 
-        with patch('page_analyzer.services.check_service.requests.Session') as mock_session:
-            mock_session.return_value.get.return_value = mock_response
+        with patch('page_analyzer.services.check_service.session_manager.get') as mock_get:
+            mock_get.return_value = mock_response
             # Выполняем проверку
             client.post(f'/urls/{url_id}/checks')
 
@@ -208,10 +296,10 @@ class TestAddUrlCheckRoute:
             '</head><body><h1>Test H1</h1></body></html>'
         )
         mock_response.content = html_content.encode()
-        mock_response.iter_content.return_value = [html_content]
+        mock_response.iter_content.return_value = [html_content.encode()]
 
-        with patch('page_analyzer.services.check_service.requests.Session') as mock_session:
-            mock_session.return_value.get.return_value = mock_response
+        with patch('page_analyzer.services.check_service.session_manager.get') as mock_get:
+            mock_get.return_value = mock_response
             response = client.post(f'/urls/{url_id}/checks')
             assert response.status_code == 302
             assert f'/urls/{url_id}' in response.location
@@ -235,13 +323,13 @@ class TestAddUrlCheckRoute:
         mock_response.headers = {'Content-Type': 'text/html'}
         mock_response.history = []
         mock_response.content = b'<html>Not Found</html>'
-        mock_response.iter_content.return_value = ['<html>Not Found</html>']
+        mock_response.iter_content.return_value = [b'<html>Not Found</html>']
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
             '404 Not Found', response=mock_response
         )
 
-        with patch('page_analyzer.services.check_service.requests.Session') as mock_session:
-            mock_session.return_value.get.return_value = mock_response
+        with patch('page_analyzer.services.check_service.session_manager.get') as mock_get:
+            mock_get.return_value = mock_response
             response = client.post(f'/urls/{url_id}/checks')
             # Проверка завершилась с ошибкой, но должна быть обработка
             assert response.status_code == 302
@@ -253,8 +341,8 @@ class TestAddUrlCheckRoute:
         url_id = response.location.split('/')[-1]
 
         # Создаем мок для ошибки подключения
-        with patch('page_analyzer.services.check_service.requests.Session') as mock_session:
-            mock_session.return_value.get.side_effect = requests.exceptions.ConnectionError(
+        with patch('page_analyzer.services.check_service.session_manager.get') as mock_get:
+            mock_get.side_effect = requests.exceptions.ConnectionError(
                 'Connection failed'
             )
             response = client.post(f'/urls/{url_id}/checks')
@@ -267,14 +355,95 @@ class TestAddUrlCheckRoute:
         url_id = response.location.split('/')[-1]
 
         # Создаем мок для таймаута
-        with patch('page_analyzer.services.check_service.requests.Session') as mock_session:
-            mock_session.return_value.get.side_effect = requests.exceptions.Timeout(
+        with patch('page_analyzer.services.check_service.session_manager.get') as mock_get:
+            mock_get.side_effect = requests.exceptions.Timeout(
                 'Request timeout'
             )
             response = client.post(f'/urls/{url_id}/checks')
             assert response.status_code == 302
 
 
+class TestAsyncCheckRoute:
+    """Тесты фоновых проверок (CHECKS_ASYNC)."""
+
+    @pytest.fixture(autouse=True)
+    def async_checks(self, monkeypatch):
+        from page_analyzer.app import config
+        monkeypatch.setattr(config, 'CHECKS_ASYNC', True)
+
+    def test_add_check_enqueues_job(self, client):
+        """Тест постановки проверки в очередь из формы."""
+        response = client.post('/urls', data={'url': 'https://example.com'})
+        url_id = response.location.split('/')[-1]
+
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get'
+        ) as mock_get:
+            response = client.post(f'/urls/{url_id}/checks')
+            mock_get.assert_not_called()
+        assert response.status_code == 302
+        assert f'/urls/{url_id}?job=' in response.location
+
+        response = client.get(response.location)
+        assert response.status_code == 200
+        assert b'job-status' in response.data
+
+    def test_add_check_json_returns_accepted(self, client):
+        """Тест ответа 202 Accepted для JSON-клиента."""
+        response = client.post('/urls', data={'url': 'https://example.com'})
+        url_id = response.location.split('/')[-1]
+
+        response = client.post(
+            f'/urls/{url_id}/checks',
+            headers={'Accept': 'application/json'}
+        )
+        assert response.status_code == 202
+        status_url = response.json['status_url']
+        assert response.headers['Location'].endswith(status_url)
+
+        response = client.get(status_url)
+        assert response.status_code == 200
+        assert response.json['status'] == 'queued'
+        assert response.json['finished'] is False
+
+    def test_job_status_after_worker(self, client):
+        """Тест состояния задачи после выполнения воркером."""
+        from page_analyzer.worker import CheckWorker
+        response = client.post('/urls', data={'url': 'https://example.com'})
+        url_id = response.location.split('/')[-1]
+        response = client.post(
+            f'/urls/{url_id}/checks',
+            headers={'Accept': 'application/json'}
+        )
+        status_url = response.json['status_url']
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {'Content-Type': 'text/html'}
+        mock_response.history = []
+        mock_response.iter_content.return_value = [b'<html></html>']
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get',
+            return_value=mock_response
+        ):
+            CheckWorker().run_once()
+
+        response = client.get(status_url)
+        assert response.json['status'] == 'done'
+        assert response.json['finished'] is True
+
+    def test_add_check_url_not_found(self, client):
+        """Тест постановки в очередь несуществующего URL."""
+        response = client.post('/urls/99999/checks')
+        assert response.status_code == 302
+        assert '/urls' in response.location
+
+    def test_job_not_found(self, client):
+        """Тест состояния несуществующей задачи."""
+        response = client.get('/checks/jobs/99999')
+        assert response.status_code == 404
+
+
 class TestFullCycle:
     """Тесты для полного цикла: добавление URL → проверка → просмотр результатов."""
 
@@ -296,10 +465,10 @@ class TestFullCycle:
             '</head><body><h1>Example H1</h1></body></html>'
         )
         mock_response.content = html_content.encode()
-        mock_response.iter_content.return_value = [html_content]
+        mock_response.iter_content.return_value = [html_content.encode()]
 
-        with patch('page_analyzer.services.check_service.requests.Session') as mock_session:
-            mock_session.return_value.get.return_value = mock_response
+        with patch('page_analyzer.services.check_service.session_manager.get') as mock_get:
+            mock_get.return_value = mock_response
             response = client.post(f'/urls/{url_id}/checks')
             assert response.status_code == 302
 
@@ -331,10 +500,10 @@ class TestFullCycle:
                 f'<body><h1>H1 {i}</h1></body></html>'
             )
             mock_response.content = html_content.encode()
-            mock_response.iter_content.return_value = [html_content]
+            mock_response.iter_content.return_value = [html_content.encode()]
 
-            with patch('page_analyzer.services.check_service.requests.Session') as mock_session:
-                mock_session.return_value.get.return_value = mock_response
+            with patch('page_analyzer.services.check_service.session_manager.get') as mock_get:
+                mock_get.return_value = mock_response
                 client.post(f'/urls/{url_id}/checks')
 
         # Просматриваем детали - должны быть все проверки
@@ -343,3 +512,294 @@ class TestFullCycle:
         # Проверяем наличие всех проверок
         assert b'Check' in response.data or b'H1' in response.data
 
+
+
+class TestRenderCache:
+    """Тесты для кэширования отрисованных страниц."""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, monkeypatch):
+        from page_analyzer.render_cache import render_cache
+        monkeypatch.setattr(render_cache, 'max_bytes', 1024 * 1024)
+        # Слушатель уведомлений проверяется в test_cache_listener
+        app_module = importlib.import_module('page_analyzer.app')
+        monkeypatch.setattr(app_module.config, 'RENDER_CACHE_LISTEN', False)
+        return render_cache
+
+    def test_urls_list_cached(self, client, enable_cache):
+        """Тест повторной отдачи списка URL из кэша."""
+        client.post('/urls', data={'url': 'https://example.com'})
+        client.get('/urls')
+        with patch('page_analyzer.app.URLService.get_all_urls') as mock_get:
+            response = client.get('/urls')
+            mock_get.assert_not_called()
+        assert response.status_code == 200
+        assert b'example.com' in response.data
+        assert enable_cache.stats()['hits'] == 1
+
+    def test_urls_list_invalidated_on_create(self, client):
+        """Тест обновления списка URL после добавления URL."""
+        client.post('/urls', data={'url': 'https://example.com'})
+        assert b'example.com' in client.get('/urls').data
+
+        client.post('/urls', data={'url': 'https://example.org'})
+        assert b'example.org' in client.get('/urls').data
+
+    def test_url_details_invalidated_on_check(self, client):
+        """Тест обновления страницы URL и списка после проверки."""
+        response = client.post('/urls', data={'url': 'https://example.com'})
+        url_id = response.location.split('/')[-1]
+        assert b'Cached Title' not in client.get(f'/urls/{url_id}').data
+        client.get('/urls')
+
+        html = b'<html><head><title>Cached Title</title></head></html>'
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {'Content-Type': 'text/html'}
+        mock_response.history = []
+        mock_response.iter_content.return_value = [html]
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get'
+        ) as mock_get:
+            mock_get.return_value = mock_response
+            client.post(f'/urls/{url_id}/checks')
+
+        assert b'Cached Title' in client.get(f'/urls/{url_id}').data
+
+    def test_missing_url_not_cached(self, client):
+        """Тест, что страница несуществующего URL не кэшируется."""
+        assert client.get('/urls/999999').status_code == 404
+        assert client.get('/urls/999999').status_code == 404
+
+    def test_flash_not_cached(self, client):
+        """Тест, что flash-сообщения не попадают в кэш."""
+        response = client.post('/urls', data={'url': 'https://example.com'})
+        url_id = response.location.split('/')[-1]
+        assert 'Страница успешно добавлена' in (
+            client.get(f'/urls/{url_id}').get_data(as_text=True)
+        )
+        assert 'Страница успешно добавлена' not in (
+            client.get(f'/urls/{url_id}').get_data(as_text=True)
+        )
+
+
+class TestConditionalResponses:
+    """Тесты для условных ответов (ETag / 304)."""
+
+    @staticmethod
+    def _check(client, url_id, title='Title'):
+        html = f'<html><head><title>{title}</title></head></html>'.encode()
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {'Content-Type': 'text/html'}
+        mock_response.history = []
+        mock_response.iter_content.return_value = [html]
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get'
+        ) as mock_get:
+            mock_get.return_value = mock_response
+            client.post(f'/urls/{url_id}/checks')
+        # Flash-сообщение о проверке показывается на следующей странице
+        client.get(f'/urls/{url_id}')
+
+    @staticmethod
+    def _add_url(client, url='https://example.com'):
+        response = client.post('/urls', data={'url': url})
+        url_id = response.location.split('/')[-1]
+        client.get(f'/urls/{url_id}')
+        return url_id
+
+    def test_urls_list_not_modified(self, client):
+        """Тест ответа 304 без запроса страницы списка."""
+        self._add_url(client)
+        response = client.get('/urls')
+        etag = response.headers['ETag']
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+        with patch('page_analyzer.app.URLService.get_all_urls') as mock_get:
+            response = client.get('/urls', headers={'If-None-Match': etag})
+            mock_get.assert_not_called()
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert response.data == b''
+
+    def test_urls_list_modified_after_changes(self, client):
+        """Тест смены ETag списка после добавления URL и проверки."""
+        url_id = self._add_url(client)
+        first = client.get('/urls').headers['ETag']
+
+        self._add_url(client, 'https://example.org')
+        response = client.get('/urls', headers={'If-None-Match': first})
+        assert response.status_code == 200
+        assert b'example.org' in response.data
+        second = response.headers['ETag']
+
+        self._check(client, url_id)
+        response = client.get('/urls', headers={'If-None-Match': second})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != second
+
+    def test_url_details_not_modified(self, client):
+        """Тест ответа 304 без запроса проверок URL."""
+        url_id = self._add_url(client)
+        etag = client.get(f'/urls/{url_id}').headers['ETag']
+
+        with patch(
+            'page_analyzer.app.URLService.get_url_checks'
+        ) as mock_checks:
+            response = client.get(
+                f'/urls/{url_id}', headers={'If-None-Match': etag}
+            )
+            mock_checks.assert_not_called()
+        assert response.status_code == 304
+
+    def test_url_details_modified_after_check(self, client):
+        """Тест смены ETag страницы URL после проверки."""
+        url_id = self._add_url(client)
+        other_id = self._add_url(client, 'https://example.org')
+        etag = client.get(f'/urls/{url_id}').headers['ETag']
+        other_etag = client.get(f'/urls/{other_id}').headers['ETag']
+
+        self._check(client, url_id, title='Fresh Title')
+        response = client.get(
+            f'/urls/{url_id}', headers={'If-None-Match': etag}
+        )
+        assert response.status_code == 200
+        assert b'Fresh Title' in response.data
+        # Проверка другого URL не меняет версию страницы
+        response = client.get(
+            f'/urls/{other_id}', headers={'If-None-Match': other_etag}
+        )
+        assert response.status_code == 304
+
+    def test_no_etag_with_flash(self, client):
+        """Тест, что страница с flash-сообщением не получает ETag."""
+        response = client.post('/urls', data={'url': 'https://example.com'})
+        url_id = response.location.split('/')[-1]
+        response = client.get(f'/urls/{url_id}')
+        assert 'Страница успешно добавлена' in response.get_data(as_text=True)
+        assert 'ETag' not in response.headers
+        assert 'ETag' in client.get(f'/urls/{url_id}').headers
+
+    def test_no_etag_for_missing_url(self, client):
+        """Тест страницы несуществующего URL."""
+        response = client.get('/urls/999999', headers={'If-None-Match': '*'})
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
+
+    def test_no_etag_for_job_status(self, client):
+        """Тест, что страница состояния фоновой проверки не получает ETag."""
+        url_id = self._add_url(client)
+        response = client.get(f'/urls/{url_id}?job=1')
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+
+    def test_disabled(self, client, monkeypatch):
+        """Тест отключения условных ответов."""
+        app_module = importlib.import_module('page_analyzer.app')
+        monkeypatch.setattr(app_module.config, 'CONDITIONAL_RESPONSES', False)
+        self._add_url(client)
+        assert 'ETag' not in client.get('/urls').headers
+
+
+class TestStreamingUrlsList:
+    """Тесты для потокового вывода всего списка URL."""
+
+    def test_stream_all_urls(self, client, monkeypatch):
+        """Тест вывода всех URL без постраничного разбиения."""
+        from page_analyzer.db import import_urls
+        monkeypatch.setattr(
+            'page_analyzer.services.url_service.config.URLS_STREAM_BATCH_SIZE',
+            7
+        )
+        import_urls([f'https://example{i}.com' for i in range(120)])
+
+        response = client.get('/urls?all=1')
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert 'ETag' in response.headers
+        html = response.get_data(as_text=True)
+        positions = [
+            html.index(f'title="https://example{i}.com"')
+            for i in (119, 60, 0)
+        ]
+        assert positions == sorted(positions)
+        assert html.count('<tr>') == 121
+        assert 'Вперёд' not in html
+
+    def test_stream_empty(self, client):
+        """Тест потокового вывода пустого списка."""
+        response = client.get('/urls?all=1')
+        assert response.status_code == 200
+        assert 'Нет добавленных сайтов' in response.get_data(as_text=True)
+
+    def test_stream_consumes_flash(self, client):
+        """Тест, что flash-сообщение показывается один раз."""
+        client.post('/urls/import', data={
+            'file': (io.BytesIO(b'https://example.com\n'), 'urls.csv')
+        }, content_type='multipart/form-data')
+        assert 'Импорт завершён' in (
+            client.get('/urls?all=1').get_data(as_text=True)
+        )
+        assert 'Импорт завершён' not in (
+            client.get('/urls?all=1').get_data(as_text=True)
+        )
+
+    def test_stream_disconnect_releases_connection(self, client):
+        """Тест освобождения подключения при обрыве вывода."""
+        client.post('/urls', data={'url': 'https://example.com'})
+        response = client.get('/urls?all=1', buffered=False)
+        next(response.response)
+        response.close()
+        assert b'example.com' in client.get('/urls').data
+
+
+class TestExportRoute:
+    """Тесты для роута GET /checks/export."""
+
+    @pytest.fixture
+    def checks(self, client):
+        from page_analyzer.db import add_check, add_url
+        url_id = add_url('https://example.com')
+        add_check({'url_id': url_id, 'status_code': 200, 'title': 'Пример'})
+        add_check({'url_id': url_id, 'status_code': 503})
+        return url_id
+
+    def test_export_csv(self, client, checks):
+        """Тест потоковой выгрузки в CSV."""
+        response = client.get('/checks/export')
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'text/csv'
+        assert 'checks.csv' in response.headers['Content-Disposition']
+        lines = response.get_data(as_text=True).splitlines()
+        assert lines[0].startswith('url_id,url,check_id,status_code')
+        assert len(lines) == 3
+        assert 'Пример' in lines[1]
+
+    def test_export_ndjson_with_status(self, client, checks):
+        """Тест выгрузки в NDJSON с фильтром по коду ответа."""
+        response = client.get('/checks/export?format=ndjson&status=503')
+        assert response.mimetype == 'application/x-ndjson'
+        lines = response.get_data(as_text=True).splitlines()
+        assert len(lines) == 1
+        assert '"status_code": 503' in lines[0]
+
+    def test_export_date_range(self, client, checks):
+        """Тест выгрузки за период без проверок."""
+        response = client.get(
+            '/checks/export?format=ndjson&since=2000-01-01&until=2000-01-31'
+        )
+        assert response.status_code == 200
+        assert response.data == b''
+
+    @pytest.mark.parametrize('query', [
+        'format=xml',
+        'since=yesterday',
+        'status=abc',
+    ])
+    def test_export_invalid(self, client, query):
+        """Тест некорректных параметров выгрузки."""
+        response = client.get(f'/checks/export?{query}')
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
@@ -0,0 +1,200 @@
+"""Тесты для асинхронного движка пакетной проверки."""
+
+import asyncio
+import threading
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pytest
+from page_analyzer.cli import main
+from page_analyzer.config import config
+from page_analyzer.db import add_url, get_checks_by_url_id
+from page_analyzer.http_client import session_manager
+from page_analyzer.services import AsyncCheckService, CheckService
+from page_analyzer.services.check_service import StreamingBody
+
+pytest.importorskip('httpx')
+
+Url = namedtuple('Url', 'id name')
+Check = namedtuple(
+    'Check',
+    'id h1 title description status_code etag last_modified body_hash'
+)
+
+PAGE = (
+    '<html><head><title>Тест</title>'
+    '<meta name="description" content="Описание"></head>'
+    '<body><h1>Заголовок</h1>' + '<p>текст</p>' * 500 + '</body></html>'
+)
+
+
+class PagesHandler(BaseHTTPRequestHandler):
+    """Обработчик с набором страниц для сравнения движков."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/redirect':
+            return self._send(302, b'', Location='/page')
+        if self.path == '/loop':
+            return self._send(302, b'', Location='/loop')
+        if self.path == '/missing':
+            return self._send(404, b'not found')
+        if self.path == '/huge':
+            return self._send(200, b'x' * 64)
+        if self.path == '/cp1251':
+            return self._send(
+                200, PAGE.encode('cp1251'),
+                content_type='text/html; charset=windows-1251'
+            )
+        if self.headers.get('If-None-Match') == '"v1"':
+            return self._send(304, b'', ETag='"v1"')
+        self._send(200, PAGE.encode(), ETag='"v1"')
+
+    def _send(self, status, body, content_type='text/html; charset=utf-8',
+              **headers):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    """Фикстура локального HTTP-сервера, возвращающая его адрес."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PagesHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    session_manager.shutdown()
+
+
+def _run_async_check(url, previous=None):
+    """Проверка URL асинхронным движком."""
+    async def check():
+        async with AsyncCheckService.create_client(10) as client:
+            return await AsyncCheckService.run_check(client, url, previous)
+    return asyncio.run(check())
+
+
+def _comparable(result):
+    """Результат проверки без времени выполнения."""
+    result = dict(result)
+    if 'metrics' in result:
+        result['metrics'] = dict(
+            result['metrics'], elapsed=None, host_wait=None
+        )
+    return result
+
+
+class TestAsyncRunCheck:
+    """Сравнение результатов асинхронного и синхронного движков."""
+
+    @pytest.mark.parametrize('streaming', [True, False])
+    @pytest.mark.parametrize('path', [
+        '/page', '/redirect', '/loop', '/missing', '/cp1251',
+    ])
+    def test_same_result_as_sync(self, base_url, monkeypatch, path,
+                                 streaming):
+        """Тест совпадения результатов с CheckService.run_check."""
+        monkeypatch.setattr(config, 'STREAMING_PARSE', streaming)
+        monkeypatch.setattr(config, 'MAX_REDIRECTS', 3)
+        url = Url(1, base_url + path)
+        expected = CheckService.run_check(url)
+        assert _comparable(_run_async_check(url)) == _comparable(expected)
+
+    @pytest.mark.parametrize('streaming', [True, False])
+    def test_parses_outside_event_loop(self, base_url, monkeypatch,
+                                       streaming):
+        """Тест разбора страницы вне потока цикла событий."""
+        monkeypatch.setattr(config, 'STREAMING_PARSE', streaming)
+        threads = []
+        feed = StreamingBody.feed
+        complete = CheckService._complete_body
+
+        def record_feed(self, chunk):
+            threads.append(threading.current_thread())
+            return feed(self, chunk)
+
+        def record_complete(body, previous):
+            threads.append(threading.current_thread())
+            return complete(body, previous)
+
+        monkeypatch.setattr(StreamingBody, 'feed', record_feed)
+        monkeypatch.setattr(
+            CheckService, '_complete_body', staticmethod(record_complete)
+        )
+        result = _run_async_check(Url(1, base_url + '/page'))
+        assert result['data']['h1'] == 'Заголовок'
+        assert threads
+        assert threading.main_thread() not in threads
+
+    def test_response_size_limit(self, base_url, monkeypatch):
+        """Тест ограничения размера ответа."""
+        monkeypatch.setattr(config, 'MAX_RESPONSE_SIZE', 10)
+        result = _run_async_check(Url(1, base_url + '/huge'))
+        assert result['flash_message'] == 'Размер ответа слишком большой'
+
+    def test_not_modified(self, base_url):
+        """Тест повторной проверки с ответом 304."""
+        previous = Check(7, 'H', 'T', 'D', 200, '"v1"', None, 'abc')
+        url = Url(1, base_url + '/page')
+        result = _run_async_check(url, previous)
+        assert result['data']['h1'] == 'H'
+        assert result['metrics']['unchanged']
+        assert result == CheckService.run_check(url, previous)
+
+    def test_connection_error(self):
+        """Тест ошибки подключения."""
+        result = _run_async_check(Url(1, 'http://127.0.0.1:1/'))
+        assert result['flash_message'] == 'Не удалось подключиться к серверу'
+
+
+class TestAsyncCheckService:
+    """Тесты для класса AsyncCheckService."""
+
+    def test_run_saves_checks(self, test_db, base_url):
+        """Тест проверки и сохранения набора URL."""
+        paths = ['/page', '/cp1251', '/missing'] * 5
+        urls = [
+            Url(add_url(f'{base_url}{path}?n={i}'), f'{base_url}{path}')
+            for i, path in enumerate(paths)
+        ]
+        stats = AsyncCheckService(concurrency=4, per_host=2).run(urls)
+        assert stats['total'] == 15
+        assert stats['succeeded'] == stats['saved'] == 10
+        assert stats['failed'] == 5
+        assert get_checks_by_url_id(urls[0].id)[0].h1 == 'Заголовок'
+
+    def test_saturated_host_does_not_hold_slots(self):
+        """Тест проверки другого хоста, пока URL занятого хоста ждут."""
+        urls = [Url(i, f'https://busy.com/{i}') for i in range(3)]
+        urls.append(Url(3, 'https://free.com/'))
+        started = []
+
+        async def run_check(client, url, previous=None):
+            started.append(url.name)
+            await asyncio.sleep(0.05)
+            return {'success': False}
+
+        with patch.object(
+            AsyncCheckService, 'run_check', staticmethod(run_check)
+        ), patch.object(CheckService, 'get_previous_check', return_value=None):
+            stats = AsyncCheckService(concurrency=2, per_host=1).run(urls)
+        assert stats['failed'] == 4
+        assert started[:2] == ['https://busy.com/0', 'https://free.com/']
+
+    def test_check_all_async_engine(self, test_db, base_url, capsys):
+        """Тест выбора асинхронного движка в команде check-all."""
+        url_id = add_url(base_url + '/page')
+        assert main(['check-all', '--engine', 'async']) == 0
+        assert 'Проверено URL: 1' in capsys.readouterr().out
+        assert get_checks_by_url_id(url_id)[0].title == 'Тест'
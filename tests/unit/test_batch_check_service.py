@@ -0,0 +1,170 @@
+"""Тесты для сервиса пакетной проверки URL."""
+
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pytest
+from page_analyzer.cli import main
+from page_analyzer.db import (
+    add_url,
+    get_all_urls,
+    get_checks_by_url_id,
+    get_urls_for_check,
+)
+from page_analyzer.http_client import session_manager
+from page_analyzer.parse_pool import parse_pool
+from page_analyzer.services import BatchCheckService
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Обработчик-заглушка, отдающий страницу с задержкой."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(server.delay)
+        port = self.server.server_address[1]
+        body = (
+            f'<html><head><title>Stub {port}</title></head>'
+            f'<body><h1>H1</h1></body></html>'
+        ).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Фикстура локального HTTP-сервера."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.lock = threading.Lock()
+    server.active = 0
+    server.max_active = 0
+    server.delay = 0.05
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    session_manager.shutdown()
+
+
+def _stub_urls(server, count):
+    """Добавление URL, указывающих на сервер-заглушку."""
+    port = server.server_address[1]
+    # Разные имена одного хоста: схема и хост совпадают, отличается путь
+    return [add_url(f'http://127.0.0.1:{port}/{i}') for i in range(count)]
+
+
+class TestBatchCheckService:
+    """Тесты для класса BatchCheckService."""
+
+    def test_invalid_parameters(self):
+        """Тест ошибки при неположительных параметрах."""
+        with pytest.raises(ValueError):
+            BatchCheckService(concurrency=0)
+
+    def test_checks_and_saves_all_urls(self, test_db, stub_server):
+        """Тест проверки и сохранения результатов всех URL."""
+        ids = _stub_urls(stub_server, 5)
+        stats = BatchCheckService(concurrency=5, per_host=5,
+                                  batch_size=2).run(get_urls_for_check())
+
+        assert stats['total'] == 5
+        assert stats['succeeded'] == 5
+        assert stats['saved'] == 5
+        assert stats['throughput'] > 0
+        assert stats['latency_max'] >= stats['latency_p50'] > 0
+        for url_id in ids:
+            checks = get_checks_by_url_id(url_id)
+            assert len(checks) == 1
+            assert checks[0].h1 == 'H1'
+        assert all(url.status_code == 200 for url in get_all_urls())
+
+    def test_per_host_limit(self, test_db, stub_server):
+        """Тест ограничения одновременных проверок одного хоста."""
+        _stub_urls(stub_server, 6)
+        BatchCheckService(concurrency=6, per_host=2).run(
+            get_urls_for_check()
+        )
+        assert stub_server.max_active <= 2
+
+    def test_saturated_host_does_not_block_threads(self):
+        """Тест проверки другого хоста, пока URL занятого хоста ждут."""
+        Url = namedtuple('Url', 'id name')
+        urls = [Url(i, f'https://busy.com/{i}') for i in range(3)]
+        urls.append(Url(3, 'https://free.com/'))
+        started = []
+
+        def run_check(url, previous=None):
+            started.append(url.name)
+            time.sleep(0.05)
+            return {'success': False}
+
+        with patch(
+            'page_analyzer.services.batch_check_service.CheckService'
+        ) as check_service:
+            check_service.get_previous_check.return_value = None
+            check_service.run_check.side_effect = run_check
+            stats = BatchCheckService(concurrency=2, per_host=1).run(urls)
+        assert stats['failed'] == 4
+        assert started[:2] == ['https://busy.com/0', 'https://free.com/']
+
+    def test_failed_checks_not_saved(self, test_db, stub_server):
+        """Тест подсчёта неуспешных проверок."""
+        _stub_urls(stub_server, 1)
+        dead_id = add_url('http://127.0.0.1:1')
+        stats = BatchCheckService().run(get_urls_for_check())
+        assert stats['succeeded'] == 1
+        assert stats['failed'] == 1
+        assert get_checks_by_url_id(dead_id) == []
+
+    def test_empty_input(self, test_db):
+        """Тест пакетной проверки пустого набора URL."""
+        stats = BatchCheckService().run([])
+        assert stats['total'] == 0
+        assert stats['throughput'] == 0
+
+
+class TestCheckAllCommand:
+    """Тесты для команды check-all."""
+
+    def test_check_selected_ids(self, test_db, stub_server, capsys):
+        """Тест проверки только выбранных URL."""
+        ids = _stub_urls(stub_server, 3)
+        assert main(['check-all', '--ids', str(ids[0])]) == 0
+        assert 'Проверено URL: 1' in capsys.readouterr().out
+        assert len(get_checks_by_url_id(ids[0])) == 1
+        assert get_checks_by_url_id(ids[1]) == []
+
+    def test_check_unchecked_only(self, test_db, stub_server):
+        """Тест проверки только непроверенных URL."""
+        ids = _stub_urls(stub_server, 2)
+        main(['check-all', '--ids', str(ids[0])])
+        main(['check-all', '--unchecked'])
+        assert len(get_checks_by_url_id(ids[0])) == 1
+        assert len(get_checks_by_url_id(ids[1])) == 1
+
+    def test_parse_in_process_pool(self, test_db, stub_server):
+        """Тест пакетной проверки с разбором в пуле процессов."""
+        ids = _stub_urls(stub_server, 3)
+        try:
+            assert main(['check-all', '--parse-workers', '2']) == 0
+            assert parse_pool.enabled
+        finally:
+            parse_pool.configure(0)
+        for url_id in ids:
+            assert get_checks_by_url_id(url_id)[0].h1 == 'H1'
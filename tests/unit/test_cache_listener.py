@@ -0,0 +1,270 @@
+"""Тесты для инвалидации кэшей по уведомлениям PostgreSQL."""
+
+import select
+import threading
+import time
+import pytest
+from psycopg2 import connect
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from page_analyzer.cache_listener import (
+    CHANNEL,
+    InvalidationListener,
+    parse_payload,
+)
+from page_analyzer.db import (
+    DatabaseConnection,
+    add_check,
+    add_checks,
+    add_url,
+    backfill_latest_checks,
+    claim_due_urls,
+    import_urls,
+    set_check_schedule,
+    upsert_url,
+)
+from page_analyzer.render_cache import URLS_TAG, RenderCache, url_tag
+
+
+@pytest.fixture
+def notifications(test_db):
+    """Фикстура подключения, подписанного на канал уведомлений."""
+    connection = connect(test_db)
+    connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    with connection.cursor() as cursor:
+        cursor.execute(f'LISTEN {CHANNEL}')
+
+    def receive(timeout=2.0):
+        payloads = []
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if select.select([connection], [], [], 0.1)[0]:
+                connection.poll()
+                payloads.extend(n.payload for n in connection.notifies)
+                connection.notifies.clear()
+            elif payloads:
+                break
+        return payloads
+
+    yield receive
+    connection.close()
+
+
+class RecordingHandler:
+    """Обработчик изменений, запоминающий вызовы."""
+
+    def __init__(self):
+        self.calls = []
+        # Вызовы для изменений, не видных в списке URL
+        self.details = []
+        self.changed = threading.Condition()
+
+    def __call__(self, url_ids, list_changed):
+        with self.changed:
+            if list_changed:
+                self.calls.append(url_ids)
+            else:
+                self.details.append(url_ids)
+            self.changed.notify_all()
+
+    def wait_for(self, predicate, timeout=5.0):
+        with self.changed:
+            return self.changed.wait_for(
+                lambda: any(predicate(call) for call in self.calls), timeout
+            )
+
+
+@pytest.fixture
+def listener(test_db):
+    """Фикстура запущенного слушателя с записью вызовов обработчика."""
+    handler = RecordingHandler()
+    listener = InvalidationListener(
+        handler, poll_timeout=0.1, reconnect_delay=0.1
+    )
+    listener.ensure_started()
+    assert listener.ready.wait(5)
+    yield listener
+    listener.stop(timeout=5)
+
+
+class TestParsePayload:
+    """Тесты для parse_payload."""
+
+    def test_ids(self):
+        assert parse_payload('3,1,2') == [3, 1, 2]
+
+    def test_all(self):
+        assert parse_payload('*') is None
+
+    def test_invalid(self):
+        assert parse_payload('abc') is None
+
+
+class TestTriggers:
+    """Тесты для триггеров уведомлений об изменениях."""
+
+    def test_add_url_notifies(self, notifications):
+        """Тест уведомления о добавлении URL."""
+        url_id = add_url('https://example.com')
+        assert notifications() == [str(url_id)]
+
+    def test_add_check_notifies_once(self, notifications):
+        """Тест одного уведомления на транзакцию с проверкой."""
+        url_id = add_url('https://example.com')
+        notifications()
+        add_check({'url_id': url_id, 'status_code': 200})
+        assert notifications() == [str(url_id)]
+
+    def test_batch_notifies_per_statement(self, notifications):
+        """Тест уведомления на запрос, а не на каждую строку."""
+        import_urls([f'https://example{i}.com' for i in range(50)])
+        payloads = notifications()
+        assert len(payloads) == 1
+        assert len(payloads[0].split(',')) == 50
+
+        ids = [int(url_id) for url_id in payloads[0].split(',')[:3]]
+        add_checks([{'url_id': url_id, 'status_code': 200} for url_id in ids])
+        changed = set()
+        for payload in notifications():
+            changed.update(int(url_id) for url_id in payload.split(','))
+        assert changed == set(ids)
+
+    def test_upsert_existing_url_does_not_notify(self, notifications):
+        """Тест отсутствия уведомления при повторном добавлении URL."""
+        upsert_url('https://example.com')
+        notifications()
+        upsert_url('https://example.com')
+        assert notifications(timeout=0.5) == []
+
+    def test_schedule_notifies_details(self, notifications):
+        """Тест уведомления только для страниц при смене расписания."""
+        url_id = add_url('https://example.com')
+        notifications()
+        set_check_schedule(3600)
+        assert notifications() == [f'details:{url_id}']
+        with DatabaseConnection() as cursor:
+            cursor.execute(
+                "UPDATE urls SET next_check_at = now() - interval '1 minute'"
+            )
+        notifications()
+        claim_due_urls(10)
+        assert notifications() == [f'details:{url_id}']
+
+    def test_backfill_notifies(self, notifications):
+        """Тест уведомления при пересчёте сводки о последней проверке."""
+        url_id = add_url('https://example.com')
+        add_check({'url_id': url_id, 'status_code': 200})
+        with DatabaseConnection() as cursor:
+            cursor.execute('UPDATE urls SET last_check_id = NULL, '
+                           'last_check_status_code = NULL, '
+                           'last_check_at = NULL')
+        notifications()
+        assert backfill_latest_checks() == 1
+        assert notifications() == [str(url_id)]
+
+    def test_large_change_notifies_all(self, notifications):
+        """Тест уведомления '*', если список ID слишком длинный."""
+        import_urls([f'https://example{i}.com' for i in range(2000)])
+        assert notifications() == ['*']
+
+
+class TestInvalidationListener:
+    """Тесты для InvalidationListener."""
+
+    def test_resets_after_connect(self, listener):
+        """Тест сброса кэша после подключения."""
+        assert listener.handler.calls[0] is None
+
+    def test_receives_changes(self, listener):
+        """Тест передачи ID изменившихся URL обработчику."""
+        url_id = add_url('https://example.com')
+        assert listener.handler.wait_for(lambda call: call == [url_id])
+
+    def test_receives_details_changes(self, listener):
+        """Тест передачи изменений, не видных в списке URL, отдельно."""
+        url_id = add_url('https://example.com')
+        assert listener.handler.wait_for(lambda call: call == [url_id])
+        listener.handler.calls.clear()
+        set_check_schedule(3600)
+        with listener.handler.changed:
+            assert listener.handler.changed.wait_for(
+                lambda: listener.handler.details == [[url_id]], 5
+            )
+        assert listener.handler.calls == []
+
+    def test_reconnects(self, listener, test_db):
+        """Тест переподключения и сброса кэша после разрыва."""
+        listener.handler.calls.clear()
+        connection = connect(test_db)
+        connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT pg_terminate_backend(pid)
+                    FROM pg_stat_activity
+                    WHERE query = %s AND pid <> pg_backend_pid()
+                """, (f'LISTEN {CHANNEL}', ))
+        finally:
+            connection.close()
+
+        assert listener.handler.wait_for(lambda call: call is None)
+        assert listener.ready.wait(5)
+        url_id = add_url('https://example.com')
+        assert listener.handler.wait_for(lambda call: call == [url_id])
+
+    def test_ensure_started_once(self, listener):
+        """Тест, что повторный запуск не создаёт второй поток."""
+        thread = listener._thread
+        listener.ensure_started()
+        assert listener._thread is thread
+
+    def test_invalidates_render_cache(self, test_db, monkeypatch):
+        """Тест инвалидации кэша страниц изменением из другого процесса."""
+        cache = RenderCache(max_bytes=10000)
+        monkeypatch.setattr(
+            'page_analyzer.cache_listener.render_cache', cache
+        )
+        listener = InvalidationListener(poll_timeout=0.1)
+        listener.ensure_started()
+        try:
+            assert listener.ready.wait(5)
+            cache.get_or_render('/urls', [URLS_TAG], lambda: 'old')
+            cache.get_or_render('/urls/0', [url_tag(0)], lambda: 'old')
+
+            # Запись в обход сервисов, как из другого воркера: метки
+            # списка и страницы URL
+            url_id = _wait_invalidations(
+                cache, 2, lambda: add_url('https://example.com')
+            )
+            assert cache.get_or_render(
+                '/urls', [URLS_TAG], lambda: 'new'
+            ) == 'new'
+            assert cache.get_or_render(
+                '/urls/0', [url_tag(0)], lambda: 'new'
+            ) == 'old'
+
+            # Смена расписания сбрасывает только страницу URL
+            cache.get_or_render(
+                f'/urls/{url_id}', [url_tag(url_id)], lambda: 'old'
+            )
+            _wait_invalidations(
+                cache, 1, lambda: set_check_schedule(3600, ids=[url_id])
+            )
+            assert cache.get_or_render(
+                f'/urls/{url_id}', [url_tag(url_id)], lambda: 'new'
+            ) == 'new'
+            assert cache.get_or_render(
+                '/urls', [URLS_TAG], lambda: 'newer'
+            ) == 'new'
+        finally:
+            listener.stop(timeout=5)
+
+
+def _wait_invalidations(cache, count, write):
+    """Выполнение записи и ожидание указанного числа инвалидаций."""
+    expected = cache.stats()['invalidations'] + count
+    result = write()
+    deadline = time.monotonic() + 5
+    while cache.stats()['invalidations'] < expected:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    return result
@@ -0,0 +1,293 @@
+"""Тесты для сервиса проверки страниц."""
+
+import threading
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+import pytest
+from page_analyzer.db import add_url, get_checks_by_url_id
+from page_analyzer.http_client import session_manager
+from page_analyzer.services.check_service import CheckService, config
+
+PAGE = (
+    b'<title>T</title><meta name="description" content="D"><h1>H1</h1>'
+)
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    """Обработчик, поддерживающий условные запросы по ETag."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.conditions.append(self.headers.get('If-None-Match'))
+        if server.etag and self.headers.get('If-None-Match') == server.etag:
+            self.send_response(304)
+            self.send_header('ETag', server.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(server.body)))
+        if server.etag:
+            self.send_header('ETag', server.etag)
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def page_server():
+    """Фикстура локального HTTP-сервера с поддержкой ETag."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ConditionalHandler)
+    server.etag = '"v1"'
+    server.body = PAGE
+    server.conditions = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    session_manager.shutdown()
+
+
+def _response(chunks, content_type='text/html'):
+    """Создание мока ответа, отдающего тело порциями."""
+    response = Mock()
+    response.headers = {'Content-Type': content_type}
+    response.iter_content.return_value = chunks
+    return response
+
+
+class TestReadResponseContent:
+    """Тесты чтения тела ответа."""
+
+    @pytest.fixture(autouse=True)
+    def small_limit(self, monkeypatch):
+        monkeypatch.setattr(config, 'MAX_RESPONSE_SIZE', 10)
+
+    def test_reads_all_chunks(self):
+        """Тест чтения тела из нескольких порций."""
+        body = CheckService._read_response_content(
+            _response([b'<b>', b'Hi', b'</b>']), 'url'
+        )
+        assert body['content'] == '<b>Hi</b>'
+        assert body['bytes_read'] == 9
+
+    def test_limit_is_exact_in_bytes(self):
+        """Тест точного ограничения размера в байтах."""
+        assert CheckService._read_response_content(
+            _response([b'12345', b'67890']), 'url'
+        )['bytes_read'] == 10
+        assert CheckService._read_response_content(
+            _response([b'12345', b'678901']), 'url'
+        ) is None
+
+    def test_limit_counts_bytes_not_characters(self):
+        """Тест подсчёта байт, а не символов, для многобайтных кодировок."""
+        # 6 символов кириллицы занимают 12 байт в UTF-8
+        assert CheckService._read_response_content(
+            _response(['привет'.encode()]), 'url'
+        ) is None
+
+    def test_metrics(self):
+        """Тест метрик чтения."""
+        body = CheckService._read_response_content(
+            _response([b'abc']), 'url'
+        )
+        assert body['bytes_read'] == 3
+        assert body['elapsed'] >= 0
+
+    def test_read_error(self):
+        """Тест ошибки при чтении тела ответа."""
+        response = _response([])
+        response.iter_content.side_effect = IOError('reset')
+        assert CheckService._read_response_content(response, 'url') is None
+
+
+class TestStreamResponseData:
+    """Тесты потокового разбора тела ответа."""
+
+    def test_stops_reading_when_fields_found(self):
+        """Тест прекращения чтения после нахождения всех полей."""
+        consumed = []
+
+        def chunks():
+            yield b'<title>T</title><meta name="description" content="D">'
+            yield b'<h1>H1</h1>'
+            for i in range(100):
+                consumed.append(i)
+                yield b'<p>tail</p>' * 100
+
+        body = CheckService._stream_response_data(
+            _response(chunks(), 'text/html; charset=utf-8'), 'url'
+        )
+        assert body['data'] == {'title': 'T', 'description': 'D', 'h1': 'H1'}
+        assert body['stopped_early']
+        assert consumed == []
+
+    def test_reads_to_end_without_all_fields(self):
+        """Тест чтения всего тела, если поля не найдены."""
+        body = CheckService._stream_response_data(
+            _response([b'<title>T</title>', b'<p>no h1</p>']), 'url'
+        )
+        assert body['data']['title'] == 'T'
+        assert not body['stopped_early']
+        assert body['bytes_read'] == 28
+
+    def test_multibyte_character_split_between_chunks(self):
+        """Тест декодирования символа, разделённого между порциями."""
+        html = '<h1>Привет</h1>'.encode()
+        body = CheckService._stream_response_data(
+            _response([html[:6], html[6:]], 'text/html; charset=utf-8'),
+            'url'
+        )
+        assert body['data']['h1'] == 'Привет'
+
+    def test_charset_from_meta(self):
+        """Тест кодировки из meta-тега при потоковом разборе."""
+        html = '<meta charset="windows-1251"><h1>Тест</h1>'.encode('cp1251')
+        body = CheckService._stream_response_data(
+            _response([html[:10], html[10:]]), 'url'
+        )
+        assert body['encoding'] == 'cp1251'
+        assert body['data']['h1'] == 'Тест'
+
+    def test_size_limit(self, monkeypatch):
+        """Тест ограничения размера при потоковом разборе."""
+        monkeypatch.setattr(config, 'MAX_RESPONSE_SIZE', 10)
+        assert CheckService._stream_response_data(
+            _response([b'<p>12345', b'67890</p>']), 'url'
+        ) is None
+
+
+class TestRunCheck:
+    """Тесты проверки страницы без сохранения результата."""
+
+    @pytest.mark.parametrize('streaming', [True, False])
+    def test_same_data_in_both_modes(self, monkeypatch, streaming):
+        """Тест одинакового результата потокового и полного разбора."""
+        monkeypatch.setattr(config, 'STREAMING_PARSE', streaming)
+        response = _response([
+            b'<title>T</title><meta name="description" content="D">',
+            b'<h1>H1</h1><p>tail</p>',
+        ], 'text/html; charset=utf-8')
+        response.status_code = 200
+        response.history = []
+        url = namedtuple('Url', 'id name')(1, 'https://example.com')
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get',
+            return_value=response
+        ):
+            result = CheckService.run_check(url)
+        assert result['data'] == {
+            'h1': 'H1', 'title': 'T', 'description': 'D',
+            'url_id': 1, 'status_code': 200,
+            'etag': None, 'last_modified': None,
+            # Хэш известен, только если тело прочитано целиком
+            'body_hash': None if streaming else result['data']['body_hash'],
+        }
+        assert result['metrics']['stopped_early'] is streaming
+
+
+class TestConditionalChecks:
+    """Тесты условных повторных проверок."""
+
+    def _check_twice(self, server):
+        url_id = add_url(f'http://127.0.0.1:{server.server_address[1]}/')
+        first = CheckService.check_url(url_id)
+        second = CheckService.check_url(url_id)
+        return first, second, get_checks_by_url_id(url_id)
+
+    def test_not_modified_copies_previous_check(self, test_db, page_server):
+        """Тест записи проверки по ответу 304 без загрузки тела."""
+        first, second, checks = self._check_twice(page_server)
+
+        assert page_server.conditions == [None, '"v1"']
+        assert second['metrics']['unchanged']
+        assert second['metrics']['bytes_read'] == 0
+        assert len(checks) == 2
+        latest, earlier = checks
+        assert (latest.h1, latest.title, latest.description) == (
+            'H1', 'T', 'D'
+        )
+        assert latest.status_code == 200
+        assert latest.etag == earlier.etag == '"v1"'
+
+    def test_same_body_hash_skips_parsing(
+        self, test_db, page_server, monkeypatch
+    ):
+        """Тест пропуска разбора при совпадении хэша тела."""
+        monkeypatch.setattr(config, 'STREAMING_PARSE', False)
+        page_server.etag = None
+        url_id = add_url(f'http://127.0.0.1:{page_server.server_address[1]}')
+        CheckService.check_url(url_id)
+        with patch('page_analyzer.services.check_service.parse') as parse:
+            result = CheckService.check_url(url_id)
+        parse.assert_not_called()
+        assert result['metrics']['unchanged']
+        latest, earlier = get_checks_by_url_id(url_id)
+        assert latest.body_hash == earlier.body_hash is not None
+        assert latest.h1 == 'H1'
+
+    def test_changed_body_is_parsed(self, test_db, page_server, monkeypatch):
+        """Тест разбора изменившейся страницы."""
+        monkeypatch.setattr(config, 'STREAMING_PARSE', False)
+        page_server.etag = None
+        url_id = add_url(f'http://127.0.0.1:{page_server.server_address[1]}')
+        CheckService.check_url(url_id)
+        page_server.body = PAGE.replace(b'H1', b'New H1')
+        result = CheckService.check_url(url_id)
+        assert not result['metrics']['unchanged']
+        assert get_checks_by_url_id(url_id)[0].h1 == 'New H1'
+
+    def test_disabled(self, test_db, page_server, monkeypatch):
+        """Тест безусловных проверок при CONDITIONAL_CHECKS=false."""
+        monkeypatch.setattr(config, 'CONDITIONAL_CHECKS', False)
+        _, second, _ = self._check_twice(page_server)
+        assert page_server.conditions == [None, None]
+        assert not second['metrics']['unchanged']
+
+
+class TestDetectEncoding:
+    """Тесты определения кодировки страницы."""
+
+    def test_charset_from_header(self):
+        """Тест кодировки из заголовка Content-Type."""
+        body = CheckService._read_response_content(
+            _response(
+                ['Тест'.encode('cp1251')],
+                'text/html; charset=windows-1251'
+            ),
+            'url'
+        )
+        assert body['content'] == 'Тест'
+        assert body['encoding'] == 'cp1251'
+
+    def test_charset_from_meta(self):
+        """Тест кодировки из meta-тега."""
+        html = '<meta charset="koi8-r"><h1>Тест</h1>'
+        assert CheckService._detect_encoding(
+            'text/html', html.encode('koi8-r')
+        ) == 'koi8-r'
+
+    def test_charset_from_http_equiv(self):
+        """Тест кодировки из meta http-equiv."""
+        html = (
+            b'<meta http-equiv="Content-Type" '
+            b'content="text/html; charset=windows-1251">'
+        )
+        assert CheckService._detect_encoding('text/html', html) == 'cp1251'
+
+    def test_default_utf8(self):
+        """Тест кодировки по умолчанию."""
+        assert CheckService._detect_encoding('text/html', b'<h1>') == 'utf-8'
+
+    def test_unknown_charset(self):
+        """Тест неизвестной кодировки в заголовке."""
+        assert CheckService._detect_encoding(
+            'text/html; charset=unknown-charset', b''
+        ) == 'utf-8'
@@ -0,0 +1,103 @@
+"""Тесты для буфера записи проверок."""
+
+import threading
+import time
+from unittest.mock import patch
+import pytest
+from page_analyzer.check_writer import CheckWriter, WriterClosed
+from page_analyzer.db import add_url, get_checks_by_url_id
+
+
+def _check(url_id, h1='H1'):
+    """Данные проверки для записи."""
+    return {
+        'url_id': url_id,
+        'status_code': 200,
+        'h1': h1,
+        'title': 'T',
+        'description': 'D',
+    }
+
+
+class TestCheckWriter:
+    """Тесты для класса CheckWriter."""
+
+    def test_flush_by_batch_size(self):
+        """Тест записи пакета при наполнении буфера."""
+        batches = []
+        with patch(
+            'page_analyzer.check_writer.add_checks',
+            side_effect=lambda checks: batches.append(len(checks))
+        ):
+            writer = CheckWriter(batch_size=3, max_latency=60)
+            for i in range(6):
+                writer.put(_check(i))
+            writer.flush()
+            writer.close()
+        assert batches == [3, 3]
+
+    def test_flush_by_latency(self):
+        """Тест записи неполного пакета по истечении max_latency."""
+        saved = threading.Event()
+        with patch(
+            'page_analyzer.check_writer.add_checks'
+        ) as add_checks, CheckWriter(batch_size=100, max_latency=0.05) as w:
+            w.put(_check(1), callback=lambda error: saved.set())
+            assert saved.wait(5)
+            add_checks.assert_called_once()
+            assert w.stats()['written'] == 1
+
+    def test_put_blocks_when_full(self):
+        """Тест ожидания места в заполненном буфере."""
+        release = threading.Event()
+        with patch(
+            'page_analyzer.check_writer.add_checks',
+            side_effect=lambda checks: release.wait(5)
+        ):
+            writer = CheckWriter(batch_size=1, max_latency=0, max_pending=1)
+            writer.put(_check(1))
+            # Дождаться, пока первая проверка уйдёт в запись
+            deadline = time.monotonic() + 5
+            while writer._buffer and time.monotonic() < deadline:
+                time.sleep(0.01)
+            writer.put(_check(2))
+            with pytest.raises(TimeoutError):
+                writer.put(_check(3), timeout=0.05)
+            release.set()
+            assert writer.close()['written'] == 2
+
+    def test_close_writes_remaining(self, test_db):
+        """Тест записи оставшихся проверок при закрытии."""
+        url_id = add_url('https://example.com')
+        writer = CheckWriter(batch_size=100, max_latency=60)
+        for i in range(5):
+            writer.put(_check(url_id, f'H{i}'))
+        stats = writer.close()
+        assert stats == {'written': 5, 'failed': 0, 'flushes': 1}
+        assert len(get_checks_by_url_id(url_id)) == 5
+
+    def test_put_after_close(self):
+        """Тест добавления проверки в закрытый буфер."""
+        writer = CheckWriter()
+        writer.close()
+        with pytest.raises(WriterClosed):
+            writer.put(_check(1))
+
+    def test_callback_receives_error(self):
+        """Тест передачи ошибки записи в обработчики."""
+        errors = []
+        with patch(
+            'page_analyzer.check_writer.add_checks',
+            side_effect=RuntimeError('db down')
+        ):
+            writer = CheckWriter(batch_size=2)
+            writer.put(_check(1), callback=errors.append)
+            writer.put(_check(2), callback=errors.append)
+            stats = writer.close()
+        assert [str(error) for error in errors] == ['db down', 'db down']
+        assert stats['failed'] == 2
+
+    def test_invalid_parameters(self):
+        """Тест проверки параметров буфера."""
+        with pytest.raises(ValueError):
+            CheckWriter(batch_size=0)
@@ -1,6 +1,7 @@
 """Тесты для модуля db."""
 
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from psycopg2 import Error as DBError
 from page_analyzer.db import (
@@ -10,9 +11,24 @@ from page_analyzer.db import (
     get_url_by_id,
     get_all_urls,
     add_check,
+    add_checks,
+    backfill_latest_checks,
+    claim_check_jobs,
+    delete_finished_check_jobs,
+    enqueue_check_job,
+    finish_check_job,
+    get_check_job,
     get_last_check_by_url_id,
     get_checks_by_url_id,
+    get_url_version,
+    get_urls_version,
+    import_urls,
+    iter_all_urls,
+    set_check_schedule,
+    upsert_url,
 )
+from page_analyzer.cli import main
+from page_analyzer.db import _CopyReader
 
 
 class TestAddUrl:
@@ -48,6 +64,86 @@ class TestAddUrl:
         assert all(isinstance(i, int) for i in [id1, id2, id3])
 
 
+class TestUpsertUrl:
+    """Тесты для функции upsert_url."""
+
+    def test_upsert_new_url(self, test_db):
+        """Тест добавления нового URL."""
+        url_id, inserted = upsert_url('https://example.com')
+        assert inserted
+        assert get_url_by_id(url_id).name == 'https://example.com'
+
+    def test_upsert_existing_url(self, test_db):
+        """Тест повторного добавления существующего URL."""
+        url_id = add_url('https://example.com')
+        created_at = get_url_by_id(url_id).created_at
+        assert upsert_url('https://example.com') == (url_id, False)
+        assert get_url_by_id(url_id).created_at == created_at
+
+    def test_upsert_concurrent(self, test_db):
+        """Тест одновременного добавления одного URL."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                upsert_url, ['https://example.com'] * 8
+            ))
+        assert len({url_id for url_id, _ in results}) == 1
+        assert sum(inserted for _, inserted in results) == 1
+
+
+class TestImportUrls:
+    """Тесты для функции import_urls."""
+
+    def test_import_skips_existing(self, test_db):
+        """Тест пропуска уже существующих URL."""
+        add_url('https://example.com')
+        assert import_urls(['https://example.com', 'https://example.org']) == 1
+        assert get_url_by_name('https://example.org') is not None
+
+    def test_import_keeps_order(self, test_db):
+        """Тест добавления URL в порядке импорта."""
+        names = [f'https://site{i}.example' for i in range(50)]
+        import_urls(names)
+        urls = sorted(get_all_urls(), key=lambda url: url.id)
+        assert [url.name for url in urls] == names
+
+    def test_import_escapes_special_characters(self, test_db):
+        """Тест загрузки строк со служебными символами COPY."""
+        name = 'https://ex\\ample\tcom'
+        assert import_urls([name]) == 1
+        assert get_url_by_name(name) is not None
+
+    def test_import_empty(self, test_db):
+        """Тест импорта пустого набора."""
+        assert import_urls([]) == 0
+
+    def test_import_urls_command(self, test_db, tmp_path, capsys):
+        """Тест команды import-urls."""
+        path = tmp_path / 'urls.txt'
+        path.write_text(
+            'https://example.com\nhttps://example.com/a\nbad\n',
+            encoding='utf-8'
+        )
+        assert main(['import-urls', str(path)]) == 0
+        assert (
+            'Обработано строк: 3 (добавлено 1, повторов 1, некорректных 1)'
+            in capsys.readouterr().out
+        )
+
+    def test_reader_consumes_lines_lazily(self):
+        """Тест чтения строк по мере запроса данных."""
+        consumed = []
+
+        def lines():
+            for i in range(1000):
+                consumed.append(i)
+                yield 'https://example.com'
+
+        reader = _CopyReader(lines())
+        chunk = reader.read(100)
+        assert len(chunk) == 100
+        assert len(consumed) < 10
+
+
 class TestGetUrlByName:
     """Тесты для функции get_url_by_name."""
 
@@ -179,6 +275,26 @@ class TestGetAllUrls:
         assert urls[0].status_code == 404
 
 
+    def test_get_all_urls_limit(self, test_db):
+        """Тест ограничения количества URL."""
+        ids = [add_url(f'https://example{i}.com') for i in range(5)]
+        urls = get_all_urls(limit=2)
+        assert [url.id for url in urls] == ids[:-3:-1]
+
+    def test_get_all_urls_after_id(self, test_db):
+        """Тест получения следующей страницы по курсору."""
+        ids = [add_url(f'https://example{i}.com') for i in range(5)]
+        urls = get_all_urls(after_id=ids[3], limit=2)
+        assert [url.id for url in urls] == [ids[2], ids[1]]
+
+    def test_get_all_urls_before_id(self, test_db):
+        """Тест получения предыдущей страницы по курсору."""
+        ids = [add_url(f'https://example{i}.com') for i in range(5)]
+        urls = get_all_urls(before_id=ids[1], limit=2)
+        # Порядок внутри страницы остаётся по убыванию ID
+        assert [url.id for url in urls] == [ids[3], ids[2]]
+
+
 class TestAddCheck:
     """Тесты для функции add_check."""
 
@@ -251,6 +367,78 @@ class TestAddCheck:
         assert len(checks) == 3
 
 
+class TestAddChecks:
+    """Тесты для функции add_checks."""
+
+    def test_add_checks_empty(self, test_db):
+        """Тест пакетной вставки пустого списка."""
+        assert add_checks([]) == 0
+
+    def test_add_checks_inserts_all(self, test_db):
+        """Тест пакетной вставки проверок нескольких URL."""
+        url_id1 = add_url('https://example1.com')
+        url_id2 = add_url('https://example2.com')
+        count = add_checks([
+            {'url_id': url_id1, 'status_code': 200, 'h1': 'First'},
+            {'url_id': url_id1, 'status_code': 404, 'h1': 'Second'},
+            {'url_id': url_id2, 'status_code': 500},
+        ])
+        assert count == 3
+        assert len(get_checks_by_url_id(url_id1)) == 2
+        assert get_last_check_by_url_id(url_id1).h1 == 'Second'
+
+    def test_add_checks_updates_summary(self, test_db):
+        """Тест обновления сводки последней проверкой пакета."""
+        url_id1 = add_url('https://example1.com')
+        url_id2 = add_url('https://example2.com')
+        add_checks([
+            {'url_id': url_id1, 'status_code': 200},
+            {'url_id': url_id1, 'status_code': 404},
+            {'url_id': url_id2, 'status_code': 500},
+        ])
+        statuses = {url.id: url.status_code for url in get_all_urls()}
+        assert statuses == {url_id1: 404, url_id2: 500}
+
+
+class TestBackfillLatestChecks:
+    """Тесты для функции backfill_latest_checks."""
+
+    def test_backfill_fills_summary(self, test_db):
+        """Тест заполнения сводки по проверкам, добавленным в обход."""
+        url_id = add_url('https://example.com')
+        with DatabaseConnection() as cursor:
+            cursor.execute(
+                'INSERT INTO url_checks (url_id, status_code, created_at) '
+                'VALUES (%s, 200, now()), (%s, 500, now())',
+                (url_id, url_id)
+            )
+        assert get_all_urls()[0].status_code is None
+
+        assert backfill_latest_checks() == 1
+        urls = get_all_urls()
+        assert urls[0].status_code == 500
+        assert urls[0].last_check is not None
+
+    def test_backfill_is_idempotent(self, test_db):
+        """Тест повторного запуска заполнения сводки."""
+        url_id = add_url('https://example.com')
+        add_check({'url_id': url_id, 'status_code': 200})
+        assert backfill_latest_checks() == 0
+
+    def test_older_check_does_not_overwrite_summary(self, test_db):
+        """Тест сохранения сводки при вставке более ранней проверки."""
+        url_id = add_url('https://example.com')
+        add_check({'url_id': url_id, 'status_code': 200})
+        with DatabaseConnection() as cursor:
+            cursor.execute(
+                "INSERT INTO url_checks (url_id, status_code, created_at) "
+                "VALUES (%s, 500, now() - interval '1 day')",
+                (url_id, )
+            )
+        backfill_latest_checks()
+        assert get_all_urls()[0].status_code == 200
+
+
 class TestGetChecksByUrlId:
     """Тесты для функции get_checks_by_url_id."""
 
@@ -425,3 +613,183 @@ class TestDatabaseConnection:
         assert conn.cursor is None or conn.cursor.closed
         assert conn.connection is None or conn.connection.closed
 
+
+class TestCheckJobs:
+    """Тесты для функций очереди проверок."""
+
+    def test_enqueue_check_job(self, test_db):
+        """Тест постановки проверки в очередь."""
+        url_id = add_url('https://example.com')
+        job = enqueue_check_job(url_id)
+        assert job.url_id == url_id
+        assert job.status == 'queued'
+
+    def test_enqueue_returns_active_job(self, test_db):
+        """Тест повторной постановки URL, уже стоящего в очереди."""
+        url_id = add_url('https://example.com')
+        first = enqueue_check_job(url_id)
+        assert enqueue_check_job(url_id).id == first.id
+
+    def test_enqueue_after_finish_creates_job(self, test_db):
+        """Тест новой задачи после завершения предыдущей."""
+        url_id = add_url('https://example.com')
+        first = enqueue_check_job(url_id)
+        claim_check_jobs(10, 60)
+        finish_check_job(first.id, True, 'ok')
+        assert enqueue_check_job(url_id).id != first.id
+
+    def test_claim_marks_running(self, test_db):
+        """Тест захвата задач воркером."""
+        url_id = add_url('https://example.com')
+        job = enqueue_check_job(url_id)
+        claimed = claim_check_jobs(10, 60)
+        assert [j.id for j in claimed] == [job.id]
+        assert get_check_job(job.id).status == 'running'
+        assert claim_check_jobs(10, 60) == []
+
+    def test_claim_skips_locked_jobs(self, test_db):
+        """Тест пропуска задач, заблокированных другим воркером."""
+        job1 = enqueue_check_job(add_url('https://example1.com'))
+        job2 = enqueue_check_job(add_url('https://example2.com'))
+        with DatabaseConnection(pooled=False) as cursor:
+            cursor.execute(
+                'SELECT id FROM check_jobs WHERE id = %s FOR UPDATE',
+                (job1.id, )
+            )
+            claimed = claim_check_jobs(10, 60)
+        assert [j.id for j in claimed] == [job2.id]
+
+    def test_claim_reclaims_stale_jobs(self, test_db):
+        """Тест повторного захвата брошенной задачи."""
+        job = enqueue_check_job(add_url('https://example.com'))
+        claim_check_jobs(10, 60)
+        claimed = claim_check_jobs(10, 0)
+        assert [j.id for j in claimed] == [job.id]
+        assert get_check_job(job.id).attempts == 2
+
+    def test_claim_fails_exhausted_jobs(self, test_db):
+        """Тест завершения с ошибкой задачи с исчерпанными попытками."""
+        job = enqueue_check_job(add_url('https://example.com'))
+        claim_check_jobs(10, 60, max_attempts=2)
+        assert len(claim_check_jobs(10, 0, max_attempts=2)) == 1
+        assert claim_check_jobs(10, 0, max_attempts=2) == []
+        failed = get_check_job(job.id)
+        assert failed.status == 'failed'
+        assert failed.attempts == 2
+        assert failed.message == 'Превышено количество попыток'
+
+    def test_finish_check_job(self, test_db):
+        """Тест завершения задачи с ошибкой."""
+        job = enqueue_check_job(add_url('https://example.com'))
+        finish_check_job(job.id, False, 'Ошибка HTTP: 500')
+        finished = get_check_job(job.id)
+        assert finished.status == 'failed'
+        assert finished.message == 'Ошибка HTTP: 500'
+        assert finished.finished_at is not None
+
+    def test_delete_finished_check_jobs(self, test_db):
+        """Тест удаления только завершённых задач."""
+        done = enqueue_check_job(add_url('https://example1.com'))
+        queued = enqueue_check_job(add_url('https://example2.com'))
+        finish_check_job(done.id, True, 'ok')
+        assert delete_finished_check_jobs(3600) == 0
+        assert delete_finished_check_jobs(0) == 1
+        assert get_check_job(done.id) is None
+        assert get_check_job(queued.id).status == 'queued'
+
+
+class TestDataVersions:
+    """Тесты для версий данных страниц."""
+
+    def test_urls_version_changes_on_writes(self, test_db):
+        """Тест увеличения версии списка при добавлении URL и проверок."""
+        version = get_urls_version()
+        url_id = add_url('https://example.com')
+        assert get_urls_version() == version + 1
+
+        add_check({'url_id': url_id, 'status_code': 200})
+        assert get_urls_version() == version + 2
+
+        import_urls(['https://example.org', 'https://example.net'])
+        assert get_urls_version() == version + 3
+
+    def test_urls_version_unchanged_on_duplicate(self, test_db):
+        """Тест, что повторное добавление URL не меняет версию."""
+        add_url('https://example.com')
+        version = get_urls_version()
+        upsert_url('https://example.com')
+        assert get_urls_version() == version
+
+    def test_urls_version_changes_on_backfill(self, test_db):
+        """Тест увеличения версии при пересчёте сводки о проверке."""
+        url_id = add_url('https://example.com')
+        add_check({'url_id': url_id, 'status_code': 200})
+        with DatabaseConnection() as cursor:
+            cursor.execute('UPDATE urls SET last_check_id = NULL, '
+                           'last_check_status_code = NULL, '
+                           'last_check_at = NULL')
+        version = get_urls_version()
+        backfill_latest_checks()
+        assert get_urls_version() == version + 1
+
+    def test_urls_version_unchanged_on_schedule(self, test_db):
+        """Тест, что изменение расписания не меняет версию списка."""
+        add_url('https://example.com')
+        version = get_urls_version()
+        set_check_schedule(3600)
+        assert get_urls_version() == version
+
+    def test_concurrent_writes_do_not_wait(self, test_db):
+        """Тест, что параллельные записи не ждут друг друга."""
+        url_id = add_url('https://example.com')
+        with DatabaseConnection(pooled=False) as cursor:
+            cursor.execute(
+                'UPDATE urls SET last_check_at = now() WHERE id = %s',
+                (url_id, )
+            )
+            with DatabaseConnection(pooled=False) as other:
+                other.execute("SET LOCAL lock_timeout = '2s'")
+                other.execute(
+                    "INSERT INTO urls (name, created_at) "
+                    "VALUES ('https://example.org', now())"
+                )
+
+    def test_url_version(self, test_db):
+        """Тест версии страницы URL."""
+        url_id = add_url('https://example.com')
+        version = get_url_version(url_id)
+        assert version.checks_count == 0
+        assert version.max_check_id is None
+
+        add_check({'url_id': url_id, 'status_code': 200})
+        version = get_url_version(url_id)
+        assert version.checks_count == 1
+        assert version.max_check_id is not None
+
+    def test_url_version_not_found(self, test_db):
+        """Тест версии несуществующего URL."""
+        assert get_url_version(999999) is None
+
+
+class TestIterAllUrls:
+    """Тесты для функции iter_all_urls."""
+
+    def test_iter_all_urls(self, test_db):
+        """Тест чтения всех URL порциями в порядке убывания ID."""
+        ids = [add_url(f'https://example{i}.com') for i in range(5)]
+        rows = list(iter_all_urls(batch_size=2))
+        assert [row.id for row in rows] == sorted(ids, reverse=True)
+        assert rows[0].name == 'https://example4.com'
+
+    def test_iter_all_urls_empty(self, test_db):
+        """Тест чтения пустого списка."""
+        assert list(iter_all_urls()) == []
+
+    def test_iter_all_urls_closed_early(self, test_db):
+        """Тест закрытия генератора до конца результата."""
+        for i in range(5):
+            add_url(f'https://example{i}.com')
+        rows = iter_all_urls(batch_size=2)
+        next(rows)
+        rows.close()
+        assert len(list(iter_all_urls(batch_size=2))) == 5
@@ -0,0 +1,184 @@
+"""Тесты для кэша разрешения имён."""
+
+import socket
+import threading
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pytest
+import requests
+from page_analyzer.dns_cache import DNSCache, dns_cache
+from page_analyzer.http_client import CachedDNSAdapter, SessionManager
+from page_analyzer.services import CheckService
+
+
+class FakeResolver:
+    """Резолвер-заглушка с подсчётом обращений."""
+
+    def __init__(self, records):
+        self.records = records
+        self.calls = []
+
+    def __call__(self, host, port, family):
+        self.calls.append(host)
+        if host == 'flaky.test':
+            raise socket.gaierror(socket.EAI_AGAIN, 'Temporary failure')
+        if host not in self.records:
+            raise socket.gaierror(socket.EAI_NONAME, 'Name not known')
+        address, ttl = self.records[host]
+        info = (socket.AF_INET, socket.SOCK_STREAM, 6, '', (address, port))
+        return [info], ttl
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Фикстура управляемого времени для проверки TTL."""
+    now = [1000.0]
+    monkeypatch.setattr(
+        'page_analyzer.dns_cache.time.monotonic', lambda: now[0]
+    )
+    return now
+
+
+@pytest.fixture
+def resolver():
+    """Фикстура резолвера с двумя записями."""
+    return FakeResolver({
+        'a.test': ('10.0.0.1', None),
+        'short.test': ('10.0.0.2', 5),
+    })
+
+
+class TestDNSCache:
+    """Тесты для класса DNSCache."""
+
+    def test_caches_addresses(self, resolver):
+        """Тест повторного разрешения имени из кэша."""
+        cache = DNSCache(max_entries=10, resolver=resolver)
+        first = cache.resolve('a.test', 80, socket.AF_INET)
+        assert cache.resolve('A.test', 80, socket.AF_INET) == first
+        assert resolver.calls == ['a.test']
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses']) == (1, 1)
+        assert stats['hit_rate'] == 0.5
+
+    def test_respects_ttl(self, resolver, clock):
+        """Тест истечения записи по TTL кэша и TTL записи."""
+        cache = DNSCache(max_entries=10, ttl=60, resolver=resolver)
+        cache.resolve('a.test', 80, socket.AF_INET)
+        cache.resolve('short.test', 80, socket.AF_INET)
+        clock[0] += 10
+        cache.resolve('a.test', 80, socket.AF_INET)
+        cache.resolve('short.test', 80, socket.AF_INET)
+        assert resolver.calls == ['a.test', 'short.test', 'short.test']
+        clock[0] += 60
+        cache.resolve('a.test', 80, socket.AF_INET)
+        assert resolver.calls[-1] == 'a.test'
+
+    def test_negative_caching(self, resolver, clock):
+        """Тест кэширования несуществующего имени."""
+        cache = DNSCache(max_entries=10, negative_ttl=30, resolver=resolver)
+        for _ in range(3):
+            with pytest.raises(socket.gaierror) as error:
+                cache.resolve('missing.test', 80, socket.AF_INET)
+            assert error.value.errno == socket.EAI_NONAME
+        assert resolver.calls == ['missing.test']
+        assert cache.stats()['negative_hits'] == 2
+        clock[0] += 31
+        with pytest.raises(socket.gaierror):
+            cache.resolve('missing.test', 80, socket.AF_INET)
+        assert len(resolver.calls) == 2
+
+    def test_temporary_failure_not_cached(self, resolver):
+        """Тест повторного запроса после временной ошибки резолвера."""
+        cache = DNSCache(max_entries=10, resolver=resolver)
+        for _ in range(2):
+            with pytest.raises(socket.gaierror):
+                cache.resolve('flaky.test', 80, socket.AF_INET)
+        assert resolver.calls == ['flaky.test', 'flaky.test']
+
+    def test_lru_eviction(self, resolver):
+        """Тест вытеснения давно не использованных записей."""
+        resolver.records.update({'b.test': ('10.0.0.3', None)})
+        cache = DNSCache(max_entries=2, resolver=resolver)
+        for host in ('a.test', 'b.test', 'a.test', 'short.test'):
+            cache.resolve(host, 80, socket.AF_INET)
+        cache.resolve('a.test', 80, socket.AF_INET)
+        cache.resolve('b.test', 80, socket.AF_INET)
+        assert resolver.calls == ['a.test', 'b.test', 'short.test', 'b.test']
+        assert cache.stats()['evictions'] == 2
+        assert cache.stats()['entries'] == 2
+
+    def test_disabled(self, resolver):
+        """Тест разрешения без кэша при max_entries=0."""
+        cache = DNSCache(max_entries=0, resolver=resolver)
+        cache.resolve('a.test', 80, socket.AF_INET)
+        cache.resolve('a.test', 80, socket.AF_INET)
+        assert len(resolver.calls) == 2
+
+
+class CloseHandler(BaseHTTPRequestHandler):
+    """Обработчик, закрывающий соединение после каждого ответа."""
+
+    def do_GET(self):
+        body = b'<title>DNS</title>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTransport:
+    """Тесты кэша DNS в HTTP-транспорте проверок."""
+
+    @pytest.fixture
+    def server(self):
+        """Фикстура локального HTTP-сервера."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), CloseHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def fake_dns(self):
+        """Фикстура подмены резолвера общего кэша."""
+        resolver = FakeResolver({'site.test': ('127.0.0.1', None)})
+        with patch.object(dns_cache, 'resolver', resolver), \
+                patch.object(dns_cache, 'max_entries', 16):
+            dns_cache.clear()
+            yield resolver
+            dns_cache.clear()
+
+    def test_session_resolves_through_cache(self, server, fake_dns):
+        """Тест подключения по имени из кэша для новых соединений."""
+        manager = SessionManager()
+        assert isinstance(manager.create_adapter(), CachedDNSAdapter)
+        url = f'http://site.test:{server.server_address[1]}/'
+        try:
+            for _ in range(3):
+                response = manager.get(url, timeout=5)
+                assert response.text == '<title>DNS</title>'
+        finally:
+            manager.shutdown()
+        assert fake_dns.calls == ['site.test']
+        assert dns_cache.stats()['hits'] == 2
+
+    def test_unknown_host(self, fake_dns):
+        """Тест ошибки разрешения имени в проверке."""
+        manager = SessionManager()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            manager.get('http://missing.test/', timeout=5)
+        Url = namedtuple('Url', 'id name')
+        with patch('page_analyzer.services.check_service.session_manager',
+                   manager):
+            result = CheckService.run_check(Url(1, 'http://missing.test/'))
+        manager.shutdown()
+        assert result['flash_message'] == 'Не удалось подключиться к серверу'
+        assert fake_dns.calls == ['missing.test']
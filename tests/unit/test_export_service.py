@@ -0,0 +1,159 @@
+"""Тесты для выгрузки истории проверок."""
+
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from page_analyzer.cli import main
+from page_analyzer.db import DatabaseConnection, add_check, add_url
+from page_analyzer.services import ExportService
+
+
+@pytest.fixture
+def checks(test_db):
+    """Фикстура с проверками двух URL в разные дни."""
+    first = add_url('https://example.com')
+    second = add_url('https://example.org')
+    add_check({'url_id': first, 'status_code': 200, 'title': 'Пример'})
+    add_check({'url_id': second, 'status_code': 404, 'h1': '=HYPERLINK(1)'})
+    add_check({'url_id': first, 'status_code': 500})
+    with DatabaseConnection() as cursor:
+        cursor.execute("""
+            UPDATE url_checks SET created_at = CASE status_code
+                WHEN 200 THEN timestamp '2024-01-01 10:00'
+                WHEN 404 THEN timestamp '2024-01-02 12:00'
+                ELSE timestamp '2024-01-03 08:00'
+            END
+        """)
+    return first, second
+
+
+def export(export_format='csv', **filters):
+    rows = ExportService.iter_checks(**ExportService.parse_filters(**filters))
+    return ''.join(ExportService.export(rows, export_format))
+
+
+class TestParseFilters:
+    """Тесты для ExportService.parse_filters."""
+
+    def test_empty(self):
+        assert ExportService.parse_filters() == {
+            'since': None, 'until': None, 'status_codes': []
+        }
+
+    def test_dates(self):
+        filters = ExportService.parse_filters(
+            since='2024-01-01', until='2024-01-02'
+        )
+        assert filters['since'] == datetime(2024, 1, 1)
+        # Дата без времени включает весь день
+        assert filters['until'] == datetime(2024, 1, 3)
+
+    def test_until_with_time(self):
+        filters = ExportService.parse_filters(until='2024-01-02T12:00')
+        assert filters['until'] == datetime(2024, 1, 2, 12)
+
+    def test_statuses(self):
+        filters = ExportService.parse_filters(statuses=['200', '404'])
+        assert filters['status_codes'] == [200, 404]
+
+    @pytest.mark.parametrize('filters', [
+        {'since': 'yesterday'},
+        {'until': '2024-13-01'},
+        {'statuses': ['abc']},
+        {'statuses': ['99']},
+    ])
+    def test_invalid(self, filters):
+        with pytest.raises(ValueError):
+            ExportService.parse_filters(**filters)
+
+    def test_invalid_format(self):
+        with pytest.raises(ValueError):
+            ExportService.export([], 'xml')
+
+
+class TestExport:
+    """Тесты для выгрузки проверок."""
+
+    def test_csv(self, checks):
+        """Тест выгрузки в CSV в порядке времени проверки."""
+        first, second = checks
+        rows = list(csv.DictReader(io.StringIO(export('csv'))))
+        assert [row['status_code'] for row in rows] == ['200', '404', '500']
+        assert rows[0]['url'] == 'https://example.com'
+        assert rows[0]['url_id'] == str(first)
+        assert rows[0]['title'] == 'Пример'
+        assert rows[0]['created_at'] == '2024-01-01T10:00:00'
+        assert rows[1]['url_id'] == str(second)
+        # Формулы не выполняются при открытии в табличном редакторе
+        assert rows[1]['h1'] == "'=HYPERLINK(1)"
+
+    def test_ndjson(self, checks):
+        """Тест выгрузки в NDJSON."""
+        lines = export('ndjson').splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [r['status_code'] for r in records] == [200, 404, 500]
+        assert records[0]['title'] == 'Пример'
+        assert records[1]['h1'] == '=HYPERLINK(1)'
+        assert records[2]['created_at'] == '2024-01-03T08:00:00'
+
+    def test_filters(self, checks):
+        """Тест фильтров по периоду и коду ответа."""
+        records = [
+            json.loads(line) for line in export(
+                'ndjson', since='2024-01-02', until='2024-01-03'
+            ).splitlines()
+        ]
+        assert [r['status_code'] for r in records] == [404, 500]
+
+        records = [
+            json.loads(line)
+            for line in export('ndjson', statuses=['200', '500']).splitlines()
+        ]
+        assert [r['status_code'] for r in records] == [200, 500]
+
+    def test_empty(self, test_db):
+        """Тест выгрузки без проверок."""
+        assert export('csv').splitlines() == [
+            'url_id,url,check_id,status_code,h1,title,description,created_at'
+        ]
+        assert export('ndjson') == ''
+
+    def test_batches(self, checks, monkeypatch):
+        """Тест выгрузки кусками по EXPORT_BATCH_SIZE строк."""
+        monkeypatch.setattr(
+            'page_analyzer.services.export_service.config.EXPORT_BATCH_SIZE',
+            2
+        )
+        rows = ExportService.iter_checks()
+        chunks = list(ExportService.export(rows, 'ndjson'))
+        assert [chunk.count('\n') for chunk in chunks] == [2, 1]
+
+
+class TestExportCommand:
+    """Тесты для команды page-analyzer export."""
+
+    def test_stdout(self, checks, capsys):
+        assert main(['export', '--status', '404']) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 2
+        assert 'https://example.org' in lines[1]
+
+    def test_file(self, checks, tmp_path):
+        output = tmp_path / 'checks.ndjson'
+        assert main([
+            'export', '--format', 'ndjson', '--since', '2024-01-03',
+            '--output', str(output)
+        ]) == 0
+        records = [
+            json.loads(line)
+            for line in output.read_text(encoding='utf-8').splitlines()
+        ]
+        assert [r['status_code'] for r in records] == [500]
+
+    def test_invalid_filter(self, test_db, capsys):
+        assert main(['export', '--since', 'yesterday']) == 1
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert 'Некорректная дата' in captured.err
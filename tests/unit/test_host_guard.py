@@ -0,0 +1,192 @@
+"""Тесты для ограничителя частоты запросов и предохранителя хостов."""
+
+import asyncio
+import time
+from collections import namedtuple
+from unittest.mock import patch
+import pytest
+from page_analyzer.host_guard import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    HostGuard,
+    HostUnavailable,
+    TokenBucket,
+)
+from page_analyzer.services import AsyncCheckService, CheckService
+
+Url = namedtuple('Url', 'id name')
+DEAD_URL = 'http://127.0.0.1:1/'
+
+
+class TestTokenBucket:
+    """Тесты для класса TokenBucket."""
+
+    def test_burst_without_waiting(self):
+        """Тест запросов подряд в пределах burst."""
+        bucket = TokenBucket(rate=2, burst=3, now=0)
+        assert [bucket.reserve(0) for _ in range(3)] == [0, 0, 0]
+
+    def test_reservations_are_spaced(self):
+        """Тест интервала между запросами сверх burst."""
+        bucket = TokenBucket(rate=2, burst=1, now=0)
+        assert bucket.reserve(0) == 0
+        assert bucket.reserve(0) == pytest.approx(0.5)
+        assert bucket.reserve(0) == pytest.approx(1.0)
+
+    def test_refill(self):
+        """Тест восстановления токенов со временем."""
+        bucket = TokenBucket(rate=2, burst=1, now=0)
+        bucket.reserve(0)
+        assert bucket.reserve(0.5) == 0
+        assert bucket.full is False
+        bucket.reserve(10)
+        assert bucket.reserve(20) == 0
+
+
+class TestCircuitBreaker:
+    """Тесты для класса CircuitBreaker."""
+
+    def test_opens_after_threshold(self):
+        """Тест размыкания после серии ошибок."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        breaker.record_failure(0)
+        assert breaker.allow(0)
+        breaker.record_failure(0)
+        assert breaker.state == OPEN
+        assert not breaker.allow(5)
+
+    def test_success_resets_failures(self):
+        """Тест сброса счётчика ошибок после успеха."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        breaker.record_failure(0)
+        breaker.record_success()
+        breaker.record_failure(0)
+        assert breaker.state == CLOSED
+
+    def test_half_open_single_probe(self):
+        """Тест одного пробного запроса после reset_timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure(0)
+        assert breaker.allow(10)
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow(11)
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow(11)
+
+    def test_failed_probe_reopens(self):
+        """Тест повторного размыкания при ошибке пробного запроса."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+        for _ in range(3):
+            breaker.record_failure(0)
+        assert breaker.allow(10)
+        breaker.record_failure(10)
+        assert breaker.state == OPEN
+        assert not breaker.allow(15)
+
+    def test_lost_probe_is_replaced(self):
+        """Тест нового пробного запроса, если результат не записан."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure(0)
+        assert breaker.allow(10)
+        assert breaker.allow(20)
+
+
+class TestHostGuard:
+    """Тесты для класса HostGuard."""
+
+    def test_disabled_by_default(self):
+        """Тест отсутствия ограничений без настроек."""
+        guard = HostGuard()
+        for _ in range(10):
+            assert guard.reserve('https://example.com') == 0
+            guard.record_failure('https://example.com')
+        assert guard.state('https://example.com') == CLOSED
+
+    def test_rate_limit_per_host(self):
+        """Тест ограничения частоты запросов к одному хосту."""
+        guard = HostGuard(rate=10, burst=1)
+        assert guard.reserve('https://a.example/1') == 0
+        assert guard.reserve('https://A.example/2') > 0
+        assert guard.reserve('https://b.example/') == 0
+        stats = guard.stats()
+        assert stats['waits'] == 1
+        assert stats['wait_total'] == pytest.approx(0.1, abs=0.01)
+
+    def test_acquire_sleeps(self):
+        """Тест ожидания в acquire."""
+        guard = HostGuard(rate=20, burst=1)
+        guard.acquire('https://example.com')
+        started_at = time.monotonic()
+        waited = guard.acquire('https://example.com')
+        assert time.monotonic() - started_at >= waited > 0
+
+    def test_breaker_rejects_dead_host(self):
+        """Тест отклонения запросов к недоступному хосту."""
+        guard = HostGuard(failure_threshold=2, reset_timeout=60)
+        guard.record_failure('https://dead.example/a')
+        guard.record_failure('https://dead.example/b')
+        with pytest.raises(HostUnavailable):
+            guard.reserve('https://dead.example/c')
+        guard.reserve('https://alive.example/')
+        stats = guard.stats()
+        assert stats['rejected'] == 1
+        assert stats['opened'] == 1
+        assert stats['breakers'] == {'dead.example': OPEN}
+
+    def test_prune_idle_hosts(self):
+        """Тест удаления давно не использованных хостов."""
+        guard = HostGuard(rate=1, failure_threshold=3)
+        guard.reserve('https://idle.example/')
+        guard.record_failure('https://failing.example/')
+        guard.reserve('https://failing.example/')
+        guard._prune(time.monotonic() + 3600)
+        assert 'idle.example' not in guard._buckets
+        assert 'failing.example' in guard._breakers
+
+
+class TestCheckPath:
+    """Тесты предохранителя в проверке страниц."""
+
+    @pytest.fixture
+    def guard(self):
+        """Фикстура реестра с предохранителем после двух ошибок."""
+        guard = HostGuard(failure_threshold=2, reset_timeout=60)
+        with patch('page_analyzer.services.check_service.host_guard',
+                   guard):
+            yield guard
+
+    def test_dead_host_fails_fast(self, guard):
+        """Тест быстрого отказа после серии ошибок подключения."""
+        for _ in range(2):
+            result = CheckService.run_check(Url(1, DEAD_URL))
+            assert result['flash_message'] == (
+                'Не удалось подключиться к серверу'
+            )
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get'
+        ) as get:
+            result = CheckService.run_check(Url(1, DEAD_URL))
+        get.assert_not_called()
+        assert not result['success']
+        assert 'временно недоступен' in result['flash_message']
+        assert guard.state(DEAD_URL) == OPEN
+
+    def test_async_engine_uses_guard(self, guard):
+        """Тест предохранителя в асинхронном движке."""
+        httpx = pytest.importorskip('httpx')
+
+        async def check():
+            async with httpx.AsyncClient() as client:
+                return await AsyncCheckService.run_check(
+                    client, Url(1, DEAD_URL)
+                )
+
+        with patch('page_analyzer.services.async_check_service.host_guard',
+                   guard):
+            results = [asyncio.run(check()) for _ in range(3)]
+        assert [r['flash_message'][:10] for r in results] == [
+            'Не удалось', 'Не удалось', 'Сервер вре'
+        ]
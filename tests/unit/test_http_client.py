@@ -0,0 +1,117 @@
+"""Тесты для модуля http_client."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from page_analyzer.http_client import SessionManager
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Обработчик, запоминающий порт клиента и cookie каждого запроса."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'<html><title>ok</title></html>'
+        self.server.client_ports.append(self.client_address[1])
+        self.server.cookies.append(self.headers.get('Cookie'))
+        self.send_response(200)
+        self.send_header('Set-Cookie', 'session=secret; Path=/')
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Фикстура локального HTTP-сервера с keep-alive."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    server.client_ports = []
+    server.cookies = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def manager():
+    """Фикстура менеджера сессий."""
+    manager = SessionManager(pool_connections=2, pool_maxsize=2)
+    yield manager
+    manager.shutdown()
+
+
+def _url(server):
+    return f'http://127.0.0.1:{server.server_address[1]}/'
+
+
+class TestSessionManager:
+    """Тесты для класса SessionManager."""
+
+    def test_session_is_shared(self, manager):
+        """Тест повторного использования одной сессии."""
+        assert manager.get_session() is manager.get_session()
+
+    def test_connection_reused_between_requests(self, manager, server):
+        """Тест переиспользования соединения с хостом."""
+        for _ in range(3):
+            response = manager.get(_url(server), timeout=5)
+            assert response.status_code == 200
+            response.close()
+        assert len(set(server.client_ports)) == 1
+
+    def test_cookies_not_sent_to_next_check(self, manager, server):
+        """Тест, что cookie из ответа не отправляются в следующих запросах."""
+        for _ in range(2):
+            manager.get(_url(server), timeout=5).close()
+        assert server.cookies == [None, None]
+        assert not manager.get_session().cookies
+
+    def test_idle_hosts_evicted(self, server):
+        """Тест закрытия соединений простаивающего хоста."""
+        manager = SessionManager(idle_timeout=0)
+        manager.get(_url(server), timeout=5).close()
+        assert manager.evict_idle() == 1
+        manager.get(_url(server), timeout=5).close()
+        assert len(set(server.client_ports)) == 2
+        manager.shutdown()
+
+    def test_active_hosts_not_evicted(self, manager, server):
+        """Тест сохранения соединений активного хоста."""
+        manager.get(_url(server), timeout=5).close()
+        assert manager.evict_idle() == 0
+
+    def test_shutdown_recreates_session(self, manager):
+        """Тест создания новой сессии после закрытия."""
+        session = manager.get_session()
+        manager.shutdown()
+        assert manager.get_session() is not session
+
+    def test_new_session_after_fork(self, manager):
+        """Тест создания новой сессии в дочернем процессе."""
+        session = manager.get_session()
+        manager._pid = -1
+        assert manager.get_session() is not session
+
+    def test_concurrent_requests(self, server):
+        """Тест параллельных запросов через общую сессию."""
+        manager = SessionManager(pool_maxsize=4)
+
+        def fetch(_):
+            response = manager.get(_url(server), timeout=5)
+            response.close()
+            return response.status_code
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            statuses = list(executor.map(fetch, range(20)))
+        manager.shutdown()
+        assert statuses == [200] * 20
+        # Соединений не больше размера пула хоста и числа потоков
+        assert len(set(server.client_ports)) <= 4
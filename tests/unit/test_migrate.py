@@ -0,0 +1,133 @@
+"""Тесты для модуля migrate."""
+
+import json
+import pytest
+from page_analyzer.db import DatabaseConnection, add_url, add_check
+from page_analyzer.migrate import (
+    apply_migrations,
+    get_migrations,
+    get_pending_migrations,
+)
+
+
+def _plan_nodes(plan):
+    """Обход всех узлов плана EXPLAIN (FORMAT JSON)."""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _plan_nodes(child)
+
+
+def _explain(query, params):
+    """Получение узлов плана запроса без последовательного сканирования."""
+    with DatabaseConnection() as cursor:
+        # На маленьких таблицах планировщик предпочитает seq scan,
+        # поэтому проверяем, что индекс позволяет обойтись без сортировки
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('SET LOCAL enable_bitmapscan = off')
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {query}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(_plan_nodes(plan[0]['Plan']))
+
+
+class TestGetMigrations:
+    """Тесты для функции get_migrations."""
+
+    def test_migrations_are_ordered(self):
+        """Тест упорядоченности миграций по версии."""
+        versions = [migration.version for migration in get_migrations()]
+        assert versions == sorted(versions)
+        assert versions[0] == '0001'
+
+    def test_duplicate_versions(self, tmp_path):
+        """Тест ошибки при повторяющихся версиях."""
+        (tmp_path / '0001_a.sql').write_text('SELECT 1')
+        (tmp_path / '0001_b.sql').write_text('SELECT 1')
+        with pytest.raises(ValueError):
+            get_migrations(tmp_path)
+
+    def test_skips_unrelated_files(self, tmp_path):
+        """Тест пропуска файлов с неподходящим именем."""
+        (tmp_path / '0001_a.sql').write_text('SELECT 1')
+        (tmp_path / 'notes.sql').write_text('SELECT 1')
+        assert [m.name for m in get_migrations(tmp_path)] == ['0001_a']
+
+
+class TestApplyMigrations:
+    """Тесты для функции apply_migrations."""
+
+    def test_all_migrations_applied(self, test_db):
+        """Тест отсутствия неприменённых миграций после запуска."""
+        assert get_pending_migrations() == []
+        assert apply_migrations() == []
+
+    def test_apply_from_directory(self, test_db, tmp_path):
+        """Тест применения миграций из каталога и их идемпотентности."""
+        (tmp_path / '9001_test_table.sql').write_text(
+            'CREATE TABLE migrate_test (id int)'
+        )
+        (tmp_path / '9002_test_insert.sql').write_text(
+            'INSERT INTO migrate_test VALUES (1)'
+        )
+        try:
+            assert apply_migrations(target='9001', directory=tmp_path) == [
+                '9001_test_table'
+            ]
+            assert apply_migrations(directory=tmp_path) == [
+                '9002_test_insert'
+            ]
+            assert apply_migrations(directory=tmp_path) == []
+        finally:
+            with DatabaseConnection() as cursor:
+                cursor.execute('DROP TABLE IF EXISTS migrate_test')
+                cursor.execute(
+                    "DELETE FROM schema_migrations WHERE version LIKE '9%%'"
+                )
+
+    def test_failed_migration_rolled_back(self, test_db, tmp_path):
+        """Тест отката упавшей миграции."""
+        (tmp_path / '9001_broken.sql').write_text('SELECT * FROM missing')
+        with pytest.raises(Exception):
+            apply_migrations(directory=tmp_path)
+        assert [m.version for m in get_pending_migrations(tmp_path)] == [
+            '9001'
+        ]
+
+
+class TestUrlChecksIndex:
+    """Проверка планов горячих запросов к url_checks."""
+
+    @pytest.fixture
+    def url_id(self, test_db):
+        url_id = add_url('https://example.com')
+        for status_code in (200, 404, 500):
+            add_check({'url_id': url_id, 'status_code': status_code})
+        with DatabaseConnection() as cursor:
+            cursor.execute('ANALYZE url_checks')
+        return url_id
+
+    @pytest.mark.parametrize('query', [
+        'SELECT * FROM url_checks WHERE url_id = %s'
+        ' ORDER BY created_at DESC, id DESC LIMIT 1',
+        'SELECT * FROM url_checks WHERE url_id = %s'
+        ' ORDER BY created_at DESC, id DESC',
+    ])
+    def test_checks_by_url_use_ordered_index_scan(self, url_id, query):
+        """Тест выборки проверок URL по индексу без сортировки."""
+        nodes = _explain(query, (url_id, ))
+        node_types = [node['Node Type'] for node in nodes]
+        assert 'Sort' not in node_types
+        assert any(
+            node.get('Index Name') == 'idx_url_checks_url_id_created_at'
+            for node in nodes
+        )
+
+    def test_latest_status_uses_index_only_scan(self, url_id):
+        """Тест чтения последнего кода ответа только из индекса."""
+        nodes = _explain(
+            'SELECT status_code, created_at FROM url_checks'
+            ' WHERE url_id = %s ORDER BY created_at DESC, id DESC LIMIT 1',
+            (url_id, )
+        )
+        assert 'Index Only Scan' in [node['Node Type'] for node in nodes]
@@ -0,0 +1,137 @@
+"""Тесты для кэша результатов разбора."""
+
+import json
+import os
+from unittest.mock import patch
+from page_analyzer.parse_cache import ENTRY_OVERHEAD, ParseCache, parse_cache
+from page_analyzer.services import CheckService
+
+DATA = {'h1': 'H1', 'title': 'T', 'description': 'D'}
+
+
+def _entry_size(key):
+    # h1, title и description из DATA занимают 4 байта
+    return ENTRY_OVERHEAD + len(key) + 4
+
+
+class TestParseCache:
+    """Тесты для класса ParseCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Тест счётчиков попаданий и промахов."""
+        cache = ParseCache(max_bytes=10000)
+        key = ParseCache.make_key('abc', 'utf-8')
+        assert cache.get(key) is None
+        cache.put(key, DATA)
+        assert cache.get(key) == DATA
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses']) == (1, 1)
+        assert stats['entries'] == 1
+        assert stats['bytes'] == _entry_size(key)
+
+    def test_returns_copy(self):
+        """Тест защиты записи от изменения вызывающим кодом."""
+        cache = ParseCache(max_bytes=10000)
+        cache.put('k', DATA)
+        cache.get('k')['url_id'] = 1
+        assert cache.get('k') == DATA
+
+    def test_lru_eviction_by_bytes(self):
+        """Тест вытеснения давно не использованных записей по объёму."""
+        cache = ParseCache(max_bytes=_entry_size('k1') * 2)
+        cache.put('k1', DATA)
+        cache.put('k2', DATA)
+        cache.get('k1')
+        cache.put('k3', DATA)
+        assert cache.get('k2') is None
+        assert cache.get('k1') == DATA
+        assert cache.get('k3') == DATA
+        assert cache.stats()['evictions'] == 1
+
+    def test_oversized_entry_not_stored(self):
+        """Тест пропуска записи больше объёма кэша."""
+        cache = ParseCache(max_bytes=ENTRY_OVERHEAD)
+        cache.put('k', DATA)
+        assert cache.stats()['entries'] == 0
+
+    def test_disabled(self):
+        """Тест отключённого кэша."""
+        cache = ParseCache(max_bytes=0)
+        cache.put('k', DATA)
+        assert cache.get('k') is None
+        assert cache.stats()['misses'] == 0
+
+    def test_disk_tier_shared_between_instances(self, tmp_path):
+        """Тест общего дискового уровня кэша."""
+        ParseCache(max_bytes=10000, directory=str(tmp_path)).put('ab1', DATA)
+        other = ParseCache(max_bytes=10000, directory=str(tmp_path))
+        assert other.get('ab1') == DATA
+        assert other.get('ab1') == DATA
+        stats = other.stats()
+        assert (stats['disk_hits'], stats['hits']) == (1, 1)
+
+    def test_corrupted_disk_entry_ignored(self, tmp_path):
+        """Тест пропуска повреждённой записи на диске."""
+        cache = ParseCache(max_bytes=10000, directory=str(tmp_path))
+        cache.put('ab1', DATA)
+        (tmp_path / 'ab' / 'ab1.json').write_text('{broken')
+        cache.clear()
+        assert cache.get('ab1') is None
+
+
+    def test_disk_tier_size_limit(self, tmp_path):
+        """Тест удаления давно не использованных записей с диска."""
+        size = len(json.dumps(DATA, ensure_ascii=False))
+        cache = ParseCache(
+            max_bytes=10000, directory=str(tmp_path),
+            max_disk_bytes=size * 3 + size // 2
+        )
+        for number, key in enumerate(['ab1', 'ab2', 'ab3']):
+            cache.put(key, DATA)
+            os.utime(tmp_path / 'ab' / f'{key}.json', (number, number))
+        # Чтение с диска отмечает запись как использованную
+        assert ParseCache(max_bytes=10000, directory=str(tmp_path)).get(
+            'ab1'
+        ) == DATA
+
+        cache.put('ab4', DATA)
+
+        names = sorted(os.listdir(tmp_path / 'ab'))
+        assert names == ['ab1.json', 'ab3.json', 'ab4.json']
+        assert cache.stats()['disk_evictions'] == 1
+
+    def test_failed_disk_write_removes_temp_file(self, tmp_path):
+        """Тест удаления временного файла при ошибке записи."""
+        cache = ParseCache(max_bytes=10000, directory=str(tmp_path))
+        with patch(
+            'page_analyzer.parse_cache.json.dump', side_effect=OSError
+        ):
+            cache.put('ab1', DATA)
+        assert os.listdir(tmp_path / 'ab') == []
+
+
+class TestParseBodyCache:
+    """Тесты разбора страниц через кэш."""
+
+    def test_identical_bodies_parsed_once(self):
+        """Тест однократного разбора одинаковых страниц."""
+        parse_cache.clear()
+        body = b'<h1>Parked</h1>'
+        with patch(
+            'page_analyzer.services.check_service.parse',
+            return_value=dict(DATA)
+        ) as parse:
+            for _ in range(3):
+                assert CheckService._parse_body(
+                    body, 'hash', 'utf-8'
+                ) == DATA
+        parse.assert_called_once()
+        assert parse_cache.stats()['hits'] == 2
+
+    def test_encoding_is_part_of_key(self):
+        """Тест разных записей для разных кодировок одного тела."""
+        parse_cache.clear()
+        body = 'Тест'.encode('cp1251')
+        CheckService._parse_body(b'<h1>' + body, 'hash', 'cp1251')
+        data = CheckService._parse_body(b'<h1>' + body, 'hash', 'koi8-r')
+        assert data['h1'] != 'Тест'
@@ -0,0 +1,93 @@
+"""Тесты для пула процессов разбора страниц."""
+
+import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from collections import namedtuple
+from unittest.mock import Mock, patch
+import pytest
+from page_analyzer.parse_cache import parse_cache
+from page_analyzer.parse_pool import ParsePool, parse_document
+from page_analyzer.services import CheckService
+
+HTML = '<title>T</title><meta name="description" content="D"><h1>Тест</h1>'
+
+
+def _run_check(pool):
+    """Проверка страницы-заглушки с разбором в указанном пуле."""
+    response = Mock()
+    response.status_code = 200
+    response.history = []
+    response.headers = {'Content-Type': 'text/html; charset=utf-8'}
+    response.iter_content.return_value = [HTML.encode()]
+    url = namedtuple('Url', 'id name')(1, 'https://example.com')
+    with patch(
+        'page_analyzer.services.check_service.session_manager.get',
+        return_value=response
+    ), patch('page_analyzer.services.check_service.parse_pool', pool):
+        return CheckService.run_check(url)
+
+
+@pytest.fixture
+def pool():
+    """Фикстура пула из двух процессов."""
+    pool = ParsePool(workers=2, timeout=60)
+    parse_cache.clear()
+    yield pool
+    pool.shutdown()
+
+
+def test_parse_document_decodes_bytes():
+    """Тест разбора тела ответа в байтах."""
+    assert parse_document(HTML.encode('cp1251'), 'cp1251') == {
+        'h1': 'Тест', 'title': 'T', 'description': 'D'
+    }
+
+
+class TestParsePool:
+    """Тесты для класса ParsePool."""
+
+    def test_disabled_pool_parses_inline(self):
+        """Тест разбора в текущем процессе при отключённом пуле."""
+        pool = ParsePool(workers=0)
+        assert not pool.enabled
+        assert pool.parse(HTML.encode(), 'utf-8')['h1'] == 'Тест'
+        assert pool._executor is None
+
+    def test_parses_in_worker_processes(self, pool):
+        """Тест разбора в отдельных процессах."""
+        futures = [pool.submit(HTML.encode(), 'utf-8') for _ in range(4)]
+        results = [future.result(timeout=60) for future in futures]
+        assert all(result['h1'] == 'Тест' for result in results)
+        assert os.getpid() not in {
+            process.pid for process in pool._executor._processes.values()
+        }
+
+    def test_configure_restarts_pool(self, pool):
+        """Тест изменения количества процессов."""
+        assert pool.parse(HTML.encode(), 'utf-8')['title'] == 'T'
+        pool.configure(0)
+        assert pool._executor is None
+        assert not pool.enabled
+
+    def test_run_check_uses_pool(self, pool):
+        """Тест разбора страницы проверки в пуле процессов."""
+        result = _run_check(pool)
+        assert result['success']
+        assert result['data']['h1'] == 'Тест'
+        assert pool._executor is not None
+
+    def test_parse_timeout_fails_check(self, pool):
+        """Тест неуспешной проверки при превышении времени разбора."""
+        with patch.object(pool, 'parse', side_effect=FutureTimeoutError):
+            result = _run_check(pool)
+        assert not result['success']
+        assert result['flash_message'] == 'Не удалось разобрать страницу'
+
+    def test_parse_timeout_cancels_future(self, pool):
+        """Тест отмены разбора при превышении времени ожидания."""
+        future = Mock()
+        future.result.side_effect = FutureTimeoutError
+        with patch.object(pool, 'submit', return_value=future):
+            with pytest.raises(FutureTimeoutError):
+                pool.parse(HTML.encode(), 'utf-8')
+        future.cancel.assert_called_once()
@@ -1,7 +1,52 @@
 """Тесты для модуля parser."""
 
+from pathlib import Path
 import pytest
-from page_analyzer.parser import parse, MAX_FIELD_LENGTH
+from page_analyzer.cli import main
+from page_analyzer.parser import (
+    BACKENDS,
+    DEFAULT_BACKEND,
+    MAX_FIELD_LENGTH,
+    StreamingExtractor,
+    benchmark_backends,
+    config,
+    get_backend,
+    parse,
+)
+
+PAGES_DIR = Path(__file__).parent.parent / 'fixtures' / 'pages'
+
+# Ожидаемый результат разбора страниц корпуса
+EXPECTED_PAGES = {
+    'article.html': {
+        'h1': 'Как работает HTTP-кэширование',
+        'title': 'Как работает HTTP-кэширование | Блог',
+        'description': 'Разбираем заголовки ETag и Last-Modified на примерах.',
+    },
+    'landing.html': {
+        'h1': 'Servers that scale with you',
+        'title': 'Fast VPS Hosting',
+        'description': 'Fast VPS hosting & managed servers',
+    },
+    'no_h1.html': {'h1': '', 'title': 'Parked domain', 'description': ''},
+    'minimal.html': {'h1': '', 'title': '', 'description': ''},
+}
+
+# Документы, на которых все реализации должны давать одинаковый результат
+CONFORMANCE_CASES = [
+    '',
+    '<h1>a<!-- comment -->b</h1>',
+    '<h1>a<script>x()</script><style>p {}</style>b</h1>',
+    '<title>a &amp; b</title><h1>&nbsp;x&#39;</h1>',
+    '<h1>Unclosed <span>h1',
+    '<meta name="description">',
+    '<meta name="Description" content="case">',
+    '<meta name="description" content="first">'
+    '<meta name="description" content="second">',
+    '<body><h1>a</h1><title>late</title>'
+    '<meta name="description" content="late"></body>',
+    '<h1>Привет</h1>',
+]
 
 
 class TestParser:
@@ -122,3 +167,146 @@ class TestParser:
         assert result['title'] == 'Test Title'
         assert result['h1'] == 'Test H1'
 
+
+def _feed_by_char(html):
+    """Подача документа в потоковый парсер по одному символу."""
+    extractor = StreamingExtractor()
+    for char in html:
+        extractor.feed(char)
+    extractor.close()
+    return extractor
+
+
+class TestStreamingExtractor:
+    """Тесты потокового извлечения SEO-данных."""
+
+    @pytest.mark.parametrize('html', [
+        '',
+        '<title>  T &amp; T </title><meta name="description" content=" D ">'
+        '<h1>A <b>bold</b> h1</h1><h1>Second</h1>',
+        '<h1>Only h1</h1>',
+        '<meta name="description"><title></title>',
+        '<meta name="keywords" content="k">'
+        '<meta name="description" content="first">'
+        '<meta name="description" content="second">',
+        f'<title>{"a" * (MAX_FIELD_LENGTH + 10)}</title>',
+        '<h1>Unclosed <span>h1',
+        '<h1>A<script>x</script>B</h1>',
+        '<h1>a<script>x()</script><style>p {}</style>b</h1><title>T</title>',
+    ])
+    def test_same_result_as_parse(self, html):
+        """Тест совпадения результата с parse при подаче по символу."""
+        assert _feed_by_char(html).result() == parse(html)
+
+    def test_done_when_all_fields_found(self):
+        """Тест признака завершения после нахождения всех полей."""
+        extractor = StreamingExtractor()
+        extractor.feed('<title>T</title><meta name="description" content="D">')
+        assert not extractor.done
+        extractor.feed('<body><h1>H')
+        assert not extractor.done
+        extractor.feed('</h1>')
+        assert extractor.done
+
+    def test_not_done_without_description(self):
+        """Тест чтения до конца документа без description."""
+        extractor = _feed_by_char('<title>T</title><h1>H</h1><p>text</p>')
+        assert not extractor.done
+        assert extractor.result()['description'] == ''
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def backend(request):
+    """Фикстура, перебирающая все установленные реализации разбора."""
+    return request.param
+
+
+class TestBackendConformance:
+    """Проверка одинакового результата всех реализаций разбора."""
+
+    @pytest.mark.parametrize('page', sorted(EXPECTED_PAGES))
+    def test_corpus_pages(self, backend, page):
+        """Тест разбора страниц корпуса."""
+        html = (PAGES_DIR / page).read_text(encoding='utf-8')
+        assert parse(html, backend=backend) == EXPECTED_PAGES[page]
+
+    @pytest.mark.parametrize('html', CONFORMANCE_CASES)
+    def test_same_as_default_backend(self, backend, html):
+        """Тест совпадения результата с реализацией по умолчанию."""
+        assert parse(html, backend=backend) == parse(
+            html, backend=DEFAULT_BACKEND
+        )
+
+    def test_truncates_long_fields(self, backend):
+        """Тест обрезки длинных полей."""
+        long_text = 'a' * (MAX_FIELD_LENGTH + 100)
+        result = parse(
+            f'<title>{long_text}</title><h1>{long_text}</h1>'
+            f'<meta name="description" content="{long_text}">',
+            backend=backend
+        )
+        assert all(len(value) == MAX_FIELD_LENGTH for value in result.values())
+
+
+class TestGetBackend:
+    """Тесты выбора реализации разбора."""
+
+    def test_backend_from_config(self, monkeypatch):
+        """Тест выбора реализации из настройки PARSER_BACKEND."""
+        monkeypatch.setattr(config, 'PARSER_BACKEND', 'html.parser')
+        assert get_backend()[0] == 'html.parser'
+
+    def test_auto_prefers_fastest_installed(self):
+        """Тест выбора самой быстрой установленной реализации."""
+        name, _ = get_backend('auto')
+        for fastest in ('selectolax', 'lxml'):
+            if fastest in BACKENDS:
+                assert name == fastest
+                break
+        else:
+            assert name == DEFAULT_BACKEND
+
+    def test_unknown_backend(self):
+        """Тест ошибки при неизвестной реализации."""
+        with pytest.raises(ValueError):
+            get_backend('regex')
+
+    def test_missing_backend_falls_back(self, monkeypatch):
+        """Тест замены неустановленной реализации на html.parser."""
+        monkeypatch.delitem(BACKENDS, 'lxml', raising=False)
+        assert get_backend('lxml')[0] == DEFAULT_BACKEND
+
+    def test_optional_backends(self):
+        """Тест регистрации реализаций на установленных библиотеках."""
+        for name, module in (('lxml', 'lxml'), ('selectolax', 'selectolax')):
+            try:
+                __import__(module)
+            except ImportError:
+                assert name not in BACKENDS
+            else:
+                assert name in BACKENDS
+
+
+class TestBenchmarkBackends:
+    """Тесты измерения скорости реализаций разбора."""
+
+    def test_reports_pages_per_second(self):
+        """Тест результата измерения по всем реализациям."""
+        documents = [
+            path.read_text(encoding='utf-8')
+            for path in sorted(PAGES_DIR.glob('*.html'))
+        ]
+        results = benchmark_backends(documents, repeat=2)
+        assert set(results) == set(BACKENDS)
+        assert all(rate > 0 for rate in results.values())
+
+    def test_bench_parsers_command(self, capsys):
+        """Тест команды bench-parsers."""
+        assert main(['bench-parsers', str(PAGES_DIR), '--repeat', '1']) == 0
+        output = capsys.readouterr().out
+        assert 'Страниц в корпусе: 4' in output
+        assert all(name in output for name in BACKENDS)
+
+    def test_bench_parsers_empty_corpus(self, tmp_path):
+        """Тест команды bench-parsers на пустом каталоге."""
+        assert main(['bench-parsers', str(tmp_path)]) == 1
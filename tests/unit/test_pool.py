@@ -0,0 +1,109 @@
+"""Тесты для модуля pool."""
+
+import pytest
+from page_analyzer.db import DatabaseConnection
+from page_analyzer.pool import ConnectionPool, PoolTimeout
+
+
+@pytest.fixture
+def pool(test_db):
+    """Фикстура пула подключений к тестовой БД."""
+    pool = ConnectionPool(test_db, min_size=1, max_size=2, timeout=0.1)
+    yield pool
+    pool.closeall()
+
+
+class TestConnectionPool:
+    """Тесты для класса ConnectionPool."""
+
+    def test_invalid_sizes(self):
+        """Тест ошибки при некорректных размерах пула."""
+        with pytest.raises(ValueError):
+            ConnectionPool('dsn', min_size=3, max_size=2)
+
+    def test_prefill_opens_min_connections(self, pool):
+        """Тест открытия минимального количества подключений."""
+        pool.prefill()
+        assert pool.size == 1
+
+    def test_connection_is_reused(self, pool):
+        """Тест повторного использования возвращённого подключения."""
+        conn = pool.getconn()
+        pool.putconn(conn)
+        assert pool.getconn() is conn
+
+    def test_timeout_when_exhausted(self, pool):
+        """Тест таймаута при исчерпании пула."""
+        pool.getconn()
+        pool.getconn()
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+
+    def test_closed_connection_is_replaced(self, pool):
+        """Тест замены закрытого подключения при выдаче."""
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.close()
+        new_conn = pool.getconn()
+        assert new_conn is not conn
+        assert not new_conn.closed
+
+    def test_health_check_on_borrow(self, test_db):
+        """Тест проверки подключения запросом перед выдачей."""
+        pool = ConnectionPool(test_db, max_size=1, health_check_interval=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        assert pool.getconn() is conn
+        pool.closeall()
+
+    def test_broken_connection_is_not_returned(self, pool):
+        """Тест закрытия подключения, возвращённого как сломанное."""
+        conn = pool.getconn()
+        pool.putconn(conn, close=True)
+        assert conn.closed
+        assert pool.size == 0
+
+    def test_reset_after_fork(self, pool):
+        """Тест сброса пула в дочернем процессе."""
+        conn = pool.getconn()
+        pool.putconn(conn)
+        pool._pid = -1
+        new_conn = pool.getconn()
+        assert new_conn is not conn
+        # Подключение родителя не закрывается в дочернем процессе
+        assert not conn.closed
+
+
+class TestDatabaseConnectionPooled:
+    """Тесты работы DatabaseConnection через пул."""
+
+    def test_pooled_connection_reused(self, test_db):
+        """Тест возврата подключения в пул после выхода из контекста."""
+        with DatabaseConnection(pooled=True) as cursor:
+            first = cursor.connection
+        with DatabaseConnection(pooled=True) as cursor:
+            second = cursor.connection
+        assert first is second
+        assert not first.closed
+
+    def test_pooled_rollback_on_exception(self, test_db):
+        """Тест отката транзакции перед возвратом подключения в пул."""
+        with pytest.raises(ValueError):
+            with DatabaseConnection(pooled=True) as cursor:
+                cursor.execute(
+                    "INSERT INTO urls (name, created_at) "
+                    "VALUES ('https://pool.com', now())"
+                )
+                raise ValueError('Тестовое исключение')
+        with DatabaseConnection(pooled=True) as cursor:
+            cursor.execute(
+                "SELECT * FROM urls WHERE name = 'https://pool.com'"
+            )
+            assert cursor.fetchone() is None
+
+    def test_unpooled_connection_closed(self, test_db):
+        """Тест закрытия подключения без пула."""
+        conn = DatabaseConnection(pooled=False)
+        with conn:
+            pass
+        assert conn.connection.closed
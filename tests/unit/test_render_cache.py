@@ -0,0 +1,191 @@
+"""Тесты для кэша отрисованных фрагментов страниц."""
+
+import os
+from unittest.mock import patch
+import pytest
+from page_analyzer.render_cache import (
+    URLS_TAG,
+    CacheBackend,
+    FileBackend,
+    MemoryBackend,
+    RenderCache,
+    url_tag,
+)
+
+
+class Renderer:
+    """Функция отрисовки с подсчётом вызовов."""
+
+    def __init__(self, value='<p>fragment</p>'):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Фикстура управляемого времени для проверки TTL."""
+    now = [1000.0]
+    monkeypatch.setattr(
+        'page_analyzer.render_cache.time.monotonic', lambda: now[0]
+    )
+    return now
+
+
+class TestRenderCache:
+    """Тесты для RenderCache."""
+
+    def test_disabled_always_renders(self):
+        """Тест отключённого кэша."""
+        cache = RenderCache(max_bytes=0)
+        render = Renderer()
+        assert cache.get_or_render('/urls', [URLS_TAG], render) == render.value
+        assert cache.get_or_render('/urls', [URLS_TAG], render) == render.value
+        assert render.calls == 2
+        assert cache.stats()['entries'] == 0
+
+    def test_hit_after_render(self):
+        """Тест повторного запроса из кэша."""
+        cache = RenderCache(max_bytes=10000)
+        render = Renderer()
+        cache.get_or_render('/urls', [URLS_TAG], render)
+        assert cache.get_or_render('/urls', [URLS_TAG], render) == render.value
+        assert render.calls == 1
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+
+    def test_none_not_cached(self):
+        """Тест, что отсутствие данных не кэшируется."""
+        cache = RenderCache(max_bytes=10000)
+        render = Renderer(value=None)
+        assert cache.get_or_render('/urls/1', [url_tag(1)], render) is None
+        assert cache.get_or_render('/urls/1', [url_tag(1)], render) is None
+        assert render.calls == 2
+
+    def test_ttl_expiry(self, clock):
+        """Тест истечения срока хранения фрагмента."""
+        cache = RenderCache(max_bytes=10000, ttl=5)
+        render = Renderer()
+        cache.get_or_render('/urls', [URLS_TAG], render)
+        clock[0] += 4
+        cache.get_or_render('/urls', [URLS_TAG], render)
+        assert render.calls == 1
+        clock[0] += 2
+        cache.get_or_render('/urls', [URLS_TAG], render)
+        assert render.calls == 2
+
+    def test_lru_eviction_by_size(self):
+        """Тест вытеснения давно не использованных фрагментов по объёму."""
+        cache = RenderCache(max_bytes=3 * 300)
+        renders = {key: Renderer('x' * 90) for key in ('a', 'b', 'c', 'd')}
+        for key in ('a', 'b', 'c'):
+            cache.get_or_render(key, [], renders[key])
+        cache.get_or_render('a', [], renders['a'])
+        cache.get_or_render('d', [], renders['d'])
+
+        assert cache.stats()['evictions'] == 1
+        cache.get_or_render('a', [], renders['a'])
+        cache.get_or_render('b', [], renders['b'])
+        assert renders['a'].calls == 1
+        assert renders['b'].calls == 2
+        assert cache.stats()['bytes'] <= cache.max_bytes
+
+    def test_oversized_fragment_not_cached(self):
+        """Тест, что фрагмент больше лимита не кэшируется."""
+        cache = RenderCache(max_bytes=500)
+        render = Renderer('x' * 1000)
+        cache.get_or_render('/urls', [URLS_TAG], render)
+        cache.get_or_render('/urls', [URLS_TAG], render)
+        assert render.calls == 2
+        assert cache.stats()['bytes'] == 0
+
+    def test_invalidate_by_tag(self):
+        """Тест инвалидации только фрагментов с изменившейся меткой."""
+        cache = RenderCache(max_bytes=10000)
+        urls_render = Renderer()
+        url1_render = Renderer()
+        url2_render = Renderer()
+        cache.get_or_render('/urls', [URLS_TAG], urls_render)
+        cache.get_or_render('/urls/1', [url_tag(1)], url1_render)
+        cache.get_or_render('/urls/2', [url_tag(2)], url2_render)
+
+        cache.invalidate_urls([1])
+        cache.get_or_render('/urls', [URLS_TAG], urls_render)
+        cache.get_or_render('/urls/1', [url_tag(1)], url1_render)
+        cache.get_or_render('/urls/2', [url_tag(2)], url2_render)
+
+        assert urls_render.calls == 2
+        assert url1_render.calls == 2
+        assert url2_render.calls == 1
+        assert cache.stats()['invalidations'] == 2
+
+
+class TestSharedBackend:
+    """Тесты согласованности кэшей воркеров через общее хранилище."""
+
+    @pytest.fixture(params=['memory', 'file'])
+    def backend(self, request, tmp_path):
+        if request.param == 'memory':
+            return MemoryBackend()
+        return FileBackend(str(tmp_path))
+
+    def test_fragment_shared_between_workers(self, backend):
+        """Тест, что фрагмент, отрисованный одним воркером, виден другому."""
+        first = RenderCache(max_bytes=10000, backend=backend)
+        second = RenderCache(max_bytes=10000, backend=backend)
+        render = Renderer()
+        first.get_or_render('/urls', [URLS_TAG], render)
+        assert second.get_or_render('/urls', [URLS_TAG], render) == (
+            render.value
+        )
+        assert render.calls == 1
+        assert second.stats()['shared_hits'] == 1
+
+    def test_invalidation_visible_to_other_workers(self, backend):
+        """Тест, что инвалидация в одном воркере видна другому."""
+        first = RenderCache(max_bytes=10000, backend=backend)
+        second = RenderCache(max_bytes=10000, backend=backend)
+        old = Renderer('<p>old</p>')
+        new = Renderer('<p>new</p>')
+        second.get_or_render('/urls/1', [url_tag(1)], old)
+
+        first.invalidate_urls([1])
+
+        assert second.get_or_render('/urls/1', [url_tag(1)], new) == (
+            '<p>new</p>'
+        )
+        assert new.calls == 1
+
+    def test_backend_ttl(self, backend, monkeypatch):
+        """Тест истечения срока хранения в общем хранилище."""
+        backend.set('key', 'value', 10)
+        assert backend.get('key') == 'value'
+        backend.set('key', 'value', -1)
+        assert backend.get('key') is None
+        assert backend.get('missing') is None
+
+    def test_file_backend_failed_write_removes_temp_file(self, tmp_path):
+        """Тест удаления временного файла при ошибке записи."""
+        backend = FileBackend(str(tmp_path))
+        with patch(
+            'page_analyzer.render_cache.json.dump', side_effect=OSError
+        ):
+            backend.set('key', 'value', None)
+        assert [
+            name for _, _, names in os.walk(tmp_path) for name in names
+        ] == []
+        assert backend.get('key') is None
+
+    def test_incomplete_backend_rejected(self):
+        """Тест, что хранилище без get/set нельзя создать."""
+        class GetOnly(CacheBackend):
+            def get(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            GetOnly()
@@ -0,0 +1,204 @@
+"""Тесты для планировщика повторных проверок."""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+from page_analyzer.cli import main
+from page_analyzer.config import config
+from page_analyzer.db import (
+    DatabaseConnection,
+    add_url,
+    claim_due_urls,
+    get_checks_by_url_id,
+    get_url_by_id,
+    set_check_schedule,
+)
+from page_analyzer.scheduler import CheckScheduler
+
+
+def _mock_response(html):
+    """Создание мока успешного HTTP-ответа."""
+    response = Mock()
+    response.status_code = 200
+    response.headers = {'Content-Type': 'text/html'}
+    response.history = []
+    response.iter_content.return_value = [html.encode()]
+    return response
+
+
+def _make_due(*url_ids):
+    """Перенос следующей проверки URL в прошлое."""
+    with DatabaseConnection() as cursor:
+        cursor.execute(
+            "UPDATE urls SET next_check_at = now() - interval '1 minute' "
+            "WHERE id = ANY(%s)",
+            (list(url_ids), )
+        )
+
+
+class TestSchedule:
+    """Тесты для функций расписания в БД."""
+
+    def test_set_schedule_spreads_first_check(self, test_db):
+        """Тест назначения первой проверки внутри интервала."""
+        ids = [add_url(f'https://example{i}.com') for i in range(3)]
+        assert set_check_schedule(3600, ids=ids[:2]) == 2
+        first = get_url_by_id(ids[0])
+        assert first.check_interval == 3600
+        assert first.next_check_at is not None
+        assert get_url_by_id(ids[2]).next_check_at is None
+
+    def test_set_schedule_off(self, test_db):
+        """Тест снятия URL с расписания."""
+        url_id = add_url('https://example.com')
+        set_check_schedule(60)
+        set_check_schedule(None, ids=[url_id])
+        url = get_url_by_id(url_id)
+        assert url.check_interval is None
+        assert url.next_check_at is None
+
+    def test_claim_due_urls_reschedules(self, test_db):
+        """Тест захвата просроченных URL и переноса их проверки."""
+        due, later = (add_url(f'https://example{i}.com') for i in range(2))
+        set_check_schedule(3600)
+        _make_due(due)
+        claimed = claim_due_urls(10, jitter=0.1)
+        assert [url.id for url in claimed] == [due]
+        assert claim_due_urls(10) == []
+
+        with DatabaseConnection() as cursor:
+            cursor.execute(
+                'SELECT extract(epoch FROM next_check_at - now()) AS delay '
+                'FROM urls WHERE id = %s', (due, )
+            )
+            delay = cursor.fetchone().delay
+        assert 3600 * 0.9 - 5 <= delay <= 3600 * 1.1
+
+    def test_claim_due_urls_limit_and_order(self, test_db):
+        """Тест захвата самых просроченных URL в пределах лимита."""
+        ids = [add_url(f'https://example{i}.com') for i in range(3)]
+        set_check_schedule(60)
+        with DatabaseConnection() as cursor:
+            for minutes, url_id in zip((1, 3, 2), ids):
+                cursor.execute(
+                    'UPDATE urls SET next_check_at = '
+                    "now() - %s * interval '1 minute' WHERE id = %s",
+                    (minutes, url_id)
+                )
+        assert [url.id for url in claim_due_urls(2)] == [ids[1], ids[2]]
+
+
+class TestCheckScheduler:
+    """Тесты для класса CheckScheduler."""
+
+    def test_run_once_checks_due_urls(self, test_db):
+        """Тест проверки URL, у которых подошёл срок."""
+        url_id = add_url('https://example.com')
+        set_check_schedule(3600)
+        _make_due(url_id)
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get',
+            return_value=_mock_response('<h1>Scheduled</h1>')
+        ):
+            assert CheckScheduler().run_once() == 1
+            assert CheckScheduler().run_once() == 0
+        assert get_checks_by_url_id(url_id)[0].h1 == 'Scheduled'
+
+    def test_run_once_enqueues_in_async_mode(self, test_db, monkeypatch):
+        """Тест постановки проверок в очередь при CHECKS_ASYNC."""
+        monkeypatch.setattr(config, 'CHECKS_ASYNC', True)
+        url_id = add_url('https://example.com')
+        set_check_schedule(3600)
+        _make_due(url_id)
+        with patch('page_analyzer.scheduler.CheckService.enqueue_check',
+                   return_value={'job_id': 1}) as enqueue:
+            CheckScheduler().run_once()
+        enqueue.assert_called_once_with(url_id)
+        assert get_checks_by_url_id(url_id) == []
+
+    def test_failed_dispatch_does_not_stop_batch(self, test_db):
+        """Тест продолжения порции при ошибке проверки одного URL."""
+        ids = [add_url(f'https://example{i}.com') for i in range(2)]
+        set_check_schedule(3600)
+        _make_due(*ids)
+        with patch(
+            'page_analyzer.scheduler.CheckService.check_url',
+            side_effect=[RuntimeError('boom'), {'success': True}]
+        ) as check_url:
+            assert CheckScheduler().run_once() == 2
+        assert check_url.call_count == 2
+
+    def test_run_forever_claims_freed_slots(self, test_db):
+        """Тест захвата нового URL, не дожидаясь медленной проверки."""
+        ids = [
+            add_url(f'https://{name}.com') for name in ('slow', 'fast', 'last')
+        ]
+        set_check_schedule(3600)
+        _make_due(*ids)
+        with DatabaseConnection() as cursor:
+            # Медленный URL захватывается первым
+            cursor.execute(
+                "UPDATE urls SET next_check_at = now() - interval '1 hour' "
+                "WHERE id = %s",
+                (ids[0], )
+            )
+        release = threading.Event()
+        checked = []
+
+        def check_url(url_id, writer=None):
+            if url_id == ids[0]:
+                release.wait(10)
+            checked.append(url_id)
+            return {'success': True}
+
+        scheduler = CheckScheduler(
+            concurrency=2, batch_size=2, poll_interval=0.01
+        )
+        with patch(
+            'page_analyzer.scheduler.CheckService.check_url',
+            side_effect=check_url
+        ):
+            thread = threading.Thread(target=scheduler.run_forever)
+            thread.start()
+            try:
+                deadline = time.monotonic() + 10
+                while ids[2] not in checked:
+                    assert time.monotonic() < deadline
+                    time.sleep(0.01)
+                assert ids[0] not in checked
+            finally:
+                release.set()
+                scheduler.stop()
+                thread.join(10)
+        assert sorted(checked) == sorted(ids)
+
+    def test_stop(self, test_db):
+        """Тест остановки планировщика."""
+        scheduler = CheckScheduler(poll_interval=0.01)
+        scheduler.stop()
+        scheduler.run_forever()
+        assert scheduler.writer is None
+
+
+class TestScheduleCommands:
+    """Тесты для команд schedule и scheduler."""
+
+    def test_schedule_command(self, test_db, capsys):
+        """Тест постановки URL на расписание из командной строки."""
+        url_id = add_url('https://example.com')
+        assert main(['schedule', '--interval', '600',
+                     '--ids', str(url_id)]) == 0
+        assert 'Поставлено на расписание URL: 1' in capsys.readouterr().out
+        assert get_url_by_id(url_id).check_interval == 600
+
+        assert main(['schedule', '--off']) == 0
+        assert get_url_by_id(url_id).check_interval is None
+
+    def test_schedule_command_rejects_bad_interval(self, test_db):
+        """Тест отказа при неположительном интервале."""
+        assert main(['schedule', '--interval', '0']) == 1
+
+    def test_scheduler_once(self, test_db, capsys):
+        """Тест однократного запуска планировщика."""
+        assert main(['scheduler', '--once']) == 0
+        assert 'Проверено URL по расписанию: 0' in capsys.readouterr().out
@@ -0,0 +1,140 @@
+"""Тесты для модуля worker."""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+import requests
+from page_analyzer.check_writer import CheckWriter
+from page_analyzer.db import (
+    add_url,
+    enqueue_check_job,
+    get_check_job,
+    get_checks_by_url_id,
+)
+from page_analyzer.worker import CheckWorker
+
+
+def _mock_response(html):
+    """Создание мока успешного HTTP-ответа."""
+    response = Mock()
+    response.status_code = 200
+    response.headers = {'Content-Type': 'text/html'}
+    response.history = []
+    response.iter_content.return_value = [html.encode()]
+    return response
+
+
+class TestCheckWorker:
+    """Тесты для класса CheckWorker."""
+
+    def test_run_once_empty_queue(self, test_db):
+        """Тест обработки пустой очереди."""
+        assert CheckWorker().run_once() == 0
+
+    def test_run_once_processes_jobs(self, test_db):
+        """Тест выполнения задач из очереди."""
+        url_id = add_url('https://example.com')
+        job = enqueue_check_job(url_id)
+        response = _mock_response('<html><h1>Queued</h1></html>')
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get',
+            return_value=response
+        ):
+            assert CheckWorker().run_once() == 1
+
+        finished = get_check_job(job.id)
+        assert finished.status == 'done'
+        assert finished.message == 'Страница успешно проверена'
+        assert get_checks_by_url_id(url_id)[0].h1 == 'Queued'
+
+    def test_failed_check_marks_job_failed(self, test_db):
+        """Тест завершения задачи с ошибкой проверки."""
+        job = enqueue_check_job(add_url('https://example.com'))
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get',
+            side_effect=requests.exceptions.Timeout('timeout')
+        ):
+            CheckWorker().run_once()
+        finished = get_check_job(job.id)
+        assert finished.status == 'failed'
+        assert 'время ожидания' in finished.message
+
+    def test_run_forever_claims_freed_slots(self, test_db):
+        """Тест захвата новой задачи, не дожидаясь медленной."""
+        slow, fast, last = [
+            enqueue_check_job(add_url(f'https://{name}.com'))
+            for name in ('slow', 'fast', 'last')
+        ]
+        release = threading.Event()
+
+        def get(url, **kwargs):
+            if 'slow' in url:
+                release.wait(10)
+            return _mock_response('<html></html>')
+
+        worker = CheckWorker(concurrency=2, poll_interval=0.01)
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get',
+            side_effect=get
+        ):
+            thread = threading.Thread(target=worker.run_forever)
+            thread.start()
+            try:
+                deadline = time.monotonic() + 10
+                while get_check_job(last.id).status != 'done':
+                    assert time.monotonic() < deadline
+                    time.sleep(0.05)
+                assert get_check_job(slow.id).status == 'running'
+            finally:
+                release.set()
+                worker.stop()
+                thread.join(10)
+        assert get_check_job(slow.id).status == 'done'
+        assert get_check_job(fast.id).status == 'done'
+
+    def test_run_once_with_writer(self, test_db):
+        """Тест завершения задачи после записи проверки из буфера."""
+        url_id = add_url('https://example.com')
+        job = enqueue_check_job(url_id)
+        worker = CheckWorker()
+        worker.writer = CheckWriter(batch_size=10, max_latency=60)
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get',
+            return_value=_mock_response('<html><h1>Buffered</h1></html>')
+        ):
+            worker.run_once()
+        assert get_check_job(job.id).status == 'running'
+        worker.writer.close()
+        assert get_check_job(job.id).status == 'done'
+        assert get_checks_by_url_id(url_id)[0].h1 == 'Buffered'
+
+    def test_writer_saves_before_check_returns(self, test_db):
+        """Тест завершения задачи, записанной до возврата из check_url."""
+        url_id = add_url('https://example.com')
+        job = enqueue_check_job(url_id)
+        worker = CheckWorker()
+        writer = CheckWriter(batch_size=1, max_latency=0)
+        put = writer.put
+
+        def put_and_flush(data, callback=None, timeout=None):
+            put(data, callback, timeout)
+            writer.flush()
+
+        writer.put = put_and_flush
+        worker.writer = writer
+        with patch(
+            'page_analyzer.services.check_service.session_manager.get',
+            return_value=_mock_response('<html><h1>Fast</h1></html>')
+        ):
+            worker.run_once()
+        finished = get_check_job(job.id)
+        assert finished.status == 'done'
+        assert finished.message == 'Страница успешно проверена'
+        writer.close()
+
+    def test_stop(self, test_db):
+        """Тест остановки воркера."""
+        worker = CheckWorker(poll_interval=0.01)
+        worker.stop()
+        worker.run_forever()
+        assert worker.stop_event.is_set()